@@ -1,54 +1,155 @@
-from flask import Flask, request, jsonify, send_file, session
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
-from flask_bcrypt import Bcrypt  # type: ignore
-from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required, JWTManager
+from flask_jwt_extended import create_access_token, JWTManager
 import pymysql
 import os
-from werkzeug.utils import secure_filename
-from resume_matcher import ResumeMatcher
-import random
+import sys
+from scoring_queue import QueueFull
+import scoring_worker
+from scoring_worker import SAVE_SCORE_SQL, score_row
+import db
+from pagination import encode_cursor, decode_cursor, parse_limit, parse_fields
+import applicants_query
+import threading
+import uuid
+import zipfile
+import ingest
+import storage
+import file_serving
+import auth_pool
+from auth_pool import AuthBusy
+import json
+import time
+import logging
+import scoring_policy
+import metrics
+import profiler
+
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                    format="%(asctime)s %(levelname)s %(name)s [%(threadName)s] %(message)s")
+log = logging.getLogger("hiring")
 
 app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "http://localhost:3000"}})
+CORS(app, resources={r"/*": {"origins": "http://localhost:3000"}}, expose_headers=["X-Next-Cursor", "ETag"])
 
    
-UPLOAD_FOLDER = 'uploads'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_FOLDER = storage.UPLOAD_FOLDER
+# Resume and JD downloads: see file_serving.py for the FILE_SERVING modes
+app.config['USE_X_SENDFILE'] = file_serving.FILE_SERVING == 'sendfile'
+file_index = file_serving.FileIndex(UPLOAD_FOLDER)
 
-bcrypt = Bcrypt(app)
 app.config['JWT_SECRET_KEY'] = 'your_secret_key'
 jwt = JWTManager(app)
-# Database Connection Function
+# API_ONLY=1 serves the CRUD routes without the ML stack: resume_matcher
+# (NumPy, FAISS, PyMuPDF, the encoder) is never imported, applications are
+# only queued for scoring_worker.py, and /search-candidates answers 503.
+# Otherwise the matcher is imported on first use or by the warm-up below.
+app.config['API_ONLY'] = os.environ.get('API_ONLY', '0') == '1'
+# Load the matcher models in the background at startup (set WARM_MATCHER=0 to skip)
+app.config['WARM_MATCHER'] = not app.config['API_ONLY'] and os.environ.get('WARM_MATCHER', '1') != '0'
+
+class MatcherUnavailable(Exception):
+    pass
+
+def get_matcher():
+    if app.config['API_ONLY']:
+        raise MatcherUnavailable("Scoring is not available on this API-only server")
+    from resume_matcher import get_matcher as load_matcher
+    return load_matcher()
+
+def is_matcher_ready():
+    # Without importing resume_matcher just to ask
+    matcher_module = sys.modules.get('resume_matcher')
+    return matcher_module is not None and matcher_module.is_matcher_ready()
+
+def start_matcher_warm_up():
+    def _warm():
+        try:
+            from resume_matcher import warm_up
+            warm_up(sync_index=True)
+        except Exception as e:
+            log.error("Matcher warm-up failed: %s", e)
+    threading.Thread(target=_warm, name="matcher-warm-up", daemon=True).start()
+
+# Embed an uploaded PDF once so /apply-job only needs a dot product
+def precompute_embedding(file_path):
+    if app.config['API_ONLY']:
+        # The scoring worker embeds it on first use
+        return
+    try:
+        get_matcher().precompute_pdf(file_path)
+    except Exception as e:
+        log.error("Embedding precompute failed for %s: %s", file_path, e)
+
+# Database Connection Function: a pooled connection for the current request,
+# returned to the pool automatically when the request ends
 def get_db_connection():
     try:
-        # Connect to MySQL without specifying a database
-        conn = pymysql.connect(
-            host="localhost",
-            user="root",
-            password="root@Harisha",
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        cursor = conn.cursor()
-        
-        # Create the database if it does not exist
-        cursor.execute("CREATE DATABASE IF NOT EXISTS hiring_db_system")
-        conn.commit()
-        conn.close()
-
-        # Connect to the database after ensuring it exists
-        conn = pymysql.connect(
-            host="localhost",
-            user="root",
-            password="root@Harisha",
-            database="hiring_db_system",
-            cursorclass=pymysql.cursors.DictCursor
-        )
-
-        return conn
-    except pymysql.MySQLError as e:
-        print(f"Database connection error: {e}")
+        return db.get_db()
+    except (pymysql.MySQLError, db.PoolExhausted) as e:
+        log.error("Database connection error: %s", e)
         return None
 
+db.init_app(app)
+
+# Request metrics and tracing: every route is timed into
+# http_request_duration_seconds, matcher spans of the request are returned
+# in a Server-Timing header, and slow requests are sampled by the
+# opt-in profiler (PROFILE_SLOW_MS)
+HTTP_REQUESTS = metrics.Counter("http_requests_total", "HTTP requests by route, method and status", ["route", "method", "status"])
+HTTP_ERRORS = metrics.Counter("http_request_errors_total", "HTTP requests that ended in a 5xx or an exception", ["route", "method"])
+HTTP_SECONDS = metrics.Histogram("http_request_duration_seconds", "HTTP request latency by route", ["route", "method"])
+# Started by create_app()
+slow_request_profiler = None
+
+def request_route():
+    # The URL rule, not the path, so ids do not blow up label cardinality
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    metrics.start_trace()
+    if slow_request_profiler:
+        g.profile_token = slow_request_profiler.begin()
+
+@app.after_request
+def record_request(response):
+    start = g.pop('request_start', None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    route = request_route()
+    HTTP_SECONDS.observe(elapsed, route=route, method=request.method)
+    HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    if response.status_code >= 500:
+        HTTP_ERRORS.inc(route=route, method=request.method)
+    spans = metrics.finish_trace()
+    response.headers['Server-Timing'] = ", ".join(
+        [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in spans] + [f"total;dur={elapsed * 1000:.1f}"])
+    log.debug("%s %s %s %.1fms", request.method, route, response.status_code, elapsed * 1000)
+    if slow_request_profiler:
+        slow_request_profiler.end(g.pop('profile_token', None), f"{request.method} {route}")
+    return response
+
+@app.teardown_request
+def record_request_exception(exception=None):
+    # Unhandled exceptions skip after_request
+    if exception is not None and g.pop('request_start', None) is not None:
+        HTTP_ERRORS.inc(route=request_route(), method=request.method)
+        HTTP_REQUESTS.inc(route=request_route(), method=request.method, status=500)
+        metrics.finish_trace()
+        if slow_request_profiler:
+            slow_request_profiler.end(g.pop('profile_token', None), f"{request.method} {request_route()}")
+
+
+# Readiness probe for the load balancer: 503 until the matcher models are loaded
+@app.route('/ready', methods=['GET'])
+def ready():
+    if not app.config['WARM_MATCHER'] or is_matcher_ready():
+        return jsonify({"status": "ready"}), 200
+    return jsonify({"status": "warming"}), 503
+
 
 @app.route('/register', methods=['POST'])
 def register():
@@ -60,25 +161,16 @@ def register():
     if missing_fields:
         return jsonify({"error": f"Missing fields: {', '.join(missing_fields)}"}), 400
     name, email, password, phone, user_type = data['name'], data['email'], data['password'], data['phone'], data['user_type']
-    hashed_pw = bcrypt.generate_password_hash(password).decode('utf-8')
+    try:
+        hashed_pw = auth_pool.get_pool().hash_password(password)
+    except AuthBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "2"}
     conn = get_db_connection() 
     if conn is None:
         return jsonify({"error": "Database connection failed"}), 500
 
     try:
         with conn.cursor() as cursor:
-            # Check if the users table exists, if not create it
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    email VARCHAR(255) NOT NULL UNIQUE,
-                    password VARCHAR(255) NOT NULL,
-                    phone VARCHAR(20) NOT NULL,
-                    user_type VARCHAR(50) NOT NULL
-                )
-            """)
-            conn.commit()
             cursor.execute("INSERT INTO users (name, email, password, phone, user_type) VALUES (%s, %s, %s, %s, %s)",
                            (name, email, hashed_pw, phone, user_type))
             conn.commit()
@@ -87,9 +179,32 @@ def register():
         return jsonify({"error": "Email already exists"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
-        
+
+# Background scoring: /apply-job only enqueues, the scoring_worker callbacks
+# store the outcome. API-only servers leave the queue to scoring_worker.py.
+# Opened by create_app()
+scoring_queue = None
+
+metrics.Gauge("scoring_queue_jobs", "Scoring queue entries by status", ["status"],
+              lambda: {(status,): value for status, value in scoring_queue.metrics().items()
+                       if status in ("pending", "running", "failed")})
+metrics.CounterFunction("scoring_queue_processed_total", "Applications scored by this process's workers",
+                        function=lambda: scoring_queue.processed)
+metrics.CounterFunction("scoring_queue_retried_total", "Scoring attempts retried by this process's workers",
+                        function=lambda: scoring_queue.retried)
+metrics.Gauge("db_pool_connections", "Pooled MySQL connections by state", ["state"],
+              lambda: {(state,): value for state, value in db.get_pool().stats().items() if state in ("open", "idle")})
+metrics.CounterFunction("db_pool_checkouts_total", "Connections handed out by the pool",
+                        function=lambda: db.get_pool().stats()["checkouts"])
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    return metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+@app.route('/queue-metrics', methods=['GET'])
+def queue_metrics():
+    return jsonify(scoring_queue.metrics()), 200
+
 @app.route('/cancel-application', methods=['POST'])
 def cancel_application():
     data = request.json
@@ -103,123 +218,164 @@ def cancel_application():
             return jsonify({"error": "Database connection failed"}), 500
 
         with conn.cursor() as cursor:
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS job_application (
-                    job_id INT NOT NULL,
-                    candidate_id VARCHAR(50) NOT NULL,
-                    final_score VARCHAR(50)
-                )
-            """)
-            conn.commit()
             cursor.execute("""
                 DELETE FROM job_application 
                 WHERE job_id = %s AND candidate_id = %s
             """, (job_id, candidate_id))
             conn.commit()
-        conn.close()
         return jsonify({"message": "Application cancelled successfully"}), 200
     except Exception as e:
-        traceback.print_exc()  
+        log.exception("Cancel application failed")
         return jsonify({"error": str(e)}), 500
 
 @app.route('/login', methods=['POST'])
 def login():
     data = request.get_json(force=True, silent=True)
     if not data:
-        print("Invalid JSON format received")
         return jsonify({"error": "Invalid JSON format"}), 400
     email = data.get('email')
     password = data.get('password')
-    print(f"🔍 Login attempt for email: {email}")
     if not email or not password:
-        print("Missing email or password")
         return jsonify({"error": "Email and password are required"}), 400
     conn = get_db_connection()
     if conn is None:
-        print("Database connection failed")
         return jsonify({"error": "Database connection failed"}), 500
     try:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT * FROM users WHERE email = %s", (email,))
+            cursor.execute("SELECT email, password, user_type FROM users WHERE email = %s", (email,))
             user = cursor.fetchone()
-        if user:
-            print(f"User found: {user['email']} (Type: {user['user_type']})")
-            print(f"Stored Hash: {user['password']}")
-            print(f"Entered Password: {password}")
-        if user and bcrypt.check_password_hash(user['password'], password):
+        # Hand the DB connection back before the slow hash check so a login
+        # storm cannot also exhaust the connection pool
+        db.close_db()
+        if user and auth_pool.get_pool().check_password(password, user['password']):
             access_token = create_access_token(identity={"email": user['email'], "user_type": user['user_type']})
-            print("Password matched, login successful")
             return jsonify({"token": access_token, "user_type": user['user_type']}), 200
-        print("Invalid credentials")
+        # Never log passwords or hashes
+        log.info("Failed login attempt")
         return jsonify({"error": "Invalid credentials"}), 401
+    except AuthBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "2"}
     except Exception as e:
-        print(f"Error: {str(e)}")
+        log.exception("Login failed")
         return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
+
+# Insert a row that owns a staged (hashed, not yet stored) PDF upload as one
+# unit: the row is inserted (uncommitted), the file moved into
+# content-addressed storage, then the transaction commits. On any failure the
+# row is rolled back and the file removed if this request created it and no
+# committed row (another job or candidate with the same PDF) uses it, so no
+# row points at a missing file and no orphan file is left behind.
+def create_with_upload(conn, staged, insert):
+    try:
+        with conn.cursor() as cursor:
+            row_id = insert(cursor, staged.path, staged.sha256)
+        staged.commit()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        staged.discard(lambda path: db.upload_referenced(conn, path))
+        raise
+    staged.finish()
+    return row_id, staged.path
 
 @app.route('/create-job', methods=['POST'])
 def create_job():
-    job_id = random.randint(1000, 9999)
     job_role = request.form['job_role']
     experience = request.form['experience']
     salary = request.form['salary']
     location = request.form['location']
-    job_description = request.files['job_description']
-    if job_description and job_description.filename.endswith('.pdf'):
-        file_path = os.path.join(UPLOAD_FOLDER, f"{job_id}.pdf")
-        job_description.save(file_path)
+    job_description = request.files.get('job_description')
+    if not job_description or not job_description.filename.lower().endswith('.pdf'):
+        return jsonify({"error": "A job description PDF is required"}), 400
     conn = get_db_connection()
     if conn is None:
         return jsonify({"error": "Database connection failed"}), 500
-    with conn.cursor() as cursor:
-        # Check if the jobs_description table exists, if not create it
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jobs_description (
-                job_id INT PRIMARY KEY,
-                job_role VARCHAR(255),
-                experience VARCHAR(255),
-                salary DECIMAL(10, 2),
-                location VARCHAR(255),
-                job_description VARCHAR(255)
-            )
-        """)
-        conn.commit()
-        cursor.execute("INSERT INTO jobs_description (job_id, job_role, experience, salary, location, job_description) VALUES (%s, %s, %s, %s, %s, %s)",
-                    (job_id, job_role, experience, salary, location, file_path))
-        conn.commit()       
+
+    def insert(cursor, file_path, sha256):
+        # job_id comes from AUTO_INCREMENT, so concurrent creates never collide
+        cursor.execute("INSERT INTO jobs_description (job_role, experience, salary, location, job_description) VALUES (%s, %s, %s, %s, %s)",
+                       (job_role, experience, salary, location, file_path))
+        return cursor.lastrowid
+    try:
+        staged = storage.stage(job_description.stream)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    job_id, file_path = create_with_upload(conn, staged, insert)
+    precompute_embedding(file_path)
     return jsonify({"message": "Job created successfully", "job_id": job_id}), 201
 
+JOB_FIELDS = {
+    "job_id": "job_id",
+    "job_role": "job_role",
+    "experience": "experience",
+    "salary": "salary",
+    "location": "location"
+}
+
+# Paged responses carry the next cursor in X-Next-Cursor; every response has an
+# ETag so polling clients get a 304 when nothing changed
+def list_response(rows, next_cursor=None):
+    response = jsonify(rows)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    response.add_etag()
+    return response.make_conditional(request)
+
 @app.route('/get-jobs', methods=['GET'])
 def get_jobs():
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        fields = parse_fields(request.args.get('fields'), JOB_FIELDS)
+        after = decode_cursor(request.args.get('cursor'), (int,))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT job_id, job_role, experience, salary, location FROM jobs_description")
-    jobs = cursor.fetchall()
-    conn.close()
-    return jsonify(jobs)
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    columns = ", ".join(f"{JOB_FIELDS[field]} AS {field}" for field in fields)
+    query = f"SELECT job_id AS _key, {columns} FROM jobs_description"
+    args = []
+    if after:
+        query += " WHERE job_id > %s"
+        args.append(after[0])
+    query += " ORDER BY job_id"
+    if limit:
+        query += " LIMIT %s"
+        args.append(limit + 1)
+    with conn.cursor() as cursor:
+        cursor.execute(query, args)
+        jobs = cursor.fetchall()
+    next_cursor = None
+    if limit and len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_cursor([jobs[-1]['_key']])
+    for job in jobs:
+        del job['_key']
+    return list_response(jobs, next_cursor)
 
 
 @app.route('/job-description/<int:job_id>', methods=['GET'])
 def get_job_description(job_id):
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT job_description FROM jobs_description WHERE job_id = %s", (job_id,))
-    job = cursor.fetchone()
-    conn.close() 
-    if job and os.path.exists(job['job_description']):
-        return send_file(job['job_description'], as_attachment=True)
-    return jsonify({"error": "File not found"}), 404
+    if conn is None:
+        return jsonify({"error": "Database connection failed"}), 500
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT job_description FROM jobs_description WHERE job_id = %s", (job_id,))
+        job = cursor.fetchone()
+    response = file_serving.send_stored(file_index, job['job_description']) if job else None
+    if response is None:
+        return jsonify({"error": "File not found"}), 404
+    return response
 
 @app.route('/download-resume/<filename>', methods=['GET'])
 def download_resume(filename):
-    file_path = os.path.join('uploads', filename)
-    print("Requested filename:", filename)
-    print("Resolved path:", file_path)
-    print("Exists?", os.path.exists(file_path))
-    if os.path.exists(file_path):
-        return send_file(file_path, as_attachment=True)
-    return jsonify({"error": "Resume not found"}), 404
+    response = file_serving.send_stored(file_index, filename, filename, storage.resolve)
+    if response is None:
+        return jsonify({"error": "Resume not found"}), 404
+    return response
+
+# MySQL error for a row whose foreign key points nowhere
+FOREIGN_KEY_VIOLATION = 1452
 
 @app.route('/apply-job', methods=['POST'])
 def apply_job():
@@ -228,101 +384,322 @@ def apply_job():
     candidate_id = data.get('candidate_id')
     if not all([job_id, candidate_id]):
         return jsonify({"error": "All fields are required"}), 400
-    matcher = ResumeMatcher() 
-    result = matcher.match_resume(job_id, candidate_id)
-    final_score = result.get('final_score')   
-    print(f"Final Score: {final_score}")
     try:
         conn = get_db_connection()
         if conn is None:
             return jsonify({"error": "Database connection failed"}), 500
 
         with conn.cursor() as cursor:
-            # Check if the jobs_description table exists, if not create it
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS job_application (
-                    job_id INT NOT NULL,
-                    candidate_id VARCHAR(50) NOT NULL,
-                    final_score VARCHAR(50) 
-                )
-            """)
+            # Insert the application unscored; a scoring worker fills in final_score.
+            # Applying twice is a no-op thanks to the (job_id, candidate_id)
+            # primary key, except that an application whose scoring failed is
+            # queued again. Affected rows: 1 inserted, 2 re-queued, 0 unchanged.
+            try:
+                cursor.execute("""
+                    INSERT INTO job_application (job_id, candidate_id, final_score, score_status)
+                    VALUES (%s, %s, NULL, 'pending')
+                    ON DUPLICATE KEY UPDATE score_status = IF(score_status = 'failed', 'pending', score_status)
+                """, (job_id, candidate_id))
+            except pymysql.IntegrityError as e:
+                conn.rollback()
+                if e.args and e.args[0] == FOREIGN_KEY_VIOLATION:
+                    return jsonify({"error": "Job or candidate not found"}), 404
+                return jsonify({"error": "Invalid job_id or candidate_id"}), 400
+            inserted = cursor.rowcount == 1
+            requeued = cursor.rowcount == 2
             conn.commit()
-            # Insert user data
-            cursor.execute("""INSERT INTO job_application (job_id, candidate_id, final_score) VALUES (%s, %s, %s)""", (job_id, candidate_id, final_score))
-            conn.commit()    
-        conn.close()
-        return jsonify({"message": "Application submitted successfully"}), 201
+            if not inserted and not requeued:
+                return jsonify({"message": "Already applied for this job"}), 200
+            try:
+                scoring_queue.enqueue(job_id, candidate_id)
+            except Exception as e:
+                # Not queued means never scored: take the application back (or
+                # leave it failed) so it can be retried
+                if inserted:
+                    cursor.execute("DELETE FROM job_application WHERE job_id = %s AND candidate_id = %s AND score_status = 'pending'", (job_id, candidate_id))
+                else:
+                    cursor.execute("UPDATE job_application SET score_status = 'failed' WHERE job_id = %s AND candidate_id = %s AND score_status = 'pending'", (job_id, candidate_id))
+                conn.commit()
+                if isinstance(e, QueueFull):
+                    return jsonify({"error": str(e)}), 503, {"Retry-After": "30"}
+                log.exception("Enqueueing job %s, candidate %s failed", job_id, candidate_id)
+                return jsonify({"error": "Could not queue the application for scoring, please retry"}), 503
+        message = "Application submitted successfully" if inserted else "Application queued for scoring again"
+        return jsonify({"message": message, "score_status": "pending"}), 202
     except Exception as e:
         return jsonify({"error": str(e)}), 500  # Send the actual error message
-import traceback  # optional, if you want to log errors
-@app.route('/get-applicants', methods=['POST'])
+
+# Re-score every application of a job. Applications with stored components
+# are re-blended under the scoring policy in one SQL UPDATE; the rest (or
+# all of them with "full": true, e.g. after the JD file changed) go through
+# match_many, which still skips inference for pairs in the score memo.
+@app.route('/rescore-job', methods=['POST'])
+def rescore_job():
+    data = request.get_json(force=True, silent=True) or {}
+    job_id = data.get('job_id')
+    if not job_id:
+        return jsonify({"error": "job_id is required"}), 400
+    try:
+        policy = scoring_policy.get_policy(data.get('policy_version'))
+    except (KeyError, ValueError):
+        return jsonify({"error": f"Unknown scoring policy version: {data.get('policy_version')}"}), 400
+    full = bool(data.get('full'))
+    try:
+        conn = get_db_connection()
+        if conn is None:
+            return jsonify({"error": "Database connection failed"}), 500
+        start = time.perf_counter()
+        recomputed = 0
+        with conn.cursor() as cursor:
+            if not full:
+                expression, params = scoring_policy.final_score_sql(policy)
+                cursor.execute(f"""
+                    UPDATE job_application SET final_score = {expression}, policy_version = %s
+                    WHERE job_id = %s AND skill_match IS NOT NULL AND content_similarity IS NOT NULL
+                """, params + [policy["version"], job_id])
+                recomputed = cursor.rowcount
+                conn.commit()
+                cursor.execute("SELECT candidate_id FROM job_application WHERE job_id = %s AND (skill_match IS NULL OR content_similarity IS NULL)", (job_id,))
+            else:
+                cursor.execute("SELECT candidate_id FROM job_application WHERE job_id = %s", (job_id,))
+            candidate_ids = [row["candidate_id"] for row in cursor.fetchall()]
+        recompute_ms = round((time.perf_counter() - start) * 1000, 1)
+        if not candidate_ids:
+            return jsonify({"message": "Job re-scored successfully", "recomputed": recomputed, "rescored": 0,
+                            "recompute_ms": recompute_ms, "policy_version": policy["version"], "errors": {}}), 200
+        if app.config['API_ONLY']:
+            # No matcher here: the scoring workers score the rest, under the requested policy
+            try:
+                for candidate_id in candidate_ids:
+                    scoring_queue.enqueue(job_id, candidate_id, policy["version"])
+            except QueueFull as e:
+                return jsonify({"error": str(e)}), 503, {"Retry-After": "30"}
+            return jsonify({"message": "Job re-scoring queued", "recomputed": recomputed, "rescored": 0,
+                            "queued": len(candidate_ids), "recompute_ms": recompute_ms,
+                            "policy_version": policy["version"], "errors": {}}), 202
+
+        results = get_matcher().match_many(job_id, candidate_ids, policy)
+        if "error" in results:
+            return jsonify({"error": results["error"]}), 404
+
+        scores = [score_row(result, job_id, candidate_id)
+                  for candidate_id, result in results.items() if "error" not in result]
+        with conn.cursor() as cursor:
+            cursor.executemany(SAVE_SCORE_SQL, scores)
+            conn.commit()
+        errors = {str(candidate_id): result["error"] for candidate_id, result in results.items() if "error" in result}
+        return jsonify({"message": "Job re-scored successfully", "recomputed": recomputed, "rescored": len(scores),
+                        "recompute_ms": recompute_ms, "policy_version": policy["version"], "errors": errors}), 200
+    except Exception as e:
+        log.exception("Re-scoring job %s failed", job_id)
+        return jsonify({"error": str(e)}), 500
+
+# Applicants of a job. Without limit the full list is returned (as before);
+# with limit the response is one page sorted by score (or id) and the next
+# page is fetched by passing X-Next-Cursor back as cursor. min_score + limit
+# gives a top-K shortlist. Accepts JSON (POST) or query parameters (GET).
+@app.route('/get-applicants', methods=['GET', 'POST'])
 def get_applicants():
-    print("POST /get-applicants called")
     try:
-        data = request.get_json()
-        job_id = data.get('job_id')
-        print("Received job_id:", job_id)
+        params = request.args if request.method == 'GET' else (request.get_json(force=True, silent=True) or {})
+        job_id = params.get('job_id')
         if not job_id:
             return jsonify({"error": "job_id is required"}), 400
+        try:
+            limit = parse_limit(params.get('limit'))
+            fields = parse_fields(params.get('fields'), applicants_query.APPLICANT_FIELDS)
+            # [final_score as a decimal string or None, candidate_id]
+            after = decode_cursor(params.get('cursor'), ((str, type(None)), int))
+            if after and after[0] is not None:
+                try:
+                    float(after[0])
+                except ValueError:
+                    raise ValueError("Invalid cursor")
+            min_score = params.get('min_score')
+            min_score = float(min_score) if min_score not in (None, '') else None
+            sort = params.get('sort', 'score')
+            if sort not in ('score', 'id'):
+                raise ValueError("sort must be 'score' or 'id'")
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        query, args = applicants_query.build_query(job_id, fields, after, min_score, sort, limit)
+
         conn = get_db_connection()
         if conn is None:
             return jsonify({"error": "Database connection failed"}), 500
         with conn.cursor() as cursor:
-            cursor.execute("""
-                SELECT DISTINCT cd.candidate_id, cd.name, cd.email, cd.phone_no, cd.resume, ja.final_score
-                FROM job_application ja
-                JOIN candidate_details cd ON ja.candidate_id = cd.candidate_id
-                WHERE ja.job_id = %s
-            """, (job_id,))
+            cursor.execute(query, args)
             applicants = cursor.fetchall()
-            result = [
-                {   "id": row["candidate_id"],
-                    "name": row["name"],
-                    "email": row["email"],
-                    "phone_no": row["phone_no"],
-                    "resume": row["resume"],
-                    "final_score": row["final_score"]
-                }
-                for row in applicants
-            ]
-        conn.close()
-        print(result)
-        return jsonify(result), 200
+
+        next_cursor = None
+        if limit and len(applicants) > limit:
+            applicants = applicants[:limit]
+            last = applicants[-1]
+            next_cursor = encode_cursor([str(last['_score']) if last['_score'] is not None else None,
+                                         last['_candidate_id']])
+        result = []
+        for row in applicants:
+            del row['_candidate_id'], row['_score']
+            if row.get('final_score') is not None:
+                row['final_score'] = float(row['final_score'])
+            if row.get('matched_skills') is not None:
+                row['matched_skills'] = json.loads(row['matched_skills'])
+            result.append(row)
+        return list_response(result, next_cursor)
     except Exception as e:
-        # Optional: print full traceback for debugging
-        print(traceback.format_exc())
+        log.exception("Listing applicants failed")
         return jsonify({"error": str(e)}), 500
+# Rank the whole candidate pool against a job through the FAISS index
+@app.route('/search-candidates', methods=['POST'])
+def search_candidates():
+    data = request.get_json(force=True, silent=True) or {}
+    job_id = data.get('job_id')
+    if not job_id:
+        return jsonify({"error": "job_id is required"}), 400
+    try:
+        k = min(int(data.get('k', 10)), 500)
+        min_skill_match = float(data.get('min_skill_match', 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "k and min_skill_match must be numbers"}), 400
+    if app.config['API_ONLY']:
+        return jsonify({"error": "Candidate search is not available on this API-only server"}), 503
+    try:
+        results = get_matcher().search_candidates(job_id, k, data.get('skills'), min_skill_match)
+        if isinstance(results, dict):
+            return jsonify(results), 404
+        if results:
+            conn = get_db_connection()
+            if conn is None:
+                return jsonify({"error": "Database connection failed"}), 500
+            with conn.cursor() as cursor:
+                placeholders = ", ".join(["%s"] * len(results))
+                cursor.execute(f"""
+                    SELECT candidate_id, name, email, phone_no, resume
+                    FROM candidate_details WHERE candidate_id IN ({placeholders})
+                """, tuple(result["candidate_id"] for result in results))
+                details = {str(row["candidate_id"]): row for row in cursor.fetchall()}
+            for result in results:
+                row = details.get(result["candidate_id"], {})
+                result.update({"name": row.get("name"), "email": row.get("email"),
+                               "phone_no": row.get("phone_no"), "resume": row.get("resume")})
+        return jsonify(results), 200
+    except Exception as e:
+        log.exception("Candidate search failed")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/candidate-info', methods=['POST'])
 def candidate_info(): 
-    candidate_id = random.randint(1000, 9999)
     name = request.form['name']
     email = request.form['email']
     phone_no = request.form['phone_no']
-    resume = request.files['resume']
-    if resume and resume.filename.endswith('.pdf'):
-        file_path = os.path.join(UPLOAD_FOLDER, f"{candidate_id}.pdf")
-        resume.save(file_path)
+    resume = request.files.get('resume')
+    if not resume or not resume.filename.lower().endswith('.pdf'):
+        return jsonify({"error": "A resume PDF is required"}), 400
     conn = get_db_connection()
     if conn is None:
         return jsonify({"error": "Database connection failed"}), 500
-    with conn.cursor() as cursor:
-        # Check if the jobs_description table exists, if not create it
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS candidate_details (
-                candidate_id VARCHAR(50),
-                name VARCHAR(255),
-                email VARCHAR(255),
-                phone_no VARCHAR(255),
-                resume VARCHAR(255)
-            )
-        """)
-        conn.commit()
-        # Insert user data
-        cursor.execute("INSERT INTO candidate_details (candidate_id, name, email, phone_no, resume) VALUES (%s, %s, %s, %s, %s)",(candidate_id, name, email, phone_no, file_path))
-        conn.commit()    
+
+    def insert(cursor, file_path, sha256):
+        # candidate_id comes from AUTO_INCREMENT, so concurrent creates never collide
+        cursor.execute("INSERT INTO candidate_details (name, email, phone_no, resume, resume_sha256) VALUES (%s, %s, %s, %s, %s)",
+                       (name, email, phone_no, file_path, sha256))
+        return cursor.lastrowid
+    try:
+        staged = storage.stage(resume.stream)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        candidate_id, file_path = create_with_upload(conn, staged, insert)
+    except pymysql.IntegrityError:
+        # The same resume PDF is already registered. Only the same person
+        # (same email) gets that candidate back; anyone else gets a conflict
+        # rather than someone else's candidate_id.
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT candidate_id, email FROM candidate_details WHERE resume_sha256 = %s", (staged.sha256,))
+            existing = cursor.fetchone()
+        if existing is None:
+            raise
+        if (existing['email'] or '').strip().lower() != email.strip().lower():
+            return jsonify({"error": "This resume is already registered to another candidate"}), 409
+        return jsonify({"message": "Candidate already registered with this resume", "candidate_id": existing['candidate_id']}), 200
+    if not app.config['API_ONLY']:
+        # API-only: the matcher processes pick it up in sync_candidate_index
+        try:
+            get_matcher().index_candidate(candidate_id, file_path)
+        except Exception as e:
+            log.error("Candidate indexing failed for %s: %s", file_path, e)
     return jsonify({"message": "Candidate details created successfully", "candidate_id": candidate_id}), 201
 
-    
+# Bulk ingestion for campus drives: any number of PDFs under "resumes" and/or
+# a zip under "archive", with an optional CSV "manifest". Werkzeug spools the
+# parts to temporary files, each is streamed into uploads/ while hashing, and
+# the rest runs in the background; poll /bulk-ingest/<ingest_id> for progress.
+@app.route('/bulk-ingest', methods=['POST'])
+def bulk_ingest():
+    resumes = request.files.getlist('resumes')
+    archive = request.files.get('archive')
+    if not resumes and not archive:
+        return jsonify({"error": "Upload PDFs as 'resumes' or a zip as 'archive'"}), 400
+    manifest = {}
+    if 'manifest' in request.files:
+        manifest = ingest.load_manifest(request.files['manifest'].stream)
+
+    report = ingest.IngestReport(uuid.uuid4().hex)
+    staged = ingest.stage_files(((f.filename, f.stream) for f in resumes), report)
+    if archive:
+        try:
+            staged += ingest.stage_files(ingest.iter_zip_pdfs(archive.stream), report)
+        except zipfile.BadZipFile:
+            report.error(archive.filename, "Not a valid zip archive")
+    ingest.write_status(report)
+
+    def _run():
+        matcher = None
+        try:
+            if not app.config['API_ONLY']:
+                matcher = get_matcher()
+        except Exception as e:
+            log.warning("Bulk ingest %s continues without embeddings: %s", report.ingest_id, e)
+        ingest.ingest(staged, report, manifest, matcher, on_progress=ingest.write_status)
+    threading.Thread(target=_run, name=f"bulk-ingest-{report.ingest_id}", daemon=True).start()
+    return jsonify(report.to_dict()), 202
+
+@app.route('/bulk-ingest/<ingest_id>', methods=['GET'])
+def bulk_ingest_status(ingest_id):
+    status = ingest.read_status(ingest_id)
+    if status is None:
+        return jsonify({"error": "Unknown ingest_id"}), 404
+    return jsonify(status), 200
+
+# Startup side effects live here, not at import: spawned pool workers (PDF
+# extraction, AUTH_POOL=process) re-import the main module, and must not
+# migrate the schema, start scoring workers or load the model. Serve with
+#   python app.py
+#   gunicorn -w 4 'app:create_app()'
+_started = False
+_start_lock = threading.Lock()
+
+def create_app():
+    global _started, scoring_queue, slow_request_profiler
+    with _start_lock:
+        if _started:
+            return app
+        _started = True
+        os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+        # Schema is created/upgraded once at startup instead of on every request
+        try:
+            db.migrate()
+        except Exception as e:
+            log.error("Database migration failed: %s", e)
+        slow_request_profiler = profiler.from_env()
+        scoring_queue = scoring_worker.make_queue()
+        if not app.config['API_ONLY']:
+            scoring_queue.start()
+        if app.config['WARM_MATCHER']:
+            start_matcher_warm_up()
+    return app
+
 
 if __name__ == '__main__':
-    app.run(host='127.0.0.1', port=5000, debug=True)
\ No newline at end of file
+    create_app().run(host='127.0.0.1', port=5000, debug=True)
\ No newline at end of file
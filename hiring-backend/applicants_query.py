@@ -0,0 +1,51 @@
+# The /get-applicants SQL, kept out of app.py so the query benchmark runs
+# exactly what the endpoint runs without importing Flask.
+APPLICANT_FIELDS = {
+    "id": "cd.candidate_id",
+    "name": "cd.name",
+    "email": "cd.email",
+    "phone_no": "cd.phone_no",
+    "resume": "cd.resume",
+    "final_score": "ja.final_score",
+    "score_status": "ja.score_status",
+    "content_similarity": "ja.content_similarity",
+    "skill_match": "ja.skill_match",
+    "matched_skills": "ja.matched_skills"
+}
+
+
+def build_query(job_id, fields, after=None, min_score=None, sort='score', limit=None):
+    # (sql, args); after is a decoded [final_score string or None, candidate_id]
+    # cursor, and one row past limit is fetched to tell if there is a next page
+    where = ["ja.job_id = %s"]
+    args = [job_id]
+    if min_score is not None:
+        where.append("ja.final_score >= %s")
+        args.append(min_score)
+    if sort == 'score':
+        # Unscored (NULL) applications sort last, as MySQL does for DESC
+        order = "ja.final_score DESC, ja.candidate_id DESC"
+        if after and after[0] is None:
+            where.append("(ja.final_score IS NULL AND ja.candidate_id < %s)")
+            args.append(after[1])
+        elif after:
+            where.append("(ja.final_score < %s OR (ja.final_score = %s AND ja.candidate_id < %s) OR ja.final_score IS NULL)")
+            args.extend([after[0], after[0], after[1]])
+    else:
+        order = "ja.candidate_id"
+        if after:
+            where.append("ja.candidate_id > %s")
+            args.append(after[1])
+
+    columns = ", ".join(f"{APPLICANT_FIELDS[field]} AS {field}" for field in fields)
+    query = f"""
+        SELECT ja.candidate_id AS _candidate_id, ja.final_score AS _score, {columns}
+        FROM job_application ja
+        JOIN candidate_details cd ON ja.candidate_id = cd.candidate_id
+        WHERE {" AND ".join(where)}
+        ORDER BY {order}
+    """
+    if limit:
+        query += " LIMIT %s"
+        args.append(limit + 1)
+    return query, args
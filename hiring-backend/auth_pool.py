@@ -0,0 +1,144 @@
+# Password hashing off the request threads. bcrypt is deliberately slow CPU
+# work (~250-400 ms at 12 rounds), so a burst of logins run inline puts one
+# busy thread per login on the CPU and starves the other routes. Here hashes
+# run on AUTH_WORKERS pool workers, niced by AUTH_NICE so request handling
+# wins the CPU. At most AUTH_MAX_PENDING calls may be queued or running per
+# Flask worker; anything beyond that fails fast with AuthBusy, which the
+# routes turn into a 503 with Retry-After.
+#
+# AUTH_POOL=thread (default) uses threads: bcrypt releases the GIL, and on
+# Linux each worker thread gets its own nice value. AUTH_POOL=process uses
+# spawned processes for full isolation. The workers only import this module
+# and the main module, which keeps its startup in create_app().
+#
+# Hashes are the same $2b$ strings Flask-Bcrypt wrote, so existing users can
+# still log in.
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import bcrypt
+
+from metrics import Counter, Gauge, Histogram
+
+AUTH_POOL = os.environ.get('AUTH_POOL', 'thread')
+AUTH_WORKERS = int(os.environ.get('AUTH_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+AUTH_MAX_PENDING = int(os.environ.get('AUTH_MAX_PENDING', 32))
+AUTH_TIMEOUT = float(os.environ.get('AUTH_TIMEOUT', 5))
+AUTH_NICE = int(os.environ.get('AUTH_NICE', 10))
+BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+
+AUTH_SECONDS = Histogram("auth_hash_duration_seconds", "Password hash/check time including queueing", ["operation"])
+AUTH_SHED = Counter("auth_requests_shed_total", "Password hash/check calls rejected because the pool was saturated", ["operation"])
+
+
+class AuthBusy(Exception):
+    pass
+
+
+def hash_password(password, rounds=BCRYPT_LOG_ROUNDS):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def check_password(password, hashed):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+
+def _lower_priority():
+    # For a thread this renices only that thread (Linux schedules threads
+    # individually); elsewhere it is best effort
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), AUTH_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+class AuthPool:
+    def __init__(self, kind=AUTH_POOL, workers=AUTH_WORKERS, max_pending=AUTH_MAX_PENDING, timeout=AUTH_TIMEOUT):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == 'thread':
+                        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="auth",
+                                                            initializer=_lower_priority)
+                    else:
+                        # spawn: forking a process that already runs threads is unsafe
+                        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                                             initializer=_lower_priority)
+        return self._executor
+
+    def _run(self, operation, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            AUTH_SHED.inc(operation=operation)
+            raise AuthBusy("Too many sign-ins in progress, please retry shortly")
+        with self._pending_lock:
+            self._pending += 1
+        start = time.perf_counter()
+        try:
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except Exception:
+                self._release()
+                raise
+            # The slot is held until the hash actually finishes (or is
+            # cancelled before starting), not just until this caller gives up,
+            # so timed-out work still counts against max_pending
+            future.add_done_callback(self._release)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()
+                AUTH_SHED.inc(operation=operation)
+                raise AuthBusy("Sign-in timed out, please retry shortly")
+        finally:
+            AUTH_SECONDS.observe(time.perf_counter() - start, operation=operation)
+
+    def _release(self, future=None):
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def hash_password(self, password):
+        return self._run("hash", hash_password, password)
+
+    def check_password(self, password, hashed):
+        return self._run("check", check_password, password, hashed)
+
+    def pending(self):
+        return self._pending
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = AuthPool()
+                Gauge("auth_pending", "Password hash/check calls queued or running", function=_pool.pending)
+    return _pool
@@ -0,0 +1,151 @@
+# Seeds a scratch database with 1M job applications and checks that the
+# /get-applicants query stays an index lookup (EXPLAIN) and stays fast. The
+# SQL comes from applicants_query, the same builder the endpoint uses: the
+# first page and a keyset page (the cursor of the first) are timed.
+#
+#   DB_NAME=hiring_db_bench python benchmarks/bench_applicants_query.py
+#
+# --compare-unindexed also copies job_application into a table without keys
+# and times the old SELECT DISTINCT query against it.
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DB_NAME', 'hiring_db_bench')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+from applicants_query import APPLICANT_FIELDS, build_query
+
+PAGE_SIZE = 50
+LEGACY_QUERY = """
+    SELECT DISTINCT cd.candidate_id, cd.name, cd.email, cd.phone_no, cd.resume, ja.final_score
+    FROM job_application_noindex ja
+    JOIN candidate_details cd ON ja.candidate_id = cd.candidate_id
+    WHERE ja.job_id = %s
+"""
+BATCH = 10000
+
+
+def count(cursor, table):
+    cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+    return cursor.fetchone()['n']
+
+
+def seed(conn, jobs, candidates, applications):
+    with conn.cursor() as cursor:
+        if count(cursor, 'job_application') >= applications:
+            return
+        rng = random.Random(42)
+        cursor.executemany(
+            "INSERT IGNORE INTO jobs_description (job_id, job_role, experience, salary, location, job_description) VALUES (%s, %s, %s, %s, %s, %s)",
+            [(job_id, f"Role {job_id}", "2-5 years", 50000, "Remote", f"uploads/{job_id}.pdf") for job_id in range(1, jobs + 1)])
+        for start in range(1, candidates + 1, BATCH):
+            cursor.executemany(
+                "INSERT IGNORE INTO candidate_details (candidate_id, name, email, phone_no, resume) VALUES (%s, %s, %s, %s, %s)",
+                [(c, f"Candidate {c}", f"c{c}@example.com", "9999999999", f"uploads/{c}.pdf")
+                 for c in range(start, min(start + BATCH, candidates + 1))])
+            conn.commit()
+        inserted = count(cursor, 'job_application')
+        while inserted < applications:
+            rows = [(rng.randint(1, jobs), rng.randint(1, candidates), round(rng.uniform(0, 100), 2))
+                    for _ in range(BATCH)]
+            cursor.executemany(
+                "INSERT IGNORE INTO job_application (job_id, candidate_id, final_score) VALUES (%s, %s, %s)", rows)
+            conn.commit()
+            inserted = count(cursor, 'job_application')
+        cursor.execute("ANALYZE TABLE job_application, candidate_details")
+        cursor.fetchall()
+
+
+def first_page(job_id):
+    return build_query(job_id, list(APPLICANT_FIELDS), limit=PAGE_SIZE)
+
+
+def next_page(cursor, job_id):
+    # The page after the first, from the cursor the endpoint would hand out
+    query, args = first_page(job_id)
+    cursor.execute(query, args)
+    rows = cursor.fetchall()
+    if len(rows) <= PAGE_SIZE:
+        return None
+    last = rows[PAGE_SIZE - 1]
+    after = [str(last['_score']) if last['_score'] is not None else None, last['_candidate_id']]
+    return build_query(job_id, list(APPLICANT_FIELDS), after, limit=PAGE_SIZE)
+
+
+def explain(cursor, query, args):
+    cursor.execute("EXPLAIN " + query, args)
+    return cursor.fetchall()
+
+
+def check_plan(plan):
+    ja_plan = next(row for row in plan if row['table'] == 'ja')
+    # Must be an index lookup on job_id, without a full scan or filesort
+    assert ja_plan['type'] in ('ref', 'range'), plan
+    assert ja_plan['key'] in ('PRIMARY', 'idx_job_application_job_score'), plan
+    assert 'filesort' not in (ja_plan['Extra'] or ''), plan
+
+
+def time_queries(cursor, queries):
+    latencies = []
+    for query, args in queries:
+        start = time.perf_counter()
+        cursor.execute(query, args)
+        cursor.fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {"p50_ms": round(statistics.median(latencies), 2),
+            "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--candidates', type=int, default=200000)
+    parser.add_argument('--applications', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--compare-unindexed', action='store_true')
+    args = parser.parse_args()
+
+    db.migrate()
+    with db.connection() as conn:
+        start = time.perf_counter()
+        seed(conn, args.jobs, args.candidates, args.applications)
+        seed_seconds = round(time.perf_counter() - start, 1)
+
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT job_id FROM job_application GROUP BY job_id ORDER BY COUNT(*) DESC LIMIT 1")
+            hot_job = cursor.fetchone()['job_id']
+            plan = explain(cursor, *first_page(hot_job))
+            check_plan(plan)
+            keyset_plan = explain(cursor, *next_page(cursor, hot_job))
+            check_plan(keyset_plan)
+
+            rng = random.Random(7)
+            job_ids = [rng.randint(1, args.jobs) for _ in range(args.queries)]
+            keyset_pages = [page for page in (next_page(cursor, job_id) for job_id in job_ids) if page]
+            report = {
+                "applications": count(cursor, 'job_application'),
+                "seed_seconds": seed_seconds,
+                "explain": plan,
+                "explain_keyset": keyset_plan,
+                "indexed": time_queries(cursor, [first_page(job_id) for job_id in job_ids]),
+                "indexed_keyset": time_queries(cursor, keyset_pages)
+            }
+            if args.compare_unindexed:
+                cursor.execute("DROP TABLE IF EXISTS job_application_noindex")
+                cursor.execute("CREATE TABLE job_application_noindex AS SELECT job_id, CAST(candidate_id AS CHAR(50)) AS candidate_id, CAST(final_score AS CHAR(50)) AS final_score FROM job_application")
+                conn.commit()
+                report["unindexed_legacy"] = time_queries(cursor, [(LEGACY_QUERY, (job_id,)) for job_id in job_ids[:10]])
+                cursor.execute("DROP TABLE job_application_noindex")
+
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == '__main__':
+    main()
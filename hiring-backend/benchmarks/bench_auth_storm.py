@@ -0,0 +1,141 @@
+# Latency of a cheap route (a /get-jobs stand-in) during a login storm, with
+# bcrypt checked inline on the request threads (the previous /login) and
+# through auth_pool. The server runs in a subprocess on a threaded werkzeug
+# server, so the load generator does not share its GIL.
+#
+#   python benchmarks/bench_auth_storm.py --clients 32 --seconds 10
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+JOBS = [{"job_id": i, "job_role": f"Role {i}", "experience": "2-5 years", "salary": 50000.0, "location": "Remote"}
+        for i in range(50)]
+
+
+def serve(port, rounds):
+    from flask import Flask, jsonify, request
+    from werkzeug.serving import make_server
+
+    import auth_pool
+
+    app = Flask(__name__)
+    hashed = auth_pool.hash_password("correct horse", rounds)
+    pool = auth_pool.get_pool()
+
+    @app.route('/login-inline', methods=['POST'])
+    def login_inline():
+        ok = auth_pool.check_password(request.get_json()["password"], hashed)
+        return jsonify({"ok": ok}), 200 if ok else 401
+
+    @app.route('/login', methods=['POST'])
+    def login():
+        try:
+            ok = pool.check_password(request.get_json()["password"], hashed)
+        except auth_pool.AuthBusy as e:
+            return jsonify({"error": str(e)}), 503, {"Retry-After": "2"}
+        return jsonify({"ok": ok}), 200 if ok else 401
+
+    @app.route('/get-jobs')
+    def get_jobs():
+        return jsonify(JOBS)
+
+    print("ready", flush=True)
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        start = time.perf_counter()
+        conn.request(method, path, body=json.dumps(body) if body else None,
+                     headers={"Content-Type": "application/json"} if body else {})
+        response = conn.getresponse()
+        response.read()
+        return response.status, (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * q))], 1) if values else None
+
+
+def phase(port, login_path, clients, seconds, probe_interval):
+    stop = threading.Event()
+    statuses = {}
+    login_ms = []
+    lock = threading.Lock()
+
+    def storm():
+        while not stop.is_set():
+            status, elapsed = request(port, "POST", login_path, {"email": "a@b.c", "password": "correct horse"})
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    login_ms.append(elapsed)
+            if status == 503:
+                time.sleep(0.05)
+
+    threads = [threading.Thread(target=storm, daemon=True) for _ in range(clients if login_path else 0)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    probes = []
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        probes.append(request(port, "GET", "/get-jobs")[1])
+        time.sleep(probe_interval)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        "get_jobs_p50_ms": round(statistics.median(probes), 1),
+        "get_jobs_p99_ms": percentile(probes, 0.99),
+        "get_jobs_max_ms": round(max(probes), 1),
+        "probes": len(probes),
+        "login_statuses": statuses,
+        "logins_per_sec": round(statuses.get(200, 0) / seconds, 1),
+        "login_p50_ms": round(statistics.median(login_ms), 1) if login_ms else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--probe-interval', type=float, default=0.02)
+    parser.add_argument('--port', type=int, default=5091)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.rounds)
+        return
+
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', '--port', str(args.port),
+                               '--rounds', str(args.rounds)], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        server.stdout.readline()
+        report = {"cpus": os.cpu_count(), "clients": args.clients, "bcrypt_rounds": args.rounds}
+        report["idle"] = phase(args.port, None, 0, args.seconds, args.probe_interval)
+        report["storm_inline"] = phase(args.port, "/login-inline", args.clients, args.seconds, args.probe_interval)
+        report["storm_auth_pool"] = phase(args.port, "/login", args.clients, args.seconds, args.probe_interval)
+    finally:
+        server.terminate()
+        server.wait()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# Time to first token of the chatbot's LLM path: streaming vs the previous
+# blocking ollama.chat call, plus the FAQ fallback when the model is slow.
+#
+# Runs against a local stub of Ollama's /api/chat endpoint that emits
+# NDJSON chunks with a configurable startup delay and per-token delay, so no
+# model (or Ollama install) is needed.
+#
+#   python benchmarks/bench_chatbot_ttft.py --tokens 60 --token-ms 40
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import ollama
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'chatbot'))
+
+from llm_stream import build_prompt, stream_llm_answer
+
+FAQ_ANSWER = "A: You can apply by visiting our careers page, selecting the desired position, and submitting your application online."
+
+
+def make_stub(startup_ms, token_ms, tokens):
+    class StubOllama(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            limit = min(tokens, body.get("options", {}).get("num_predict") or tokens)
+            words = (FAQ_ANSWER.split() * (limit // len(FAQ_ANSWER.split()) + 1))[:limit]
+            # Like Ollama: "length" when num_predict cut the answer short
+            done_reason = "length" if limit < tokens else "stop"
+            time.sleep(startup_ms / 1000)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            if not body.get("stream", True):
+                # Blocking mode: Ollama renders the whole completion first
+                time.sleep(token_ms * len(words) / 1000)
+                payload = json.dumps({"model": body["model"], "done": True, "done_reason": done_reason,
+                                      "message": {"role": "assistant", "content": " ".join(words)}}).encode()
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for word in words + [None]:
+                    chunk = {"model": body["model"], "done": word is None, "done_reason": done_reason if word is None else None,
+                             "message": {"role": "assistant", "content": "" if word is None else word + " "}}
+                    line = json.dumps(chunk).encode() + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+                    if word is not None:
+                        time.sleep(token_ms / 1000)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return StubOllama
+
+
+class QuietServer(ThreadingHTTPServer):
+    # The fallback run hangs up on the stub mid-request; that is expected
+    def handle_error(self, request, client_address):
+        pass
+
+
+def start_stub(startup_ms, token_ms, tokens):
+    server = QuietServer(("127.0.0.1", 0), make_stub(startup_ms, token_ms, tokens))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def measure_stream(host, first_token_timeout, max_tokens):
+    start = time.perf_counter()
+    first = None
+    status = {}
+    text = []
+    for token in stream_llm_answer(build_prompt(FAQ_ANSWER), FAQ_ANSWER, host=host,
+                                   first_token_timeout=first_token_timeout, max_tokens=max_tokens, status=status):
+        if first is None:
+            first = time.perf_counter() - start
+        text.append(token)
+    return {
+        "ttft_ms": round(first * 1000, 1),
+        "total_ms": round((time.perf_counter() - start) * 1000, 1),
+        "completed_by_model": status.get("complete", False),
+        "fell_back_to_faq": "".join(text) == FAQ_ANSWER
+    }
+
+
+def measure_blocking(host):
+    start = time.perf_counter()
+    ollama.Client(host=host).chat(model="tinyllama", messages=[{"role": "user", "content": build_prompt(FAQ_ANSWER)}])
+    elapsed = round((time.perf_counter() - start) * 1000, 1)
+    return {"ttft_ms": elapsed, "total_ms": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--startup-ms', type=float, default=150)
+    parser.add_argument('--token-ms', type=float, default=40)
+    parser.add_argument('--tokens', type=int, default=60)
+    parser.add_argument('--max-tokens', type=int, default=256)
+    parser.add_argument('--first-token-timeout', type=float, default=3)
+    parser.add_argument('--slow-startup-ms', type=float, default=5000,
+                        help="startup delay of the 'slow model' run, which should fall back to the FAQ answer")
+    args = parser.parse_args()
+
+    report = {}
+    server, host = start_stub(args.startup_ms, args.token_ms, args.tokens)
+    report["blocking"] = measure_blocking(host)
+    report["streaming"] = measure_stream(host, args.first_token_timeout, args.max_tokens)
+    report["streaming_max_tokens_10"] = measure_stream(host, args.first_token_timeout, 10)
+    server.shutdown()
+
+    slow_server, slow_host = start_stub(args.slow_startup_ms, args.token_ms, args.tokens)
+    report["slow_model_fallback"] = measure_stream(slow_host, args.first_token_timeout, args.max_tokens)
+    slow_server.shutdown()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
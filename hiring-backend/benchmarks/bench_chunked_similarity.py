@@ -0,0 +1,92 @@
+# Latency and ranking quality of whole-document vs chunked content similarity.
+#
+# Each distinct resume in dataset/skills.csv takes a turn as the query (a
+# stand-in for a JD) and the rest are ranked by similarity_many; a hit is a
+# resume from the same Category. Every mode starts from an empty embedding
+# cache so the timings include encoding.
+#
+#   python benchmarks/bench_chunked_similarity.py --docs 150 --queries 25
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_store import EmbeddingStore
+from resume_matcher import ResumeMatcher, DEFAULT_MODEL_NAME
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset', 'skills.csv')
+MODES = [("single", None), ("chunked", "maxsim"), ("chunked", "mean")]
+
+
+def load_resumes(limit):
+    csv.field_size_limit(sys.maxsize)
+    seen = set()
+    resumes = []
+    with open(DATASET, encoding='utf-8', errors='ignore') as f:
+        for row in csv.DictReader(f):
+            digest = hashlib.sha1(row['Resume'].encode('utf-8')).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            resumes.append((row['Category'], row['Resume']))
+            if len(resumes) == limit:
+                break
+    return resumes
+
+
+def evaluate(matcher, resumes, queries, k):
+    precision, reciprocal_ranks = [], []
+    start = time.perf_counter()
+    for q in range(queries):
+        category, query_text = resumes[q]
+        others = [r for i, r in enumerate(resumes) if i != q]
+        scores = matcher.similarity_many(query_text, [text for _, text in others])
+        ranked = [others[i][0] for i in sorted(range(len(others)), key=lambda i: -scores[i])]
+        precision.append(sum(c == category for c in ranked[:k]) / k)
+        rank = next((i + 1 for i, c in enumerate(ranked) if c == category), None)
+        reciprocal_ranks.append(1 / rank if rank else 0)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 2),
+        "ms_per_query": round(elapsed / queries * 1000, 1),
+        f"precision_at_{k}": round(sum(precision) / queries, 3),
+        "mrr": round(sum(reciprocal_ranks) / queries, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--docs', type=int, default=150)
+    parser.add_argument('--queries', type=int, default=25)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    resumes = load_resumes(args.docs)
+    matcher = ResumeMatcher(args.model)
+    chunk_counts = [len(matcher.chunk_text(text)) for _, text in resumes]
+    report = {
+        "model": args.model,
+        "docs": len(resumes),
+        "queries": args.queries,
+        "avg_words": round(sum(len(text.split()) for _, text in resumes) / len(resumes), 1),
+        "avg_chunks": round(sum(chunk_counts) / len(chunk_counts), 2)
+    }
+    for mode, aggregation in MODES:
+        matcher.similarity_mode = mode
+        matcher.chunk_aggregation = aggregation
+        with tempfile.TemporaryDirectory() as directory:
+            matcher.embedding_store = EmbeddingStore(args.model, matcher.embedding_store.dim, directory)
+            report[mode if aggregation is None else f"{mode}_{aggregation}"] = evaluate(matcher, resumes, args.queries, args.k)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
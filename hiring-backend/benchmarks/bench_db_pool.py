@@ -0,0 +1,106 @@
+# Request-path DB cost before and after the connection pool.
+#
+# "legacy" replays what every route used to do: connect without a database,
+# CREATE DATABASE IF NOT EXISTS, reconnect, CREATE TABLE IF NOT EXISTS +
+# commit, run the query, close. "pooled" checks a connection out of
+# db.ConnectionPool and runs the same query. Connection churn is read from
+# MySQL's global Connections counter.
+#
+#   python benchmarks/bench_db_pool.py --requests 2000 --threads 16
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymysql
+
+import db
+
+QUERY = "SELECT job_id, job_role, experience, salary, location FROM jobs_description LIMIT 50"
+
+
+def legacy_request():
+    server_config = {key: value for key, value in db.DB_CONFIG.items() if key != 'database'}
+    conn = pymysql.connect(cursorclass=pymysql.cursors.DictCursor, **server_config)
+    with conn.cursor() as cursor:
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{db.DB_CONFIG['database']}`")
+    conn.commit()
+    conn.close()
+    conn = pymysql.connect(cursorclass=pymysql.cursors.DictCursor, **db.DB_CONFIG)
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs_description (
+                job_id INT PRIMARY KEY,
+                job_role VARCHAR(255),
+                experience VARCHAR(255),
+                salary DECIMAL(10, 2),
+                location VARCHAR(255),
+                job_description VARCHAR(255)
+            )
+        """)
+        conn.commit()
+        cursor.execute(QUERY)
+        cursor.fetchall()
+    conn.close()
+
+
+def pooled_request():
+    with db.connection() as conn, conn.cursor() as cursor:
+        cursor.execute(QUERY)
+        cursor.fetchall()
+
+
+def server_connections():
+    conn = pymysql.connect(**db.DB_CONFIG)
+    with conn.cursor() as cursor:
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Connections'")
+        value = int(cursor.fetchone()[1])
+    conn.close()
+    return value
+
+
+def run(fn, requests, threads):
+    def timed(_):
+        start = time.perf_counter()
+        fn()
+        return (time.perf_counter() - start) * 1000
+
+    before = server_connections()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+        # Minus the one connection server_connections() itself opens
+        "new_connections": server_connections() - before - 1
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+
+    db.migrate()
+    report = {
+        "requests": args.requests,
+        "threads": args.threads,
+        "pool_size": db.POOL_SIZE,
+        "legacy": run(legacy_request, args.requests, args.threads),
+        "pooled": run(pooled_request, args.requests, args.threads),
+        "pool_stats": db.get_pool().stats()
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Throughput of the shared embedding server under concurrent single-resume
+# requests (what parallel /apply-job calls look like), against every
+# client encoding in-process with its own model copy.
+#
+#   python benchmarks/bench_embedding_server.py --clients 8 --requests 200
+import argparse
+import csv
+import json
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import psutil
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from embedding_server import RemoteEncoder
+from encoder import DEFAULT_MODEL_NAME, INFERENCE_BACKEND, load_encoder
+
+DATASET = os.path.join(BACKEND_DIR, 'dataset', 'skills.csv')
+
+
+def load_texts(limit):
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, encoding='utf-8', errors='ignore') as f:
+        return [row['Resume'] for _, row in zip(range(limit), csv.DictReader(f))]
+
+
+def run_clients(encode, texts, clients):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(chunk):
+        for text in chunk:
+            start = time.perf_counter()
+            encode(text)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(texts[i::clients],)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests_per_sec": round(len(texts) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--backend', default=INFERENCE_BACKEND)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--max-wait-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    texts = load_texts(args.requests)
+    report = {"model": args.model, "backend": args.backend, "clients": args.clients, "requests": len(texts)}
+
+    # In-process: one model shared by the client threads of a single worker
+    rss_before = psutil.Process().memory_info().rss
+    model = load_encoder(args.model, args.backend)
+    model.encode(texts[:4])
+    report["in_process"] = run_clients(lambda t: model.encode(t, convert_to_numpy=True), texts, args.clients)
+    report["in_process"]["model_rss_mb"] = round((psutil.Process().memory_info().rss - rss_before) / 2 ** 20)
+    del model
+
+    # Shared by the server subprocess (through the environment) and the client
+    os.environ.setdefault('EMBEDDING_SERVER_KEY', secrets.token_hex(32))
+    with tempfile.TemporaryDirectory() as directory:
+        address = os.path.join(directory, 'embeddings.sock')
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(BACKEND_DIR, 'embedding_server.py'), '--address', address,
+             '--model', args.model, '--backend', args.backend, '--max-wait-ms', str(args.max_wait_ms)])
+        try:
+            while not os.path.exists(address):
+                if server.poll() is not None:
+                    sys.exit("Embedding server exited before it started listening")
+                time.sleep(0.2)
+            encoder = RemoteEncoder(address)
+            encoder.encode(texts[:4])
+            report["server"] = run_clients(encoder.encode, texts, args.clients)
+            report["server"]["server_rss_mb"] = round(psutil.Process(server.pid).memory_info().rss / 2 ** 20)
+            report["server"]["batching"] = encoder.stats()
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
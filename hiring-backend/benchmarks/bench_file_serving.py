@@ -0,0 +1,116 @@
+# Resume download latency through a Flask test client: the previous
+# exists() + send_file() handler against file_serving (index lookup, strong
+# ETag, Range, X-Accel-Redirect), for a shortlist of PDFs fetched repeatedly.
+#
+#   python benchmarks/bench_file_serving.py --files 50 --requests 2000
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from flask import Flask, jsonify, send_file
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import file_serving
+import storage
+
+
+def make_app(upload_folder):
+    app = Flask(__name__)
+    index = file_serving.FileIndex(upload_folder)
+
+    @app.route('/legacy/<filename>')
+    def legacy(filename):
+        file_path = os.path.join(upload_folder, filename)
+        if os.path.exists(file_path):
+            return send_file(os.path.abspath(file_path), as_attachment=True)
+        return jsonify({"error": "Resume not found"}), 404
+
+    @app.route('/download-resume/<filename>')
+    def download(filename):
+        response = file_serving.send_stored(index, filename, filename, lambda name: storage.resolve(name, upload_folder))
+        if response is None:
+            return jsonify({"error": "Resume not found"}), 404
+        return response
+
+    return app
+
+
+def seed(upload_folder, files, size_kb):
+    rng = random.Random(7)
+    names = []
+    for _ in range(files):
+        body = b"%PDF-1.4\n" + rng.randbytes(size_kb * 1024)
+        with tempfile.SpooledTemporaryFile() as f:
+            f.write(body)
+            f.seek(0)
+            stored = storage.store(f, upload_folder)
+        names.append(os.path.basename(stored.path))
+    return names
+
+
+def measure(client, urls, headers=None):
+    latencies = []
+    statuses = {}
+    for url in urls:
+        start = time.perf_counter()
+        response = client.get(url, headers=headers or {})
+        response.get_data()
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        response.close()
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 3),
+        "per_sec": round(len(latencies) / (sum(latencies) / 1000)),
+        "statuses": statuses
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=50)
+    parser.add_argument('--size-kb', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    report = {}
+    with tempfile.TemporaryDirectory() as upload_folder:
+        names = seed(upload_folder, args.files, args.size_kb)
+        rng = random.Random(11)
+        picks = [rng.choice(names) for _ in range(args.requests)]
+        # The legacy handler served flat uploads/<name>; give it the same files
+        for name in names:
+            os.link(storage.resolve(name, upload_folder), os.path.join(upload_folder, name))
+
+        for mode in ("flask", "x-accel"):
+            file_serving.FILE_SERVING = mode
+            client = make_app(upload_folder).test_client()
+            if mode == "flask":
+                report["legacy_full"] = measure(client, [f"/legacy/{name}" for name in picks])
+            urls = [f"/download-resume/{name}" for name in picks]
+            report[f"{mode}_full"] = measure(client, urls)
+            etag = client.get(urls[0]).headers["ETag"]
+            report[f"{mode}_revalidate_304"] = measure(client, [urls[0]] * args.requests, {"If-None-Match": etag})
+            if mode == "flask":
+                report["flask_range_64k"] = measure(client, urls, {"Range": "bytes=0-65535"})
+
+        # A symlink inside the upload folder must not expose files outside it
+        os.symlink(os.path.abspath(__file__), os.path.join(upload_folder, "link.pdf"))
+        client = make_app(upload_folder).test_client()
+        report["traversal"] = {url: client.get(url).status_code
+                               for url in ["/download-resume/..%2F..%2Fetc%2Fpasswd", "/download-resume/.hidden.pdf",
+                                           "/download-resume/%2e%2e", "/download-resume/link.pdf",
+                                           "/download-resume/missing.pdf"]}
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
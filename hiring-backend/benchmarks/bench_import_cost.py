@@ -0,0 +1,95 @@
+# Startup cost of an API worker with and without the ML stack: wall time to
+# import the modules app.py loads, peak RSS, which heavy packages ended up in
+# sys.modules, and the slowest imports from python -X importtime. Each run is
+# a fresh interpreter.
+#
+#   python benchmarks/bench_import_cost.py --repeat 5
+#   python benchmarks/bench_import_cost.py --app   # import app.py itself (needs its full requirements)
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What app.py imports at module load (flask_cors and flask_jwt_extended are
+# skipped when not installed)
+API_MODULES = ["flask", "flask_cors", "flask_jwt_extended", "pymysql", "scoring_queue",
+               "scoring_worker", "db", "pagination", "applicants_query", "ingest", "storage", "file_serving", "auth_pool",
+               "scoring_policy", "metrics", "profiler"]
+HEAVY_MODULES = ["numpy", "faiss", "fitz", "torch", "sentence_transformers", "onnxruntime", "pandas", "spacy",
+                 "fuzzywuzzy", "resume_matcher"]
+
+PROBE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+missing = []
+for name in {modules!r}:
+    try:
+        importlib.import_module(name)
+    except ModuleNotFoundError as e:
+        if e.name == name.split(".")[0] and name in {optional!r}:
+            missing.append(name)
+        else:
+            raise
+elapsed = time.perf_counter() - start
+print(json.dumps({{"import_ms": elapsed * 1000, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                  "missing": missing, "heavy_loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run(modules, env=None, repeat=3):
+    code = PROBE.format(modules=modules, optional=["flask_cors", "flask_jwt_extended"], heavy=HEAVY_MODULES)
+    runs = []
+    slowest = None
+    for i in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND_DIR,
+                                env={**os.environ, **(env or {})}, capture_output=True, text=True)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+        if i == 0:
+            slowest = top_imports(result.stderr)
+    return {
+        "import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "max_rss_mb": round(statistics.median(r["max_rss_mb"] for r in runs), 1),
+        "heavy_loaded": runs[0]["heavy_loaded"],
+        "missing": runs[0]["missing"],
+        "slowest_top_level_ms": slowest
+    }
+
+
+def top_imports(stderr, n=6):
+    # Top-level packages (no leading indent) by cumulative import time
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        _, cumulative, name = [part for part in rest.split("|")]
+        if not name.startswith("  "):
+            entries.append((int(cumulative) / 1000, name.strip()))
+    return {name: round(ms, 1) for ms, name in sorted(entries, reverse=True)[:n]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--app', action='store_true', help="Also import app.py with API_ONLY=1 and API_ONLY=0")
+    args = parser.parse_args()
+
+    report = {
+        "api_only": run(API_MODULES, repeat=args.repeat),
+        "api_with_matcher": run(API_MODULES + ["resume_matcher"], repeat=args.repeat)
+    }
+    if args.app:
+        # No warm-up thread: measure imports, not model loading
+        report["app_api_only"] = run(["app"], {"API_ONLY": "1"}, args.repeat)
+        report["app_full"] = run(["app", "resume_matcher"], {"API_ONLY": "0", "WARM_MATCHER": "0"}, args.repeat)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# Throughput, latency, memory and score drift of the matcher's inference
+# backends on resumes from dataset/skills.csv.
+#
+# Every model/backend pair runs in its own subprocess so RSS is measured in
+# isolation. Drift compares the 0-100 content similarity scores (and the
+# top-k ranking) of a set of resumes used as queries against the torch fp32
+# baseline of the default model.
+#
+#   python benchmarks/bench_inference_backends.py --docs 200
+import argparse
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset', 'skills.csv')
+CONFIGS = [
+    ("all-mpnet-base-v2", "torch"),
+    ("all-mpnet-base-v2", "onnx"),
+    ("all-mpnet-base-v2", "onnx-int8"),
+    ("all-MiniLM-L6-v2", "torch"),
+    ("all-MiniLM-L6-v2", "onnx-int8"),
+]
+
+
+def load_texts(limit):
+    csv.field_size_limit(sys.maxsize)
+    texts = []
+    with open(DATASET, encoding='utf-8', errors='ignore') as f:
+        for row in csv.DictReader(f):
+            # Same normalisation as ResumeMatcher.preprocess_text
+            text = re.sub(r'\d+', '', re.sub(r'[^\w\s]', '', row['Resume'].lower()))
+            texts.append(" ".join(text.split()))
+            if len(texts) == limit:
+                break
+    return texts
+
+
+def run_config(model_name, backend, docs, latency_samples, vectors_path):
+    from encoder import load_encoder
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    model = load_encoder(model_name, backend)
+    load_seconds = time.perf_counter() - start
+    texts = load_texts(docs)
+    model.encode(texts[:4])
+
+    start = time.perf_counter()
+    vectors = model.encode(texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=True)
+    batch_seconds = time.perf_counter() - start
+
+    # One document per call, as /apply-job scores a single resume
+    latencies = []
+    for text in texts[:latency_samples]:
+        start = time.perf_counter()
+        model.encode(text, convert_to_numpy=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    np.save(vectors_path, vectors.astype(np.float32))
+    return {
+        "load_seconds": round(load_seconds, 2),
+        "docs_per_sec": round(len(texts) / batch_seconds, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+        "rss_mb": round(process.memory_info().rss / 2 ** 20),
+        "model_rss_mb": round((process.memory_info().rss - rss_before) / 2 ** 20)
+    }
+
+
+def score_drift(vectors, baseline, queries, k):
+    # Score every resume against the first `queries` resumes (stand-ins for JDs)
+    scores = vectors[:queries] @ vectors[queries:].T * 100
+    base_scores = baseline[:queries] @ baseline[queries:].T * 100
+    diff = np.abs(scores - base_scores)
+    top = np.argsort(-scores, axis=1)[:, :k]
+    base_top = np.argsort(-base_scores, axis=1)[:, :k]
+    overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(top, base_top)])
+    return {
+        "mean_abs_score_drift": round(float(diff.mean()), 3),
+        "max_abs_score_drift": round(float(diff.max()), 3),
+        f"top_{k}_overlap": round(float(overlap), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--latency-samples', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--worker', nargs=3, metavar=('MODEL', 'BACKEND', 'VECTORS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        model_name, backend, vectors_path = args.worker
+        print(json.dumps(run_config(model_name, backend, args.docs, args.latency_samples, vectors_path)))
+        return
+
+    report = {"docs": args.docs, "latency_samples": args.latency_samples}
+    with tempfile.TemporaryDirectory() as directory:
+        vectors = {}
+        for model_name, backend in CONFIGS:
+            name = f"{model_name}/{backend}"
+            vectors_path = os.path.join(directory, f"{len(vectors)}.npy")
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--docs', str(args.docs),
+                 '--latency-samples', str(args.latency_samples), '--worker', model_name, backend, vectors_path],
+                capture_output=True, text=True)
+            if result.returncode != 0:
+                report[name] = {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+                continue
+            report[name] = json.loads(result.stdout.strip().splitlines()[-1])
+            vectors[name] = np.load(vectors_path)
+
+        baseline_name = f"{CONFIGS[0][0]}/{CONFIGS[0][1]}"
+        if baseline_name in vectors:
+            baseline = vectors[baseline_name]
+            for name, config_vectors in vectors.items():
+                if name != baseline_name:
+                    report[name]["drift_vs_" + baseline_name] = score_drift(config_vectors, baseline, args.queries, args.k)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
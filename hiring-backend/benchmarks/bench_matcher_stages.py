@@ -0,0 +1,270 @@
+# Per-stage timings of match_resume on synthetic resumes and JDs built from
+# the dataset/skills.csv categories, at several corpus sizes, as JSON.
+#
+#   python benchmarks/bench_matcher_stages.py --sizes 1 100 10000 --output bench.json
+#   python benchmarks/bench_matcher_stages.py --baseline bench.json   # exit 1 on regressions
+#
+# Each size runs in a fresh subprocess with cold PDF text and embedding
+# caches, so peak RSS and first-call costs are measured per size. Stages
+# follow match_resume: db_fetch (only with --db, against a scratch database),
+# pdf_extract, skill_extract, encode and scoring. The spaCy parse stage of
+# older versions is gone; skill extraction is the Aho-Corasick SkillMatcher.
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+import fitz
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DATASET = os.path.join(BACKEND_DIR, 'dataset', 'skills.csv')
+STAGES = ["db_fetch", "pdf_extract", "skill_extract", "encode", "scoring"]
+FIRST_NAMES = ["Asha", "Ravi", "Meera", "Arjun", "Divya", "Karthik", "Priya", "Vikram", "Neha", "Rahul"]
+LAST_NAMES = ["Kumar", "Sharma", "Iyer", "Reddy", "Nair", "Patel", "Singh", "Das", "Menon", "Rao"]
+
+
+def load_categories():
+    # Category -> sentences from its (deduplicated) resumes
+    csv.field_size_limit(sys.maxsize)
+    seen = set()
+    sentences = {}
+    with open(DATASET, encoding='utf-8', errors='ignore') as f:
+        for row in csv.DictReader(f):
+            digest = hashlib.sha1(row['Resume'].encode('utf-8')).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            parts = [s.strip() for s in row['Resume'].replace('\r', ' ').split('.') if len(s.split()) >= 4]
+            sentences.setdefault(row['Category'], []).extend(parts)
+    return sentences
+
+
+def category_skills():
+    from skill_lexicon import load_lexicon
+    lexicon = load_lexicon() or {"categories": {}}
+    return {category: [term for term, _ in sorted(counts.items(), key=lambda kv: -kv[1])[:40]]
+            for category, counts in lexicon["categories"].items()}
+
+
+def synthetic_resume(rng, category, sentences, skills):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    picked = rng.sample(skills, min(len(skills), rng.randint(6, 15))) if skills else []
+    body = ". ".join(rng.sample(sentences, min(len(sentences), rng.randint(15, 40))))
+    return f"{name}\n{category}\n\nSkills: {', '.join(picked)}\n\nExperience\n{body}."
+
+
+def synthetic_jd(rng, category, sentences, skills):
+    required = skills[:rng.randint(5, 10)]
+    body = ". ".join(rng.sample(sentences, min(len(sentences), 8)))
+    return (f"Job Title: {category}\n\nRequired skills: {', '.join(required)}\n\n"
+            f"Responsibilities\n{body}.")
+
+
+def write_pdf(path, text):
+    doc = fitz.open()
+    # insert_textbox drops whatever overflows, so wrap and paginate up front
+    lines = [wrapped for line in text.split("\n") for wrapped in (textwrap.wrap(line, 100) or [""])]
+    while lines:
+        page = doc.new_page()
+        # About 60 lines of 9pt text per A4 page
+        chunk, lines = lines[:60], lines[60:]
+        page.insert_textbox(fitz.Rect(40, 40, 555, 800), "\n".join(chunk), fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def build_corpus(directory, pairs, seed=13):
+    rng = random.Random(seed)
+    sentences = load_categories()
+    skills = category_skills()
+    categories = sorted(c for c in sentences if len(sentences[c]) >= 40)
+    jd_paths = {}
+    for category in categories:
+        path = os.path.join(directory, f"jd_{len(jd_paths)}.pdf")
+        write_pdf(path, synthetic_jd(rng, category, sentences[category], skills.get(category, [])))
+        jd_paths[category] = path
+    corpus = []
+    for i in range(pairs):
+        category = rng.choice(categories)
+        # Most applicants apply to a job in their own field
+        jd_category = category if rng.random() < 0.7 else rng.choice(categories)
+        path = os.path.join(directory, f"resume_{i}.pdf")
+        write_pdf(path, synthetic_resume(rng, category, sentences[category], skills.get(category, [])))
+        corpus.append((jd_paths[jd_category], path))
+    return corpus
+
+
+def seed_database(corpus):
+    # Scratch rows so db_fetch runs the real fetch_resume_and_job query;
+    # removed again by clear_database
+    import db
+    if not db.DB_CONFIG['database'].endswith('_bench'):
+        sys.exit(f"--db seeds scratch rows; point DB_NAME at a dedicated *_bench database, not {db.DB_CONFIG['database']}")
+    db.migrate()
+    ids = []
+    with db.connection() as conn, conn.cursor() as cursor:
+        job_ids = {}
+        for jd_path, resume_path in corpus:
+            if jd_path not in job_ids:
+                cursor.execute("INSERT INTO jobs_description (job_role, job_description) VALUES (%s, %s)",
+                               ("Benchmark role", jd_path))
+                job_ids[jd_path] = cursor.lastrowid
+            cursor.execute("INSERT INTO candidate_details (name, resume) VALUES (%s, %s)",
+                           ("Benchmark candidate", resume_path))
+            ids.append((job_ids[jd_path], cursor.lastrowid))
+        conn.commit()
+    return ids
+
+
+def clear_database(db_ids):
+    import db
+    with db.connection() as conn, conn.cursor() as cursor:
+        # Applications of these rows cascade
+        cursor.executemany("DELETE FROM candidate_details WHERE candidate_id = %s", [(c,) for _, c in db_ids])
+        cursor.executemany("DELETE FROM jobs_description WHERE job_id = %s", sorted({(j,) for j, _ in db_ids}))
+        conn.commit()
+
+
+def summarize(latencies_ms):
+    values = np.asarray(latencies_ms)
+    return {
+        "count": len(values),
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "per_sec": round(len(values) / float(values.sum() / 1000), 1) if values.sum() else None
+    }
+
+
+def run_size(pairs, use_db, model_name, backend):
+    from embedding_store import EmbeddingStore
+    from encoder import vector_key
+    from resume_matcher import ResumeMatcher
+
+    timings = {stage: [] for stage in STAGES}
+    timings["total"] = []
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        corpus = build_corpus(directory, pairs)
+        corpus_seconds = time.perf_counter() - start
+        db_ids = seed_database(corpus) if use_db else None
+        try:
+            matcher = ResumeMatcher(model_name, backend=backend)
+            # Cold embedding cache for this run only
+            matcher.embedding_store = EmbeddingStore(vector_key(matcher.model_name, matcher.backend), matcher.embedding_store.dim,
+                                                     os.path.join(directory, 'embeddings'))
+            rss_after_load = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+            for i, (jd_path, resume_path) in enumerate(corpus):
+                pair_start = time.perf_counter()
+                if db_ids:
+                    t = time.perf_counter()
+                    matcher.fetch_resume_and_job(*db_ids[i])
+                    timings["db_fetch"].append((time.perf_counter() - t) * 1000)
+
+                t = time.perf_counter()
+                job_text = matcher.extract_text_from_pdf(jd_path)
+                resume_text = matcher.extract_text_from_pdf(resume_path)
+                timings["pdf_extract"].append((time.perf_counter() - t) * 1000)
+
+                t = time.perf_counter()
+                job_skills = matcher.extract_skills(job_text)
+                resume_skills = matcher.extract_skills(resume_text)
+                timings["skill_extract"].append((time.perf_counter() - t) * 1000)
+
+                t = time.perf_counter()
+                job_vector = matcher.embed_text(job_text)
+                resume_vector = matcher.embed_text(resume_text)
+                timings["encode"].append((time.perf_counter() - t) * 1000)
+
+                t = time.perf_counter()
+                skill_match, matched_skills = matcher.compare_skills(job_skills, resume_skills)
+                content_similarity = float(np.dot(job_vector, resume_vector)) * 100
+                matcher.build_result(matcher.blend_scores(skill_match, content_similarity),
+                                     skill_match, content_similarity, matched_skills)
+                timings["scoring"].append((time.perf_counter() - t) * 1000)
+                timings["total"].append((time.perf_counter() - pair_start) * 1000)
+        finally:
+            if db_ids:
+                clear_database(db_ids)
+
+    return {
+        "pairs": pairs,
+        "corpus_build_seconds": round(corpus_seconds, 2),
+        "stages": {stage: summarize(values) for stage, values in timings.items() if values},
+        # ru_maxrss is in KiB on Linux
+        "rss_after_model_load_mb": round(rss_after_load / 1024),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+    }
+
+
+def compare(report, baseline, tolerance):
+    # Stages whose p50 got slower than baseline * tolerance
+    regressions = []
+    for size, result in report["sizes"].items():
+        base = baseline.get("sizes", {}).get(size)
+        if not base:
+            continue
+        for stage, stats in result["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if base_stats and base_stats["p50_ms"] > 0 and stats["p50_ms"] > base_stats["p50_ms"] * tolerance:
+                regressions.append({"size": size, "stage": stage, "baseline_p50_ms": base_stats["p50_ms"],
+                                    "p50_ms": stats["p50_ms"], "ratio": round(stats["p50_ms"] / base_stats["p50_ms"], 2)})
+    return regressions
+
+
+def main():
+    from encoder import DEFAULT_MODEL_NAME, INFERENCE_BACKEND
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--backend', default=INFERENCE_BACKEND)
+    parser.add_argument('--db', action='store_true', help="also time fetch_resume_and_job (seeds and then clears DB_NAME, which must end in _bench; default hiring_db_bench)")
+    parser.add_argument('--output')
+    parser.add_argument('--baseline', help="earlier JSON report to compare p50s against")
+    parser.add_argument('--tolerance', type=float, default=1.2)
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(run_size(args.worker, args.db, args.model, args.backend)))
+        return
+
+    env = dict(os.environ)
+    if args.db:
+        env.setdefault('DB_NAME', 'hiring_db_bench')
+    report = {"model": args.model, "backend": args.backend, "created_at": time.time(), "sizes": {}}
+    for size in args.sizes:
+        command = [sys.executable, os.path.abspath(__file__), '--worker', str(size),
+                   '--model', args.model, '--backend', args.backend] + (['--db'] if args.db else [])
+        result = subprocess.run(command, capture_output=True, text=True, env=env)
+        if result.returncode != 0:
+            sys.exit(f"Size {size} failed:\n{result.stderr}")
+        report["sizes"][str(size)] = json.loads(result.stdout.strip().splitlines()[-1])
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# Re-ranking a job under a new scoring policy from stored score components:
+# the per-row Python blend, the vectorised NumPy blend and (with --db) the
+# single SQL UPDATE that /rescore-job runs, against N applications.
+#
+#   python benchmarks/bench_rescore.py --applications 10000
+#   DB_NAME=hiring_db_bench python benchmarks/bench_rescore.py --db
+#
+# For scale, the previous /rescore-job re-ran PDF extraction and the
+# transformer on every application; see bench_matcher_stages.py for those
+# per-pair costs.
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault('DB_NAME', 'hiring_db_bench')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring_policy
+
+BENCH_JOB_ID = 999999
+BATCH = 10000
+
+
+def synthetic_components(n, seed=42):
+    rng = np.random.default_rng(seed)
+    skill_match = rng.choice([0, 20, 40, 60, 80, 90, 100], n).astype(np.float64) + rng.uniform(0, 10, n)
+    return np.minimum(skill_match, 100), rng.uniform(10, 90, n)
+
+
+def time_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(min(timings), 3)
+
+
+def seed(conn, skill_match, content_similarity):
+    with conn.cursor() as cursor:
+        cursor.execute("INSERT IGNORE INTO jobs_description (job_id, job_role, job_description) VALUES (%s, %s, %s)",
+                       (BENCH_JOB_ID, "Rescore benchmark", "uploads/bench.pdf"))
+        cursor.execute("DELETE FROM job_application WHERE job_id = %s", (BENCH_JOB_ID,))
+        cursor.execute("SELECT candidate_id FROM candidate_details ORDER BY candidate_id LIMIT %s", (len(skill_match),))
+        candidate_ids = [row['candidate_id'] for row in cursor.fetchall()]
+        while len(candidate_ids) < len(skill_match):
+            cursor.execute("INSERT INTO candidate_details (name) VALUES (%s)", ("Rescore candidate",))
+            candidate_ids.append(cursor.lastrowid)
+        rows = [(BENCH_JOB_ID, c, float(s), float(cs), '[]') for c, s, cs in zip(candidate_ids, skill_match, content_similarity)]
+        for start in range(0, len(rows), BATCH):
+            cursor.executemany("""
+                INSERT INTO job_application (job_id, candidate_id, skill_match, content_similarity, matched_skills)
+                VALUES (%s, %s, %s, %s, %s)
+            """, rows[start:start + BATCH])
+        conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--applications', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', action='store_true', help="also time the SQL UPDATE on a scratch database")
+    args = parser.parse_args()
+
+    policy = scoring_policy.get_policy()
+    skill_match, content_similarity = synthetic_components(args.applications)
+    pairs = list(zip(skill_match.tolist(), content_similarity.tolist()))
+
+    report = {"applications": args.applications, "policy_version": policy["version"]}
+    report["python_loop_ms"] = time_ms(lambda: [scoring_policy.blend(policy, s, c) for s, c in pairs], args.repeat)
+    report["numpy_ms"] = time_ms(lambda: scoring_policy.blend_many(policy, skill_match, content_similarity), args.repeat)
+    looped = np.array([scoring_policy.blend(policy, s, c) for s, c in pairs])
+    report["max_abs_difference"] = float(np.abs(looped - scoring_policy.blend_many(policy, skill_match, content_similarity)).max())
+
+    if args.db:
+        import db
+        db.migrate()
+        with db.connection() as conn:
+            seed(conn, skill_match, content_similarity)
+            expression, params = scoring_policy.final_score_sql(policy)
+
+            def update():
+                with conn.cursor() as cursor:
+                    cursor.execute(f"""
+                        UPDATE job_application SET final_score = {expression}, policy_version = %s
+                        WHERE job_id = %s AND skill_match IS NOT NULL AND content_similarity IS NOT NULL
+                    """, params + [policy["version"], BENCH_JOB_ID])
+                    conn.commit()
+
+            report["sql_update_ms"] = time_ms(update, args.repeat)
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT final_score FROM job_application WHERE job_id = %s ORDER BY candidate_id", (BENCH_JOB_ID,))
+                stored = np.array([float(row['final_score']) for row in cursor.fetchall()])
+            report["sql_max_abs_difference"] = float(np.abs(stored - np.round(looped, 2)).max())
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# Throughput of the Aho-Corasick SkillMatcher against the previous spaCy
+# token/noun-chunk lookup, on resumes from dataset/skills.csv.
+#
+#   python benchmarks/bench_skill_matcher.py --docs 200
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SkillMatcher, SKILL_ALIASES, tokenize
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dataset', 'skills.csv')
+
+BASE_SKILLS = [
+    "python", "java", "javascript", "c++", "c#", "sql", "firebase", "mongodb",
+    "react", "reactjs", "angular", "node.js", "machine learning", "deep learning",
+    "artificial intelligence", "data science", "nlp", "pandas", "numpy", "tensorflow",
+    "pytorch", "django", "flask", "spring boot", "aws", "azure", "docker", "kubernetes",
+    "git", "github", "html", "css", "bootstrap", "tailwind", "typescript"
+]
+
+
+def load_resumes(limit):
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, encoding='utf-8', errors='ignore') as f:
+        return [row['Resume'] for _, row in zip(range(limit), csv.DictReader(f))]
+
+
+def spacy_extract(nlp, skills, text):
+    # The extract_skills implementation this matcher replaced
+    doc = nlp(text)
+    found = {token.text.lower() for token in doc if token.text.lower() in skills}
+    found.update(chunk.text.lower() for chunk in doc.noun_chunks if chunk.text.lower() in skills)
+    return found
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    results = [fn(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    return results, {
+        "seconds": round(elapsed, 4),
+        "docs_per_sec": round(len(texts) / elapsed, 1),
+        "mb_per_sec": round(sum(len(t) for t in texts) / elapsed / 1e6, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--large-skills', type=int, default=5000,
+                        help="size of the synthetic skill set used for the scaling run")
+    parser.add_argument('--skip-spacy', action='store_true')
+    args = parser.parse_args()
+
+    texts = load_resumes(args.docs)
+    report = {"docs": len(texts), "chars": sum(len(t) for t in texts)}
+
+    matcher = SkillMatcher(BASE_SKILLS, SKILL_ALIASES)
+    ac_results, report["aho_corasick"] = timed(matcher.find, texts)
+
+    # Same scan with thousands of patterns: uni/bi-grams mined from the corpus
+    grams = Counter()
+    for text in texts:
+        tokens = tokenize(text)
+        grams.update(tokens)
+        grams.update(" ".join(pair) for pair in zip(tokens, tokens[1:]))
+    large = SkillMatcher(BASE_SKILLS + [g for g, _ in grams.most_common(args.large_skills)], SKILL_ALIASES)
+    _, report["aho_corasick_large"] = timed(large.find, texts)
+    report["aho_corasick_large"]["skills"] = len(large)
+
+    if not args.skip_spacy:
+        import spacy
+        nlp = spacy.load("en_core_web_sm")
+        skills = set(BASE_SKILLS)
+        spacy_results, report["spacy"] = timed(lambda t: spacy_extract(nlp, skills, t), texts)
+        report["speedup"] = round(report["spacy"]["seconds"] / report["aho_corasick"]["seconds"], 1)
+        report["avg_skills_found"] = {
+            "spacy": round(sum(map(len, spacy_results)) / len(texts), 2),
+            "aho_corasick": round(sum(map(len, ac_results)) / len(texts), 2)
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
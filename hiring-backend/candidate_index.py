@@ -0,0 +1,129 @@
+import json
+import os
+import re
+import threading
+
+import faiss
+import numpy as np
+
+from embedding_store import EMBEDDING_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, one writer per index
+    fcntl = None
+
+# Exact inner-product search is fastest up to a few tens of thousands of
+# resumes; past that switch to an HNSW graph (no training step needed).
+HNSW_THRESHOLD = 20000
+HNSW_NEIGHBOURS = 32
+HNSW_EF_SEARCH = 128
+
+
+def make_index(dim, size):
+    if size >= HNSW_THRESHOLD:
+        index = faiss.IndexHNSWFlat(dim, HNSW_NEIGHBOURS, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        return index
+    return faiss.IndexFlatIP(dim)
+
+
+# FAISS index over normalised resume embeddings, so inner product equals
+# cosine similarity. Row i of the index belongs to candidate_ids[i].
+#
+# Every worker process holds a copy. add() takes an exclusive flock, reloads
+# the files if another process saved since, adds, and replaces both files
+# atomically; search() reloads when the saved version changed, so a
+# candidate indexed by one worker is found by all of them.
+class CandidateIndex:
+    def __init__(self, model_name, dim, directory=EMBEDDING_DIR):
+        slug = re.sub(r'[^\w.-]', '_', model_name)
+        self.dim = dim
+        self.index_path = os.path.join(directory, f"{slug}.candidates.faiss")
+        self.ids_path = os.path.join(directory, f"{slug}.candidates.json")
+        self.lock_path = os.path.join(directory, f"{slug}.candidates.lock")
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.candidate_ids = []
+        self.index = make_index(dim, 0)
+        self._known = set()
+        self._version = None
+        with self._lock, self._file_lock(shared=True):
+            self._reload_if_changed()
+
+    def _file_lock(self, shared=False):
+        lock_file = open(self.lock_path, 'a+')
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        # Closing the file releases the lock
+        return lock_file
+
+    def _saved_version(self):
+        # os.replace gives every save a new inode
+        try:
+            stat = os.stat(self.ids_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def _reload_if_changed(self):
+        # Caller holds self._lock and the file lock
+        version = self._saved_version()
+        if version is None or version == self._version:
+            return
+        self.index = faiss.read_index(self.index_path)
+        with open(self.ids_path) as f:
+            self.candidate_ids = json.load(f)
+        self._known = set(self.candidate_ids)
+        self._version = version
+
+    def _save(self):
+        # Caller holds self._lock and the exclusive file lock. The ids file
+        # is replaced last: it is the version readers compare against.
+        tmp_suffix = f".{os.getpid()}.tmp"
+        faiss.write_index(self.index, self.index_path + tmp_suffix)
+        with open(self.ids_path + tmp_suffix, 'w') as f:
+            json.dump(self.candidate_ids, f)
+        os.replace(self.index_path + tmp_suffix, self.index_path)
+        os.replace(self.ids_path + tmp_suffix, self.ids_path)
+        self._version = self._saved_version()
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    def __contains__(self, candidate_id):
+        return str(candidate_id) in self._known
+
+    def add(self, candidate_ids, vectors):
+        # Incremental add, saved before returning; candidates already in the
+        # index are skipped
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock, self._file_lock():
+            self._reload_if_changed()
+            new = [(str(c), v) for c, v in zip(candidate_ids, vectors) if str(c) not in self._known]
+            if not new:
+                return 0
+            ids = [c for c, _ in new]
+            matrix = np.vstack([v for _, v in new])
+            if isinstance(self.index, faiss.IndexFlatIP) and len(self.candidate_ids) + len(ids) >= HNSW_THRESHOLD:
+                # Pool outgrew exact search: move the existing vectors into HNSW
+                existing = self.index.reconstruct_n(0, self.index.ntotal)
+                self.index = make_index(self.dim, len(self.candidate_ids) + len(ids))
+                if len(existing):
+                    self.index.add(existing)
+            self.index.add(matrix)
+            self.candidate_ids.extend(ids)
+            self._known.update(ids)
+            self._save()
+            return len(ids)
+
+    def search(self, vector, k):
+        with self._lock:
+            if self._saved_version() != self._version:
+                with self._file_lock(shared=True):
+                    self._reload_if_changed()
+            if not self.candidate_ids:
+                return []
+            query = np.asarray(vector, dtype=np.float32).reshape(1, self.dim)
+            scores, rows = self.index.search(query, min(k, len(self.candidate_ids)))
+        return [(self.candidate_ids[row], float(score)) for row, score in zip(rows[0], scores[0]) if row >= 0]
@@ -0,0 +1,89 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+ANSWER_CACHE_SIZE = 1000
+ANSWER_CACHE_TTL = 3600
+# Cosine similarity above which two questions are treated as the same one
+SEMANTIC_THRESHOLD = 0.92
+
+
+def normalize_question(question):
+    question = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(question.split())
+
+
+# Two-tier cache of chatbot answers, shared by every Streamlit session in
+# the process. The exact tier is an LRU keyed by the normalised question
+# text and needs no embedding; the semantic tier compares a new question's
+# (normalised) embedding with every cached one and reuses the answer of the
+# closest question above SEMANTIC_THRESHOLD. Entries expire after
+# ANSWER_CACHE_TTL seconds and the least recently used one is evicted once
+# the cache holds ANSWER_CACHE_SIZE questions.
+class AnswerCache:
+    def __init__(self, max_size=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL, threshold=SEMANTIC_THRESHOLD):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries = OrderedDict()  # key -> (answer, vector, expires_at)
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now):
+        expired = [key for key, (_, _, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        self.expirations += len(expired)
+
+    def get_exact(self, question):
+        key = normalize_question(question)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= time.monotonic():
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return entry[0]
+
+    def get_semantic(self, vector):
+        # Counts the miss as well: call after get_exact missed
+        with self._lock:
+            self._expire(time.monotonic())
+            if self._entries:
+                keys = list(self._entries)
+                scores = np.vstack([entry[1] for entry in self._entries.values()]) @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self._entries.move_to_end(keys[best])
+                    self.semantic_hits += 1
+                    return self._entries[keys[best]][0]
+            self.misses += 1
+            return None
+
+    def put(self, question, vector, answer):
+        key = normalize_question(question)
+        with self._lock:
+            self._entries[key] = (answer, np.asarray(vector, dtype=np.float32), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 3) if lookups else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -1,115 +1,110 @@
-import fitz  # PyMuPDF for PDF extraction
-import faiss
 import os
-import numpy as np
-import ollama
 from sentence_transformers import SentenceTransformer
 import streamlit as st
 
-# Initialize sentence transformer for embeddings
-embeddings_model = SentenceTransformer('all-MiniLM-L6-v2')
+from answer_cache import AnswerCache
+from faq_index import (EMBEDDING_MODEL_NAME, FAQ_PDF_PATH, embed_normalized,
+                       load_or_build_faq_index, search_faq)
+from llm_stream import CHATBOT_MODE, build_prompt, stream_llm_answer
+
+# Questions whose best FAQ match is below this cosine similarity are
+# answered with a fallback instead of an unrelated FAQ (or an LLM call)
+FAQ_MIN_SIMILARITY = float(os.environ.get('FAQ_MIN_SIMILARITY', 0.45))
+NO_MATCH_MESSAGE = "I couldn't find a suitable answer for your question."
+
+# Loaded once per server process; Streamlit reruns this script on every
+# interaction but hands back the same model and memory-mapped index
+@st.cache_resource
+def load_faq_resources():
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    index, faq_pairs = load_or_build_faq_index(FAQ_PDF_PATH, model)
+    return model, index, faq_pairs
+
+# One answer cache per server process, shared by all sessions
+@st.cache_resource
+def load_answer_cache():
+    return AnswerCache()
 
 # Function to generate embeddings for questions
 def embed_questions(questions):
-    return embeddings_model.encode(questions, convert_to_numpy=True).astype('float32')
+    return embed_normalized(embeddings_model, questions)
 
-# Function to extract text from PDF
-def extract_text_from_pdf(pdf_path):
-    try:
-        doc = fitz.open(pdf_path)
-        text = "".join([page.get_text() + "\n" for page in doc])
-        return text.strip()
-    except Exception as e:
-        return f"Error extracting text from PDF: {e}"
-
-# Function to process FAQs
-def process_faqs(text):
-    if not text:
-        return []
-
-    faqs = text.split("\nQ")  # Look for 'Q' as a question separator
-    faq_pairs = []
-    
-    for faq in faqs:
-        parts = faq.split("\nA", 1)  # Look for 'A' as an answer separator
-        if len(parts) == 2:
-            question = "Q" + parts[0].strip()
-            answer = "A" + parts[1].strip()
-            faq_pairs.append((question, answer))
-    
-    return faq_pairs
-
-# Function to create FAISS vector database
-def create_faq_index(faq_pairs):
-    if not faq_pairs:
-        return None, None, None
-
-    questions = [q for q, _ in faq_pairs]
+# Function to retrieve the most relevant FAQ for several questions at once
+def retrieve_faq_batch(user_questions, index, questions, faq_pairs):
+    if index is None or not questions or not faq_pairs:
+        return [(None, "Error: FAQ index is not initialized.")] * len(user_questions)
 
     try:
-        question_vectors = embed_questions(questions)
-        dim = question_vectors.shape[1]
-        index = faiss.IndexFlatL2(dim)
-        index.add(question_vectors)
-        return index, questions, faq_pairs
+        return retrieve_faq_vectors(embed_questions(list(user_questions)), index, faq_pairs)
     except Exception as e:
-        return None, None, None
+        return [(None, f"Error retrieving FAQ: {e}")] * len(user_questions)
+
+# Same lookup for questions that are already embedded
+def retrieve_faq_vectors(question_vectors, index, faq_pairs):
+    best, _ = search_faq(index, question_vectors, FAQ_MIN_SIMILARITY)
+    return [faq_pairs[i] if 0 <= i < len(faq_pairs) else (None, NO_MATCH_MESSAGE) for i in best]
 
 # Function to retrieve the most relevant FAQ
 def retrieve_faq(question, index, questions, faq_pairs):
-    if index is None or not questions or not faq_pairs:
-        return None, "Error: FAQ index is not initialized."
-
+    return retrieve_faq_batch([question], index, questions, faq_pairs)[0]
+
+# Cached front end for chatbot_response_stream: repeated and reworded
+# questions are answered without searching the index or calling the LLM
+def cached_chatbot_response(user_question, index, questions, faq_pairs):
+    answer = answer_cache.get_exact(user_question)
+    if answer is not None:
+        yield answer
+        return
+    if index is None or not faq_pairs:
+        yield from chatbot_response_stream(user_question, index, questions, faq_pairs)
+        return
     try:
-        question_vector = np.array(embed_questions([question])).astype('float32')
-        _, indices = index.search(question_vector, 1)
-
-        best_match_index = indices[0][0]
-
-        # Check if index is valid
-        if best_match_index < 0 or best_match_index >= len(faq_pairs):
-            return None, "I couldn't find a suitable answer for your question."
-
-        return faq_pairs[best_match_index]
+        vector = embed_questions([user_question])[0]
     except Exception as e:
-        return None, f"Error retrieving FAQ: {e}"
+        yield f"Error retrieving FAQ: {e}"
+        return
+    answer = answer_cache.get_semantic(vector)
+    if answer is not None:
+        yield answer
+        return
+    status = {}
+    tokens = []
+    for token in chatbot_response_stream(user_question, index, questions, faq_pairs, vector, status):
+        tokens.append(token)
+        yield token
+    # No-match replies, LLM fallbacks and cut-off answers are not worth keeping
+    if status.get("complete", True):
+        answer_cache.put(user_question, vector, "".join(tokens))
 
 # Function to generate chatbot response using Ollama
-def chatbot_response(user_question, index, questions, faq_pairs):
-    retrieved_question, retrieved_answer = retrieve_faq(user_question, index, questions, faq_pairs)
-
-    if retrieved_question is None:
-        return "Sorry, I couldn't find an answer to your question."
-    print("Retrieved FAQ Answer:", retrieved_answer)
-    # Force the response to be ONLY the retrieved answer
-    return retrieved_answer
-
-    company_name = "Hirely"
-    company_email = "hirelycareers@gmail.com"
-
-    prompt = f"""
-You are an AI answering job application FAQs for {company_name}.
-Answer **only** using the provided FAQ answer. **Do not** add explanations or modify the answer.
-Return the response **exactly** as it appears in the FAQ.
-
-FAQ Answer: {retrieved_answer.strip()}
-"""
-
+def chatbot_response(user_question, index, questions, faq_pairs, question_vector=None):
+    return "".join(chatbot_response_stream(user_question, index, questions, faq_pairs, question_vector))
 
+# Yields the answer as it is produced: the FAQ answer in one piece, or the
+# local model's tokens as they stream in when CHATBOT_MODE is "llm"
+def chatbot_response_stream(user_question, index, questions, faq_pairs, question_vector=None, status=None):
+    if question_vector is not None:
+        retrieved_question, retrieved_answer = retrieve_faq_vectors(question_vector[None, :], index, faq_pairs)[0]
+    else:
+        retrieved_question, retrieved_answer = retrieve_faq(user_question, index, questions, faq_pairs)
 
-    try:
-       response = ollama.chat(model="tinyllama", messages=[{"role": "user", "content": prompt}])
-       return response["message"]["content"] if "message" in response and "content" in response["message"] else "I'm sorry, I couldn't generate a proper response."
-    except Exception as e:
-        return f"Error generating response: {e}" 
-    
-# Load and process FAQs
-pdf_path = r"D:/hiring_system/hiring-backend/chatbot/Job_Application_FAQ.pdf"  # Provide your PDF path
-text = extract_text_from_pdf(pdf_path)
-faq_pairs = process_faqs(text)
-
-# Create vector database
-index, questions, faq_pairs = create_faq_index(faq_pairs)
+    if retrieved_question is None:
+        # Not an answer: keep it out of the answer cache
+        if status is not None:
+            status["complete"] = False
+        yield "Sorry, I couldn't find an answer to your question."
+        return
+    if CHATBOT_MODE != "llm":
+        # Force the response to be ONLY the retrieved answer
+        yield retrieved_answer
+        return
+
+    yield from stream_llm_answer(build_prompt(retrieved_answer), retrieved_answer, status=status)
+
+# Load the embedding model and the prebuilt FAQ index
+embeddings_model, index, faq_pairs = load_faq_resources()
+answer_cache = load_answer_cache()
+questions = [q for q, _ in faq_pairs]
 
 st.markdown("""
     <style>
@@ -199,12 +194,9 @@ if user_question:
     # Display user message
     st.chat_message("user").markdown(user_question)
 
-    # Generate response
-    bot_response = chatbot_response(user_question, index, questions, faq_pairs)
-
-    # Display bot response
+    # Generate and display the bot response, streaming it as it arrives
     with st.chat_message("assistant"):
-        st.markdown(bot_response)
+        bot_response = st.write_stream(cached_chatbot_response(user_question, index, questions, faq_pairs))
 
     # Save chat history
     st.session_state.chat_history.append({"role": "user", "content": user_question})
@@ -0,0 +1,138 @@
+# Prebuilt FAQ search index for the chatbot.
+#
+# The Q/A pairs parsed from Job_Application_FAQ.pdf and a FAISS inner-product
+# index over their normalised question embeddings are written next to the
+# PDF, tagged with the PDF's SHA-256 and the embedding model. The chatbot
+# memory-maps the index at startup and only rebuilds it when the PDF or the
+# model changed. Rebuild ahead of a deploy with:
+#
+#   python chatbot/faq_index.py
+import argparse
+import json
+import os
+import sys
+import time
+
+import faiss
+import numpy as np
+
+# Share the cached PDF extraction in hiring-backend/pdf_text.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pdf_text
+
+FAQ_INDEX_VERSION = 1
+CHATBOT_DIR = os.path.dirname(os.path.abspath(__file__))
+FAQ_PDF_PATH = os.environ.get('FAQ_PDF_PATH', os.path.join(CHATBOT_DIR, 'Job_Application_FAQ.pdf'))
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+def index_paths(pdf_path):
+    base = os.path.splitext(pdf_path)[0]
+    return base + ".faq.faiss", base + ".faq.json"
+
+
+# Function to extract text from PDF
+def extract_text_from_pdf(pdf_path):
+    try:
+        text = pdf_text.extract_text(pdf_path, separator="\n", max_pages=None)
+        return text.strip()
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return ""
+
+# Function to process FAQs
+def process_faqs(text):
+    if not text:
+        return []
+
+    faqs = text.split("\nQ")  # Look for 'Q' as a question separator
+    faq_pairs = []
+
+    for faq in faqs:
+        parts = faq.split("\nA", 1)  # Look for 'A' as an answer separator
+        if len(parts) == 2:
+            question = "Q" + parts[0].strip()
+            answer = "A" + parts[1].strip()
+            faq_pairs.append((question, answer))
+
+    return faq_pairs
+
+
+def embed_normalized(model, texts):
+    vectors = model.encode(texts, convert_to_numpy=True).astype('float32')
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def build_faq_index(pdf_path, model, model_name=EMBEDDING_MODEL_NAME):
+    faq_pairs = process_faqs(extract_text_from_pdf(pdf_path))
+    if not faq_pairs:
+        raise ValueError(f"No Q/A pairs found in {pdf_path}")
+    vectors = embed_normalized(model, [q for q, _ in faq_pairs])
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+
+    index_path, meta_path = index_paths(pdf_path)
+    faiss.write_index(index, index_path + ".tmp")
+    os.replace(index_path + ".tmp", index_path)
+    with open(meta_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": FAQ_INDEX_VERSION,
+            "pdf_sha256": pdf_text.file_sha256(pdf_path),
+            "model_name": model_name,
+            "faq_pairs": faq_pairs
+        }, f)
+    os.replace(meta_path + ".tmp", meta_path)
+    return index, faq_pairs
+
+
+def load_faq_index(pdf_path, model_name=EMBEDDING_MODEL_NAME):
+    # Returns (index, faq_pairs), or (None, None) when the artifact is
+    # missing or was built from a different PDF, model or format version
+    index_path, meta_path = index_paths(pdf_path)
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if (meta.get("version") != FAQ_INDEX_VERSION or meta.get("model_name") != model_name
+            or meta.get("pdf_sha256") != pdf_text.file_sha256(pdf_path) or not os.path.exists(index_path)):
+        return None, None
+    # Memory-mapped where faiss supports it (1.11+), so every worker shares
+    # the pages; older releases read the (small) index into memory
+    mmap_flag = getattr(faiss, 'IO_FLAG_MMAP_IFC', None)
+    index = faiss.read_index(index_path, mmap_flag) if mmap_flag is not None else faiss.read_index(index_path)
+    return index, [tuple(pair) for pair in meta["faq_pairs"]]
+
+
+def load_or_build_faq_index(pdf_path, model, model_name=EMBEDDING_MODEL_NAME):
+    index, faq_pairs = load_faq_index(pdf_path, model_name)
+    if index is None:
+        print(f"FAQ index for {pdf_path} is missing or stale; rebuilding")
+        index, faq_pairs = build_faq_index(pdf_path, model, model_name)
+    return index, faq_pairs
+
+
+def search_faq(index, query_vectors, min_similarity):
+    # Best FAQ row per normalised query vector, or -1 when even the best
+    # question is less similar than min_similarity
+    scores, indices = index.search(np.ascontiguousarray(query_vectors, dtype='float32'), 1)
+    best = np.where(scores[:, 0] >= min_similarity, indices[:, 0], -1)
+    return best, scores[:, 0]
+
+
+def main():
+    from sentence_transformers import SentenceTransformer
+
+    parser = argparse.ArgumentParser(description="Build the chatbot's FAQ search index")
+    parser.add_argument('--pdf', default=FAQ_PDF_PATH)
+    parser.add_argument('--model', default=EMBEDDING_MODEL_NAME)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    _, faq_pairs = build_faq_index(args.pdf, SentenceTransformer(args.model), args.model)
+    print(f"Indexed {len(faq_pairs)} FAQs from {args.pdf} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# Streaming answers from the local Ollama model, kept free of Streamlit so
+# the TTFT benchmark can drive it against a stub server.
+#
+# Tokens are yielded as Ollama produces them. If no token arrives within
+# OLLAMA_FIRST_TOKEN_TIMEOUT seconds (or Ollama is down) the retrieved FAQ
+# answer is yielded instead; once tokens flow, generation stops at
+# OLLAMA_MAX_TOKENS tokens or OLLAMA_TOTAL_TIMEOUT seconds.
+import logging
+import os
+import time
+
+import ollama
+
+log = logging.getLogger(__name__)
+
+# "faq" answers with the retrieved FAQ text as is; "llm" streams a rephrased
+# answer from the local model
+CHATBOT_MODE = os.environ.get('CHATBOT_MODE', 'faq')
+OLLAMA_HOST = os.environ.get('OLLAMA_HOST', 'http://localhost:11434')
+OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'tinyllama')
+OLLAMA_FIRST_TOKEN_TIMEOUT = float(os.environ.get('OLLAMA_FIRST_TOKEN_TIMEOUT', 3))
+OLLAMA_TOTAL_TIMEOUT = float(os.environ.get('OLLAMA_TOTAL_TIMEOUT', 20))
+OLLAMA_MAX_TOKENS = int(os.environ.get('OLLAMA_MAX_TOKENS', 256))
+
+COMPANY_NAME = "Hirely"
+
+
+def build_prompt(retrieved_answer):
+    return f"""
+You are an AI answering job application FAQs for {COMPANY_NAME}.
+Answer **only** using the provided FAQ answer. **Do not** add explanations or modify the answer.
+Return the response **exactly** as it appears in the FAQ.
+
+FAQ Answer: {retrieved_answer.strip()}
+"""
+
+
+def stream_llm_answer(prompt, fallback, host=OLLAMA_HOST, model=OLLAMA_MODEL,
+                      first_token_timeout=OLLAMA_FIRST_TOKEN_TIMEOUT,
+                      total_timeout=OLLAMA_TOTAL_TIMEOUT, max_tokens=OLLAMA_MAX_TOKENS, status=None):
+    # status, if given, gets status["complete"] = True only when the model
+    # finished on its own (done_reason "stop"), so callers can avoid caching
+    # fallbacks and answers cut off by num_predict ("length") or the timeout
+    if status is not None:
+        status["complete"] = False
+    # The HTTP read timeout bounds the wait for the first token and for
+    # every gap between tokens after it
+    client = ollama.Client(host=host, timeout=first_token_timeout)
+    deadline = time.monotonic() + total_timeout
+    started = False
+    try:
+        stream = client.chat(model=model, messages=[{"role": "user", "content": prompt}],
+                             stream=True, options={"num_predict": max_tokens})
+        for chunk in stream:
+            token = chunk["message"]["content"]
+            if token:
+                started = True
+                yield token
+            if chunk.get("done"):
+                if not started:
+                    yield fallback
+                elif chunk.get("done_reason") == "stop":
+                    if status is not None:
+                        status["complete"] = True
+                else:
+                    log.info("Ollama answer stopped early (%s)", chunk.get("done_reason"))
+                return
+            if time.monotonic() > deadline:
+                log.warning("Ollama answer cut off after %ss", total_timeout)
+                return
+    except Exception as e:
+        log.warning("Error generating response: %s", e)
+        if not started:
+            yield fallback
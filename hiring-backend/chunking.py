@@ -0,0 +1,41 @@
+# Splits long documents into overlapping word windows for embedding.
+#
+# all-mpnet-base-v2 truncates its input at 384 word pieces (~250-300 words),
+# so a multi-page resume encoded as one string is mostly ignored. Windows
+# are packed section by section (blank-line separated blocks in the PDF
+# text) so a window does not straddle unrelated sections unless a section
+# is too small to stand alone.
+import re
+
+CHUNK_WORDS = 200
+CHUNK_STRIDE = 150
+SECTION_SPLIT_RE = re.compile(r"\n\s*\n")
+
+
+def sliding_windows(words, window=CHUNK_WORDS, stride=CHUNK_STRIDE):
+    if len(words) <= window:
+        return [words]
+    windows = [words[start:start + window] for start in range(0, len(words) - window + stride, stride)]
+    return [w for w in windows if w]
+
+
+def chunk_text(text, preprocess, window=CHUNK_WORDS, stride=CHUNK_STRIDE):
+    chunks = []
+    current = []
+    for section in SECTION_SPLIT_RE.split(text):
+        words = preprocess(section).split()
+        if not words:
+            continue
+        if len(current) + len(words) <= window:
+            current.extend(words)
+            continue
+        if current:
+            chunks.append(current)
+            current = []
+        if len(words) <= window:
+            current = words
+        else:
+            chunks.extend(sliding_windows(words, window, stride))
+    if current:
+        chunks.append(current)
+    return [" ".join(words) for words in chunks] or [preprocess(text)]
@@ -0,0 +1,474 @@
+# Pooled MySQL access shared by app.py, resume_matcher.py and the scoring
+# workers, plus the schema migrations that used to run as CREATE TABLE IF
+# NOT EXISTS on every request.
+#
+#   python db.py migrate
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import pymysql
+from flask import g
+
+from pdf_text import file_sha256
+
+log = logging.getLogger(__name__)
+
+DB_CONFIG = {
+    "host": os.environ.get('DB_HOST', 'localhost'),
+    "user": os.environ.get('DB_USER', 'root'),
+    "password": os.environ.get('DB_PASSWORD', 'root@Harisha'),
+    "database": os.environ.get('DB_NAME', 'hiring_db_system'),
+}
+POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5))
+# Idle connections older than this are pinged before being handed out
+PING_AFTER = 30
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, size=POOL_SIZE, timeout=POOL_TIMEOUT, **connect_kwargs):
+        self.size = size
+        self.timeout = timeout
+        self.connect_kwargs = connect_kwargs
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+        self.created = 0
+        self.discarded = 0
+        self.checkouts = 0
+
+    def _connect(self):
+        conn = pymysql.connect(cursorclass=pymysql.cursors.DictCursor, **self.connect_kwargs)
+        self.created += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._open -= 1
+            self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def get(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                conn, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._open < self.size
+                    if can_open:
+                        self._open += 1
+                if can_open:
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._open -= 1
+                        raise
+                    self.checkouts += 1
+                    return conn
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhausted(f"No database connection free after {self.timeout}s (pool size {self.size})")
+                try:
+                    conn, returned_at = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+            # Health check connections that sat idle long enough for MySQL to drop them
+            if time.monotonic() - returned_at > PING_AFTER:
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    self._discard(conn)
+                    continue
+            self.checkouts += 1
+            return conn
+
+    def put(self, conn):
+        try:
+            # End any open transaction so the next user starts from a fresh snapshot
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def close_all(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "open": self._open,
+            "idle": self._idle.qsize(),
+            "created": self.created,
+            "discarded": self.discarded,
+            "checkouts": self.checkouts
+        }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**DB_CONFIG)
+    return _pool
+
+
+@contextmanager
+def connection():
+    # For code running outside a Flask request (matcher, background workers)
+    conn = get_pool().get()
+    try:
+        yield conn
+    finally:
+        get_pool().put(conn)
+
+
+def get_db():
+    # One pooled connection per request, returned by close_db at teardown
+    if 'db' not in g:
+        g.db = get_pool().get()
+    return g.db
+
+
+def close_db(exception=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool().put(conn)
+
+
+def init_app(app):
+    app.teardown_appcontext(close_db)
+
+
+def upload_referenced(conn, path):
+    # Whether a committed row still points at a stored upload; JDs and
+    # resumes share content-addressed storage. Call outside a transaction
+    # (after commit or rollback) so the read sees other requests' commits.
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT EXISTS(SELECT 1 FROM jobs_description WHERE job_description = %s)
+                OR EXISTS(SELECT 1 FROM candidate_details WHERE resume = %s) AS found
+        """, (path, path))
+        found = cursor.fetchone()['found']
+    conn.rollback()
+    return bool(found)
+
+
+# --- Schema migrations -------------------------------------------------------
+# Each migration runs once, in order, and is recorded in schema_migrations.
+
+def _column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) AS found FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()['found'] > 0
+
+
+def migration_001_initial_schema(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            email VARCHAR(255) NOT NULL UNIQUE,
+            password VARCHAR(255) NOT NULL,
+            phone VARCHAR(20) NOT NULL,
+            user_type VARCHAR(50) NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_description (
+            job_id INT PRIMARY KEY,
+            job_role VARCHAR(255),
+            experience VARCHAR(255),
+            salary DECIMAL(10, 2),
+            location VARCHAR(255),
+            job_description VARCHAR(255)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS candidate_details (
+            candidate_id VARCHAR(50),
+            name VARCHAR(255),
+            email VARCHAR(255),
+            phone_no VARCHAR(255),
+            resume VARCHAR(255)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_application (
+            job_id INT NOT NULL,
+            candidate_id VARCHAR(50) NOT NULL,
+            final_score VARCHAR(50)
+        )
+    """)
+
+
+def migration_002_score_status(cursor):
+    # Status of the asynchronous scoring queue for each application
+    if not _column_exists(cursor, 'job_application', 'score_status'):
+        cursor.execute("ALTER TABLE job_application ADD COLUMN score_status VARCHAR(20) NOT NULL DEFAULT 'scored'")
+
+
+def _table_exists(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) AS found FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone()['found'] > 0
+
+
+def _column_type(cursor, table, column):
+    cursor.execute("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    row = cursor.fetchone()
+    return row['data_type'].lower() if row else None
+
+
+def _count(cursor, sql):
+    cursor.execute(sql)
+    return int(cursor.fetchone()['n'] or 0)
+
+
+def migration_003_keys_and_indexes(cursor):
+    # Rebuild candidate_details and job_application with real keys. Rows are
+    # copied into new tables and swapped in with one atomic RENAME; the old
+    # tables stay behind as *_old. Nothing is dropped silently: rows the new
+    # keys cannot hold (non-numeric or duplicate candidate ids, applications
+    # of missing jobs or candidates) abort the migration with their counts.
+    # Duplicate applications merge into one row with the best score.
+    if _column_type(cursor, 'job_application', 'candidate_id') == 'bigint':
+        # Swapped in by an earlier run that failed before being recorded
+        return
+    if _table_exists(cursor, 'candidate_details_old') or _table_exists(cursor, 'job_application_old'):
+        raise RuntimeError("Migration 003 needs candidate_details_old and job_application_old to be absent")
+
+    lost = {
+        "candidates with a non-numeric candidate_id": _count(cursor, """
+            SELECT COUNT(*) AS n FROM candidate_details
+            WHERE candidate_id IS NULL OR candidate_id NOT REGEXP '^[0-9]+$'
+        """),
+        "candidates sharing a candidate_id": _count(cursor, """
+            SELECT COUNT(*) - COUNT(DISTINCT CAST(candidate_id AS UNSIGNED)) AS n FROM candidate_details
+            WHERE candidate_id REGEXP '^[0-9]+$'
+        """),
+        "applications of a missing job or candidate": _count(cursor, """
+            SELECT COUNT(*) AS n FROM job_application ja
+            LEFT JOIN jobs_description jd ON jd.job_id = ja.job_id
+            WHERE jd.job_id IS NULL OR ja.candidate_id NOT REGEXP '^[0-9]+$' OR NOT EXISTS (
+                SELECT 1 FROM candidate_details cd
+                WHERE cd.candidate_id REGEXP '^[0-9]+$'
+                  AND CAST(cd.candidate_id AS UNSIGNED) = CAST(ja.candidate_id AS UNSIGNED))
+        """)
+    }
+    lost = {what: n for what, n in lost.items() if n}
+    if lost:
+        for what, n in lost.items():
+            log.error("Migration 003 would drop %d %s", n, what)
+        raise RuntimeError("Migration 003 would drop rows (" + ", ".join(f"{n} {what}" for what, n in lost.items())
+                           + "); fix or remove them and restart")
+    merged = _count(cursor, """
+        SELECT COUNT(*) - COUNT(DISTINCT job_id, CAST(candidate_id AS UNSIGNED)) AS n FROM job_application
+    """)
+    unscored = _count(cursor, """
+        SELECT COUNT(*) AS n FROM job_application
+        WHERE final_score IS NOT NULL AND final_score NOT REGEXP '^-?[0-9]+([.][0-9]+)?$'
+    """)
+    if merged or unscored:
+        log.warning("Migration 003: merging %d duplicate applications, %d non-numeric scores become NULL",
+                    merged, unscored)
+
+    cursor.execute("DROP TABLE IF EXISTS job_application_new")
+    cursor.execute("DROP TABLE IF EXISTS candidate_details_new")
+    cursor.execute("""
+        CREATE TABLE candidate_details_new (
+            candidate_id BIGINT NOT NULL PRIMARY KEY,
+            name VARCHAR(255),
+            email VARCHAR(255),
+            phone_no VARCHAR(255),
+            resume VARCHAR(255)
+        ) ENGINE=InnoDB
+    """)
+    cursor.execute("""
+        INSERT INTO candidate_details_new (candidate_id, name, email, phone_no, resume)
+        SELECT CAST(candidate_id AS UNSIGNED), name, email, phone_no, resume
+        FROM candidate_details
+    """)
+    cursor.execute("""
+        CREATE TABLE job_application_new (
+            job_id INT NOT NULL,
+            candidate_id BIGINT NOT NULL,
+            final_score DECIMAL(5, 2) NULL,
+            score_status VARCHAR(20) NOT NULL DEFAULT 'scored',
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_id, candidate_id),
+            KEY idx_job_application_job_score (job_id, final_score),
+            KEY idx_job_application_candidate (candidate_id),
+            CONSTRAINT fk_job_application_job FOREIGN KEY (job_id)
+                REFERENCES jobs_description (job_id) ON DELETE CASCADE,
+            CONSTRAINT fk_job_application_candidate FOREIGN KEY (candidate_id)
+                REFERENCES candidate_details_new (candidate_id) ON DELETE CASCADE
+        ) ENGINE=InnoDB
+    """)
+    cursor.execute("""
+        INSERT INTO job_application_new (job_id, candidate_id, final_score, score_status)
+        SELECT job_id, CAST(candidate_id AS UNSIGNED),
+               MAX(CASE WHEN final_score REGEXP '^-?[0-9]+([.][0-9]+)?$'
+                        THEN CAST(final_score AS DECIMAL(5, 2)) END),
+               MIN(score_status)
+        FROM job_application
+        GROUP BY job_id, CAST(candidate_id AS UNSIGNED)
+    """)
+    cursor.execute("""
+        RENAME TABLE candidate_details TO candidate_details_old,
+                     candidate_details_new TO candidate_details,
+                     job_application TO job_application_old,
+                     job_application_new TO job_application
+    """)
+    log.info("Migration 003: previous tables kept as candidate_details_old and job_application_old")
+
+
+def migration_004_candidate_auto_id_and_hash(cursor):
+    # Candidates get database-assigned ids, so batched inserts cannot collide,
+    # and the SHA-256 of their resume, unique so a PDF is only ingested once.
+    # The id column is referenced by job_application's foreign key, which
+    # MySQL only lets us touch with the checks switched off.
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    try:
+        cursor.execute("ALTER TABLE candidate_details MODIFY candidate_id BIGINT NOT NULL AUTO_INCREMENT")
+    finally:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    if not _column_exists(cursor, 'candidate_details', 'resume_sha256'):
+        cursor.execute("""
+            ALTER TABLE candidate_details
+                ADD COLUMN resume_sha256 CHAR(64) NULL,
+                ADD UNIQUE KEY uq_candidate_details_resume_sha256 (resume_sha256)
+        """)
+    # Backfill hashes for resumes already on disk; when several candidates
+    # share one file only the first keeps the hash
+    cursor.execute("SELECT candidate_id, resume FROM candidate_details WHERE resume_sha256 IS NULL ORDER BY candidate_id")
+    seen = set()
+    for row in cursor.fetchall():
+        if not row['resume'] or not os.path.exists(row['resume']):
+            continue
+        digest = file_sha256(row['resume'])
+        if digest in seen:
+            continue
+        seen.add(digest)
+        cursor.execute("UPDATE IGNORE candidate_details SET resume_sha256 = %s WHERE candidate_id = %s",
+                       (digest, row['candidate_id']))
+
+
+def migration_005_job_auto_id(cursor):
+    # Jobs get database-assigned ids too, replacing random 4-digit ones
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    try:
+        cursor.execute("ALTER TABLE jobs_description MODIFY job_id INT NOT NULL AUTO_INCREMENT")
+    finally:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+def migration_006_score_components(cursor):
+    # Keep the inputs of final_score so a new scoring policy can re-rank a
+    # job in SQL, plus a memo of components shared by repeat applications
+    if not _column_exists(cursor, 'job_application', 'content_similarity'):
+        cursor.execute("""
+            ALTER TABLE job_application
+                ADD COLUMN content_similarity DOUBLE NULL,
+                ADD COLUMN skill_match DOUBLE NULL,
+                ADD COLUMN matched_skills TEXT NULL,
+                ADD COLUMN policy_version INT NULL
+        """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS score_memo (
+            job_text_sha256 CHAR(64) NOT NULL,
+            resume_text_sha256 CHAR(64) NOT NULL,
+            scorer VARCHAR(255) NOT NULL,
+            skill_match DOUBLE NOT NULL,
+            content_similarity DOUBLE NOT NULL,
+            matched_skills TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (job_text_sha256, resume_text_sha256, scorer)
+        ) ENGINE=InnoDB
+    """)
+
+
+MIGRATIONS = [
+    (1, "initial schema", migration_001_initial_schema),
+    (2, "job_application.score_status", migration_002_score_status),
+    (3, "keys, indexes and numeric final_score", migration_003_keys_and_indexes),
+    (4, "candidate_details auto-increment id and resume_sha256", migration_004_candidate_auto_id_and_hash),
+    (5, "jobs_description auto-increment id", migration_005_job_auto_id),
+    (6, "job_application score components and score_memo", migration_006_score_components),
+]
+
+
+def migrate():
+    # Create the database itself, then apply pending migrations under a
+    # MySQL named lock so concurrently starting workers do not race.
+    server_config = {key: value for key, value in DB_CONFIG.items() if key != 'database'}
+    conn = pymysql.connect(**server_config)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{DB_CONFIG['database']}`")
+        conn.commit()
+    finally:
+        conn.close()
+
+    applied_now = []
+    with connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK('hiring_schema_migrate', 60) AS locked")
+            if not cursor.fetchone()['locked']:
+                raise RuntimeError("Timed out waiting for the schema migration lock")
+            try:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version INT PRIMARY KEY,
+                        name VARCHAR(255) NOT NULL,
+                        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cursor.execute("SELECT version FROM schema_migrations")
+                applied = {row['version'] for row in cursor.fetchall()}
+                for version, name, apply in MIGRATIONS:
+                    if version in applied:
+                        continue
+                    apply(cursor)
+                    cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                    conn.commit()
+                    applied_now.append(version)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK('hiring_schema_migrate')")
+    return applied_now
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] != ['migrate']:
+        sys.exit("usage: python db.py migrate")
+    print(f"Applied migrations: {migrate() or 'none (schema up to date)'}")
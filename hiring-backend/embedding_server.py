@@ -0,0 +1,230 @@
+# Local embedding service: one process owns the sentence-transformer and
+# every Flask worker talks to it over a Unix socket (or localhost TCP), so
+# adding web workers no longer adds a copy of the model each.
+#
+# Requests from all connected workers are pooled into micro-batches: the
+# batcher takes the first waiting request, then keeps collecting until it
+# has MAX_BATCH texts or MAX_WAIT_MS has passed, and encodes them in one
+# call.
+#
+# multiprocessing connections unpickle what they receive, so both sides must
+# share a secret EMBEDDING_SERVER_KEY, TCP is only allowed on loopback, and
+# the Unix socket is private to the server's user:
+#
+#   export EMBEDDING_SERVER_KEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+#   python embedding_server.py --address /tmp/hiring-embeddings.sock
+#   EMBEDDING_SERVER=/tmp/hiring-embeddings.sock python app.py
+import argparse
+import ipaddress
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+
+from encoder import DEFAULT_MODEL_NAME, INFERENCE_BACKEND, load_encoder
+
+log = logging.getLogger(__name__)
+
+EMBEDDING_SERVER = os.environ.get('EMBEDDING_SERVER')
+MAX_BATCH = 64
+MAX_WAIT_MS = 10
+MIN_KEY_LENGTH = 16
+
+
+def get_authkey():
+    key = os.environ.get('EMBEDDING_SERVER_KEY', '')
+    if len(key) < MIN_KEY_LENGTH:
+        raise RuntimeError(f"Set EMBEDDING_SERVER_KEY to a secret of at least {MIN_KEY_LENGTH} characters "
+                           "shared by the embedding server and its clients")
+    return key.encode()
+
+
+def parse_address(address):
+    # "host:port" for TCP (loopback only), anything else is a Unix socket path
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        # multiprocessing.connection speaks IPv4 for (host, port) addresses
+        try:
+            loopback = host == 'localhost' or ipaddress.IPv4Address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise ValueError(f"Embedding server address {address!r} is not a loopback address or Unix socket")
+        return host, int(port)
+    return address
+
+
+class MicroBatcher:
+    def __init__(self, model, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending = queue.Queue()
+        self.batches = 0
+        self.texts = 0
+        self.requests = 0
+        thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        thread.start()
+
+    def submit(self, texts):
+        future = Future()
+        self._pending.put((texts, future))
+        return future
+
+    def _collect(self):
+        batch = [self._pending.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                vectors = self.model.encode(texts, batch_size=self.max_batch, convert_to_numpy=True)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.requests += len(batch)
+            self.texts += len(texts)
+            offset = 0
+            for item_texts, future in batch:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0,
+            "queued": self._pending.qsize()
+        }
+
+
+def handle_client(conn, batcher, info):
+    with conn:
+        while True:
+            try:
+                op, payload = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                if op == "encode":
+                    result = batcher.submit(payload).result()
+                elif op == "info":
+                    result = info
+                elif op == "stats":
+                    result = batcher.stats()
+                else:
+                    raise ValueError(f"Unknown operation {op!r}")
+                conn.send(("ok", result))
+            except Exception as e:
+                conn.send(("error", str(e)))
+
+
+def serve(address, model_name, backend, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+    # Validate before the (slow) model load
+    authkey = get_authkey()
+    address = parse_address(address)
+    model = load_encoder(model_name, backend)
+    info = {"model_name": model_name, "backend": backend, "dim": model.get_sentence_embedding_dimension()}
+    batcher = MicroBatcher(model, max_batch, max_wait_ms)
+    if isinstance(address, str) and os.path.exists(address):
+        os.unlink(address)
+    # Sockets are created without group/other permissions
+    old_umask = os.umask(0o077)
+    try:
+        listener = Listener(address, authkey=authkey)
+    finally:
+        os.umask(old_umask)
+    with listener:
+        log.info("Embedding server for %s (%s) listening on %s", model_name, backend, listener.address)
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                log.warning("Embedding server rejected a connection: %s", e)
+                continue
+            threading.Thread(target=handle_client, args=(conn, batcher, info), daemon=True).start()
+
+
+# Drop-in stand-in for the SentenceTransformer used by ResumeMatcher: the
+# same encode / get_sentence_embedding_dimension calls, answered by the
+# server. One connection per thread, reopened once if the server restarted.
+class RemoteEncoder:
+    def __init__(self, address=EMBEDDING_SERVER):
+        self.address = parse_address(address)
+        self._authkey = get_authkey()
+        self._local = threading.local()
+        info = self._call("info", None)
+        self.model_name = info["model_name"]
+        self.backend = info["backend"]
+        self.dim = info["dim"]
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = Client(self.address, authkey=self._authkey)
+            self._local.conn = conn
+        return conn
+
+    def _call(self, op, payload):
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send((op, payload))
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError):
+                self._local.conn = None
+                if attempt:
+                    raise
+        if status != "ok":
+            raise RuntimeError(f"Embedding server error: {result}")
+        return result
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True):
+        # batch_size is accepted for compatibility; the server sizes batches
+        if isinstance(texts, str):
+            return self._call("encode", [texts])[0]
+        return self._call("encode", list(texts))
+
+    def stats(self):
+        return self._call("stats", None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve sentence embeddings to the Flask workers")
+    parser.add_argument('--address', default=EMBEDDING_SERVER or '/tmp/hiring-embeddings.sock')
+    parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--backend', default=INFERENCE_BACKEND)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                        format="%(asctime)s %(levelname)s %(name)s [%(threadName)s] %(message)s")
+    serve(args.address, args.model, args.backend, args.max_batch, args.max_wait_ms)
+
+
+if __name__ == '__main__':
+    main()
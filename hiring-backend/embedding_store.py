@@ -0,0 +1,117 @@
+import hashlib
+import os
+import re
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, one writer per store
+    fcntl = None
+
+EMBEDDING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'embeddings')
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+# On-disk embedding cache for one model: a memory-mapped float32 matrix
+# ({model}.f32) plus an append-only index ({model}.idx) with one text hash
+# per line, where line N holds the hash of matrix row N. Vectors are stored
+# L2-normalised so cosine similarity is a plain dot product.
+class EmbeddingStore:
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, model_name, dim, directory=EMBEDDING_DIR):
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^\w.-]', '_', model_name)
+        self.model_name = model_name
+        self.dim = dim
+        self.matrix_path = os.path.join(directory, f"{slug}.f32")
+        self.index_path = os.path.join(directory, f"{slug}.idx")
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._index_offset = 0
+        self._matrix = None
+        with open(self.index_path, 'a+') as index_file:
+            self._read_index(index_file)
+        self._open(max(self.INITIAL_CAPACITY, len(self._rows)))
+
+    def _read_index(self, index_file):
+        # Pick up rows appended since the last read (possibly by another worker)
+        index_file.seek(self._index_offset)
+        for line in iter(index_file.readline, ''):
+            key = line.strip()
+            if key:
+                self._rows.setdefault(key, len(self._rows))
+        self._index_offset = index_file.tell()
+
+    def _open(self, capacity):
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self.matrix_path) if os.path.exists(self.matrix_path) else 0
+        if size < capacity * row_bytes:
+            with open(self.matrix_path, 'ab') as f:
+                f.truncate(capacity * row_bytes)
+            size = capacity * row_bytes
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r+',
+                                 shape=(size // row_bytes, self.dim))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def _row_vector(self, row):
+        if row >= self._matrix.shape[0]:
+            self._open(row + 1)
+        return np.array(self._matrix[row])
+
+    def get(self, key):
+        with self._lock:
+            row = self._rows.get(key)
+            return None if row is None else self._row_vector(row)
+
+    def get_many(self, keys):
+        with self._lock:
+            return [self._row_vector(self._rows[key]) if key in self._rows else None
+                    for key in keys]
+
+    def put(self, key, vector):
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        with self._lock, open(self.index_path, 'a+') as index_file:
+            if fcntl:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                self._read_index(index_file)
+                row = self._rows.get(key)
+                if row is not None:
+                    return self._row_vector(row)
+                row = len(self._rows)
+                if row >= self._matrix.shape[0]:
+                    self._open(max(self._matrix.shape[0] * 2, row + 1))
+                self._matrix[row] = vector
+                self._matrix.flush()
+                # Only publish the row once its vector is on disk
+                index_file.write(key + "\n")
+                index_file.flush()
+                self._index_offset = index_file.tell()
+                self._rows[key] = row
+                return vector
+            finally:
+                if fcntl:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+
+    def get_or_compute(self, text, encode):
+        key = text_hash(text)
+        vector = self.get(key)
+        if vector is None:
+            vector = self.put(key, encode(text))
+        return vector
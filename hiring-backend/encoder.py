@@ -0,0 +1,92 @@
+# Loads the matcher's sentence-transformer on the selected inference backend:
+#
+#   torch       PyTorch fp32 (the original setup)
+#   onnx        ONNX Runtime fp32, same vectors as torch at lower CPU cost
+#   onnx-int8   ONNX Runtime with int8 dynamic quantization
+#
+# The ONNX backends need `pip install "sentence-transformers[onnx]"`. Each
+# model is exported once into onnx_models/ and loaded from there afterwards;
+# run the export ahead of a deploy so workers do not race to do it:
+#
+#   python encoder.py all-mpnet-base-v2 --backend onnx-int8
+import argparse
+import os
+import re
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking around the export
+    fcntl = None
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+# all-MiniLM-L6-v2 (the chatbot's model) is roughly 5x cheaper on CPU
+DEFAULT_MODEL_NAME = os.environ.get('MATCHER_MODEL', "all-mpnet-base-v2")
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', "torch")
+ONNX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'onnx_models')
+# Instruction set targeted by the int8 kernels: avx2 runs on any x86-64
+# server, avx512_vnni is faster on Cascade Lake and newer, arm64 for Graviton
+QUANTIZATION_CONFIG = os.environ.get('ONNX_QUANTIZATION', 'avx2')
+
+
+def vector_key(model_name, backend):
+    # Name of the embedding cache / candidate index for a model and backend.
+    # ONNX fp32 reproduces the torch vectors, so they share a cache; int8
+    # vectors drift slightly and are kept apart.
+    if backend == "onnx-int8":
+        return f"{model_name}-qint8-{QUANTIZATION_CONFIG}"
+    return model_name
+
+
+def onnx_path(model_name):
+    return os.path.join(ONNX_DIR, re.sub(r'[^\w.-]', '_', model_name))
+
+
+def quantized_file_name():
+    return f"onnx/model_qint8_{QUANTIZATION_CONFIG}.onnx"
+
+
+def export_onnx(model_name, quantize=False):
+    from sentence_transformers import SentenceTransformer
+
+    path = onnx_path(model_name)
+    os.makedirs(ONNX_DIR, exist_ok=True)
+    with open(path + ".lock", 'w') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if not os.path.exists(os.path.join(path, 'model.onnx')):
+            SentenceTransformer(model_name, backend="onnx").save(path)
+        if quantize and not os.path.exists(os.path.join(path, quantized_file_name())):
+            from sentence_transformers import export_dynamic_quantized_onnx_model
+            export_dynamic_quantized_onnx_model(SentenceTransformer(path, backend="onnx"), QUANTIZATION_CONFIG, path)
+    return path
+
+
+def load_encoder(model_name, backend="torch"):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    # Imported here so processes that only talk to the embedding server
+    # (embedding_server.RemoteEncoder) never load torch
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    path = export_onnx(model_name, quantize=backend == "onnx-int8")
+    if backend == "onnx":
+        return SentenceTransformer(path, backend="onnx")
+    return SentenceTransformer(path, backend="onnx", model_kwargs={"file_name": quantized_file_name()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a sentence-transformer to ONNX (optionally int8)")
+    parser.add_argument('model')
+    parser.add_argument('--backend', choices=BACKENDS[1:], default="onnx-int8")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    path = export_onnx(args.model, quantize=args.backend == "onnx-int8")
+    print(f"Exported {args.model} ({args.backend}) to {path} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+# Serving stored PDFs (resumes and job descriptions) with strong ETags,
+# Range support and Cache-Control, optionally offloaded to a front proxy.
+#
+# FILE_SERVING picks how the bytes leave:
+#   "flask"   - the worker streams the file (send_file handles Range and
+#               If-None-Match itself); the default
+#   "sendfile" - X-Sendfile header for Apache mod_xsendfile / lighttpd
+#   "x-accel" - X-Accel-Redirect to an internal nginx location that maps
+#               X_ACCEL_PREFIX onto the upload folder, e.g.
+#                   location /protected-uploads/ { internal; alias /srv/hiring-backend/uploads/; }
+#
+# Lookups go through FileIndex, an in-process LRU of resolved paths, sizes
+# and ETags. Content-addressed files never change, so a hit needs no
+# filesystem access at all; other files are re-checked every
+# FILE_INDEX_REVALIDATE seconds.
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, request, send_file
+
+import storage
+from metrics import cache_result
+from pdf_text import file_sha256
+
+log = logging.getLogger(__name__)
+
+FILE_SERVING = os.environ.get('FILE_SERVING', 'flask')
+X_ACCEL_PREFIX = os.environ.get('X_ACCEL_PREFIX', '/protected-uploads/')
+FILE_INDEX_SIZE = int(os.environ.get('FILE_INDEX_SIZE', 10000))
+FILE_INDEX_REVALIDATE = float(os.environ.get('FILE_INDEX_REVALIDATE', 60))
+# Resumes are personal data: browsers may cache them, shared caches may not
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+
+class FileEntry:
+    def __init__(self, path, relative_path, size, mtime, etag, immutable):
+        self.path = path
+        self.relative_path = relative_path
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+        self.immutable = immutable
+        self.checked_at = time.monotonic()
+
+
+class FileIndex:
+    def __init__(self, root=storage.UPLOAD_FOLDER, max_entries=FILE_INDEX_SIZE, revalidate=FILE_INDEX_REVALIDATE):
+        self.root = os.path.realpath(root)
+        self.max_entries = max_entries
+        self.revalidate = revalidate
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build(self, path, old=None):
+        # Resolve symlinks too: the real file must live under the upload folder
+        real_path = os.path.realpath(path)
+        if os.path.commonpath([real_path, self.root]) != self.root:
+            log.warning("Refusing to serve %s: outside %s", path, self.root)
+            return None
+        try:
+            stat = os.stat(real_path)
+        except OSError:
+            return None
+        match = storage.SHA256_PDF_RE.match(os.path.basename(real_path))
+        if match:
+            etag, immutable = match.group(1), True
+        elif old is not None and (old.size, old.mtime) == (stat.st_size, stat.st_mtime):
+            old.checked_at = time.monotonic()
+            return old
+        else:
+            etag, immutable = file_sha256(real_path), False
+        return FileEntry(real_path, os.path.relpath(real_path, self.root), stat.st_size, stat.st_mtime, etag, immutable)
+
+    def lookup(self, key, resolve=None):
+        # FileEntry for a stored path (or for a name that resolve() maps to
+        # one, only called on a miss), or None when it is missing or unsafe
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and (entry.immutable or time.monotonic() - entry.checked_at < self.revalidate):
+            cache_result("file_index", 1)
+            return entry
+        cache_result("file_index", 0, 1)
+        path = resolve(key) if resolve else key
+        entry = self._build(path, entry) if path else None
+        with self._lock:
+            if entry is None:
+                self._entries.pop(key, None)
+                return None
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def forget(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def serve(entry, download_name, mode=None):
+    mode = mode or FILE_SERVING
+    cache_control = IMMUTABLE_CACHE_CONTROL if entry.immutable else REVALIDATE_CACHE_CONTROL
+    if mode == "x-accel":
+        # nginx sends the bytes (and handles Range); we only answer 304s
+        response = Response(mimetype="application/pdf")
+        response.headers["X-Accel-Redirect"] = X_ACCEL_PREFIX + entry.relative_path.replace(os.sep, "/")
+        response.headers.set("Content-Disposition", "attachment", filename=download_name)
+        response.set_etag(entry.etag)
+        response.last_modified = entry.mtime
+        response.make_conditional(request)
+    else:
+        # With app.config['USE_X_SENDFILE'] (FILE_SERVING=sendfile) this
+        # only sets the X-Sendfile header and the front server sends the body
+        response = send_file(entry.path, mimetype="application/pdf", as_attachment=True, download_name=download_name,
+                             conditional=True, etag=entry.etag, max_age=None)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def send_stored(index, key, download_name=None, resolve=None):
+    # Response for a stored file, or None when it is missing or unsafe
+    entry = index.lookup(key, resolve) if key else None
+    if entry is None:
+        return None
+    try:
+        return serve(entry, download_name or os.path.basename(entry.path))
+    except FileNotFoundError:
+        # Removed since it was indexed
+        index.forget(key)
+        return None
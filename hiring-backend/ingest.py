@@ -0,0 +1,308 @@
+# Bulk resume ingestion for campus drives: thousands of PDFs from a
+# directory, a zip archive or a multipart upload in one go.
+#
+# Files are streamed to staged temporary files (storage.py) and hashed, so
+# the same resume uploaded twice (in one batch or across batches) is stored
+# and inserted once. Text is extracted in the shared PDF process pool
+# (pdf_text.get_pool), embeddings are computed in batches by the matcher,
+# and candidates are inserted with one executemany per batch.
+#
+# A staged file only moves into content-addressed storage together with its
+# batch's insert. Duplicates, unreadable PDFs and failed batches are
+# discarded, so no orphan files are left behind.
+#
+# Name, email and phone come from an optional CSV manifest
+# (filename,name,email,phone_no) and otherwise from the resume text.
+#
+#   python ingest.py /path/to/resumes --manifest candidates.csv --workers 4
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import re
+import time
+import zipfile
+
+import db
+import pdf_text
+import storage
+
+log = logging.getLogger(__name__)
+
+INGEST_STATUS_FOLDER = os.path.join(storage.UPLOAD_FOLDER, 'ingest')
+INGEST_BATCH_SIZE = 200
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\d[\d ()-]{8,}\d")
+NAME_LINE_RE = re.compile(r"^[A-Za-z][A-Za-z .'-]{1,60}$")
+HEADING_LINES = {"resume", "curriculum vitae", "cv", "profile", "biodata"}
+
+
+def iter_zip_pdfs(archive):
+    # (member name, file-like) for every PDF in a zip, decompressed lazily
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            if info.is_dir() or not name.lower().endswith('.pdf') or '__MACOSX' in name:
+                continue
+            with zf.open(info) as member:
+                yield os.path.basename(name), member
+
+
+def iter_directory_pdfs(directory):
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            if name.lower().endswith('.pdf'):
+                with open(os.path.join(root, name), 'rb') as f:
+                    yield name, f
+
+
+def load_manifest(stream):
+    # filename -> {name, email, phone_no}
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', errors='ignore'))
+    return {os.path.basename(row['filename']): row for row in reader if row.get('filename')}
+
+
+def guess_details(filename, text):
+    email = EMAIL_RE.search(text)
+    phone = PHONE_RE.search(text)
+    name = None
+    for line in text.splitlines()[:5]:
+        line = line.strip()
+        if NAME_LINE_RE.match(line) and len(line.split()) <= 4 and line.lower() not in HEADING_LINES:
+            name = line.title()
+            break
+    if not name:
+        name = " ".join(re.split(r"[_\-.\s]+", os.path.splitext(filename)[0])).strip().title()
+    return {"name": name, "email": email.group(0) if email else None,
+            "phone_no": phone.group(0).strip() if phone else None}
+
+
+class IngestReport:
+    def __init__(self, ingest_id=None):
+        self.ingest_id = ingest_id
+        self.status = "running"
+        self.total = 0
+        self.processed = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors = []
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def error(self, filename, message):
+        self.failed += 1
+        self.errors.append({"file": filename, "error": message})
+
+    def to_dict(self):
+        return {
+            "ingest_id": self.ingest_id,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": self.errors,
+            "elapsed_seconds": round((self.finished_at or time.time()) - self.started_at, 1)
+        }
+
+
+def stage_files(sources, report, upload_folder=storage.UPLOAD_FOLDER):
+    # Stream every (filename, file-like) to a staged upload
+    staged = []
+    for filename, stream in sources:
+        report.total += 1
+        try:
+            upload = storage.stage(stream, upload_folder)
+        except ValueError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"Could not store file: {e}"
+        else:
+            staged.append((filename, upload))
+            continue
+        report.error(filename, error)
+        report.processed += 1
+    return staged
+
+
+def _commit(upload):
+    # Extraction cached the text next to the staged file; keep it with the PDF
+    cache_path = upload.tmp_path + pdf_text.CACHE_SUFFIX
+    path = upload.commit()
+    if os.path.exists(cache_path):
+        os.replace(cache_path, path + pdf_text.CACHE_SUFFIX)
+
+
+def _discard(upload, is_referenced=None):
+    if upload.tmp_path is not None:
+        cache_path = upload.tmp_path + pdf_text.CACHE_SUFFIX
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+    created = upload.created
+    upload.discard(is_referenced)
+    if created and not os.path.exists(upload.path) and os.path.exists(upload.path + pdf_text.CACHE_SUFFIX):
+        os.remove(upload.path + pdf_text.CACHE_SUFFIX)
+
+
+def _ingest_batch(batch, pool, report, manifest, matcher):
+    # Drop resumes already stored in the database or repeated in this batch
+    seen = set()
+    unique = []
+    for filename, upload in batch:
+        if upload.sha256 in seen:
+            report.duplicates += 1
+            _discard(upload)
+        else:
+            seen.add(upload.sha256)
+            unique.append((filename, upload))
+    with db.connection() as conn, conn.cursor() as cursor:
+        placeholders = ", ".join(["%s"] * len(unique))
+        cursor.execute(f"SELECT resume_sha256 FROM candidate_details WHERE resume_sha256 IN ({placeholders})",
+                       tuple(upload.sha256 for _, upload in unique))
+        existing = {row['resume_sha256'] for row in cursor.fetchall()}
+    new = []
+    for filename, upload in unique:
+        if upload.sha256 in existing:
+            report.duplicates += 1
+            _discard(upload)
+        else:
+            new.append((filename, upload))
+
+    rows, texts, uploads = [], [], []
+    for (filename, upload), (text, error) in zip(new, pool.map(pdf_text.try_extract_text, [upload.tmp_path for _, upload in new], chunksize=8)):
+        if error:
+            report.error(filename, error)
+            _discard(upload)
+            continue
+        details = manifest.get(filename) or guess_details(filename, text)
+        rows.append((details.get('name'), details.get('email'), details.get('phone_no'), upload.path, upload.sha256))
+        texts.append(text)
+        uploads.append(upload)
+
+    ids = {}
+    if rows:
+        with db.connection() as conn, conn.cursor() as cursor:
+            # Same order as app.create_with_upload: insert (uncommitted), move
+            # the files into place, then commit; undo both on any failure
+            try:
+                # A concurrent ingest may have inserted the same resume
+                # meanwhile; that row is kept (and not counted as inserted),
+                # while any other error still fails the batch
+                cursor.executemany("""
+                    INSERT INTO candidate_details (name, email, phone_no, resume, resume_sha256)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE resume_sha256 = resume_sha256
+                """, rows)
+                inserted = cursor.rowcount
+                placeholders = ", ".join(["%s"] * len(rows))
+                cursor.execute(f"SELECT candidate_id, resume_sha256 FROM candidate_details WHERE resume_sha256 IN ({placeholders})",
+                               tuple(row[4] for row in rows))
+                ids = {row['resume_sha256']: row['candidate_id'] for row in cursor.fetchall()}
+                for upload in uploads:
+                    _commit(upload)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                for upload in uploads:
+                    _discard(upload, lambda path: db.upload_referenced(conn, path))
+                raise
+            for upload in uploads:
+                upload.finish()
+        report.inserted += inserted
+        report.duplicates += len(rows) - inserted
+
+    if matcher is not None and rows:
+        try:
+            matcher.index_texts([ids[row[4]] for row in rows if row[4] in ids],
+                                [text for row, text in zip(rows, texts) if row[4] in ids])
+        except Exception as e:
+            log.error("Embedding batch failed during ingest: %s", e)
+    report.processed += len(batch)
+
+
+def ingest(staged, report, manifest=None, matcher=None, batch_size=INGEST_BATCH_SIZE, on_progress=None):
+    manifest = manifest or {}
+    try:
+        # Spawned, long-lived and shared with the matcher: ingest runs on a
+        # thread of the API, where forking a fresh pool is unsafe
+        pool = pdf_text.get_pool()
+        for start in range(0, len(staged), batch_size):
+            _ingest_batch(staged[start:start + batch_size], pool, report, manifest, matcher)
+            if on_progress:
+                on_progress(report)
+        report.status = "done"
+    except Exception as e:
+        report.status = "failed"
+        report.errors.append({"file": None, "error": str(e)})
+    finally:
+        # Batches that never ran (or failed) leave staged files behind
+        for _, upload in staged:
+            if upload.tmp_path is not None:
+                _discard(upload)
+    report.finished_at = time.time()
+    if on_progress:
+        on_progress(report)
+    return report
+
+
+def write_status(report, folder=INGEST_STATUS_FOLDER):
+    # Progress is kept on disk so any Flask worker can answer the status poll
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f"{report.ingest_id}.json")
+    with open(path + ".tmp", 'w') as f:
+        json.dump(report.to_dict(), f)
+    os.replace(path + ".tmp", path)
+
+
+def read_status(ingest_id, folder=INGEST_STATUS_FOLDER):
+    if not re.fullmatch(r"[0-9a-f]{32}", ingest_id):
+        return None
+    try:
+        with open(os.path.join(folder, f"{ingest_id}.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory (or zip) of resume PDFs")
+    parser.add_argument('source', help="directory of PDFs or a .zip archive")
+    parser.add_argument('--manifest', help="CSV with filename,name,email,phone_no columns")
+    parser.add_argument('--workers', type=int, default=None, help="PDF extraction processes (default PDF_WORKERS)")
+    parser.add_argument('--batch-size', type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument('--no-embed', action='store_true', help="skip embeddings and the candidate index")
+    args = parser.parse_args()
+
+    pdf_text.get_pool(args.workers)
+    manifest = {}
+    if args.manifest:
+        with open(args.manifest, 'rb') as f:
+            manifest = load_manifest(f)
+    report = IngestReport()
+    if args.source.lower().endswith('.zip'):
+        staged = stage_files(iter_zip_pdfs(args.source), report)
+    else:
+        staged = stage_files(iter_directory_pdfs(args.source), report)
+    print(f"Staged {len(staged)} of {report.total} files")
+
+    matcher = None
+    if not args.no_embed:
+        from resume_matcher import get_matcher
+        matcher = get_matcher()
+
+    def show(report):
+        print(f"[{report.processed}/{report.total}] inserted {report.inserted}, "
+              f"duplicates {report.duplicates}, failed {report.failed}")
+
+    ingest(staged, report, manifest, matcher, args.batch_size, show)
+    for error in report.errors:
+        print(f"  {error['file']}: {error['error']}")
+    print(f"Ingest {report.status} in {report.to_dict()['elapsed_seconds']}s")
+
+
+if __name__ == '__main__':
+    main()
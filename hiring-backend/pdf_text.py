@@ -0,0 +1,189 @@
+# Shared PDF text extraction with an on-disk cache.
+#
+# Text is stored next to the upload as <file>.pdf.json together with the
+# file's size, mtime and SHA-256, so every PDF is parsed once no matter how
+# many times it is scored or searched. Backfill an existing directory with:
+#
+#   python pdf_text.py uploads --workers 4
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Resumes and JDs rarely run past a few pages; anything beyond this is skipped
+MAX_PAGES = 20
+CACHE_SUFFIX = ".json"
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', min(4, os.cpu_count() or 1)))
+
+log = logging.getLogger(__name__)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_pages(pdf_path, max_pages=MAX_PAGES):
+    # Page-wise generator so large PDFs are never held as one big string.
+    # PyMuPDF loads on first use: db and file_serving only need file_sha256
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        for number, page in enumerate(doc):
+            if max_pages is not None and number >= max_pages:
+                break
+            yield page.get_text("text")
+
+
+def _read_cache(pdf_path, stat, max_pages):
+    cache_path = pdf_path + CACHE_SUFFIX
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("truncated") and (max_pages is None or max_pages > cached.get("max_pages", 0)):
+        return None
+    if cached.get("size") == stat.st_size and cached.get("mtime") == stat.st_mtime:
+        return cached
+    # Touched but not modified: confirm by content hash and refresh the mtime
+    if cached.get("sha256") == file_sha256(pdf_path):
+        cached["mtime"] = stat.st_mtime
+        _write_cache(pdf_path, cached)
+        return cached
+    return None
+
+
+def _write_cache(pdf_path, cached):
+    cache_path = pdf_path + CACHE_SUFFIX
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cached, f)
+    os.replace(tmp_path, cache_path)
+
+
+def extract_pages(pdf_path, max_pages=MAX_PAGES):
+    stat = os.stat(pdf_path)
+    cached = _read_cache(pdf_path, stat, max_pages)
+    if cached is not None:
+        pages = cached["pages"]
+        return pages[:max_pages] if max_pages is not None else pages
+
+    pages = []
+    truncated = False
+    for page_text in iter_pages(pdf_path, None if max_pages is None else max_pages + 1):
+        if max_pages is not None and len(pages) == max_pages:
+            truncated = True
+            break
+        pages.append(page_text)
+    _write_cache(pdf_path, {
+        "sha256": file_sha256(pdf_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "max_pages": max_pages,
+        "truncated": truncated,
+        "pages": pages
+    })
+    return pages
+
+
+def extract_text(pdf_path, separator=" ", max_pages=MAX_PAGES):
+    return separator.join(extract_pages(pdf_path, max_pages))
+
+
+def cached_text(pdf_path, separator=" ", max_pages=MAX_PAGES):
+    # Text from the cache only (no PyMuPDF), or None when it has to be extracted
+    try:
+        cached = _read_cache(pdf_path, os.stat(pdf_path), max_pages)
+    except OSError:
+        return None
+    if cached is None:
+        return None
+    pages = cached["pages"]
+    return separator.join(pages[:max_pages] if max_pages is not None else pages)
+
+
+def try_extract_text(pdf_path):
+    # (text, error) instead of an exception; module-level so it can run in pool workers
+    try:
+        text = extract_text(pdf_path).strip()
+        return text, None if text else "No text extracted"
+    except Exception as e:
+        return "", f"Error reading PDF: {e}"
+
+
+def read_text(pdf_path):
+    # Text for scoring, with placeholders instead of exceptions for empty or
+    # unreadable PDFs. Module-level so it can run in pool workers.
+    try:
+        text = extract_text(pdf_path)
+        if not text.strip():
+            log.warning("No text extracted from %s", pdf_path)
+        return text.strip() or "No text extracted"
+    except Exception as e:
+        log.error("Error reading PDF %s: %s", pdf_path, e)
+        return "Error reading PDF"
+
+
+# One long-lived pool per process for PDFs whose text is not cached yet.
+# Spawned, not forked, since the API process runs threads. Workers only
+# import this module (and whatever the main module does at import, which is
+# why app.py keeps its startup in create_app()).
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool(workers=None):
+    # workers only applies to the first call, which creates the pool
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(workers or PDF_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def _backfill_one(pdf_path):
+    try:
+        extract_pages(pdf_path)
+        return pdf_path, None
+    except Exception as e:
+        return pdf_path, str(e)
+
+
+def backfill(directory, workers=None):
+    pdf_paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names if name.lower().endswith('.pdf')
+    )
+    errors = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for pdf_path, error in pool.map(_backfill_one, pdf_paths, chunksize=8):
+            if error:
+                errors[pdf_path] = error
+    return len(pdf_paths), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract and cache the text of every PDF in a directory")
+    parser.add_argument('directory', nargs='?', default='uploads')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    total, errors = backfill(args.directory, args.workers)
+    for pdf_path, error in errors.items():
+        print(f"Error reading PDF {pdf_path}: {error}")
+    print(f"Extracted {total - len(errors)}/{total} PDFs in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# Opt-in sampling profiler for slow requests. Off unless PROFILE_SLOW_MS is
+# set; then a background thread samples the stacks of traced request threads
+# every PROFILE_INTERVAL_MS, and requests slower than PROFILE_SLOW_MS get
+# their samples written to PROFILE_DIR in collapsed-stack format (one
+# "frame;frame;frame count" line per stack, as read by flamegraph.pl and
+# speedscope). PROFILE_SAMPLE_RATE traces only a fraction of requests.
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+log = logging.getLogger(__name__)
+
+PROFILE_SLOW_MS = float(os.environ.get('PROFILE_SLOW_MS', 0))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 1))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+MAX_STACK_DEPTH = 64
+
+
+def collapse(frame):
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class SlowRequestProfiler:
+    def __init__(self, slow_ms=PROFILE_SLOW_MS, interval_ms=PROFILE_INTERVAL_MS,
+                 sample_rate=PROFILE_SAMPLE_RATE, directory=PROFILE_DIR):
+        self.slow_ms = slow_ms
+        self.interval = interval_ms / 1000
+        self.sample_rate = sample_rate
+        self.directory = directory
+        # thread ident -> Counter of collapsed stacks
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for ident, samples in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        samples[collapse(frame)] += 1
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+            self._thread.start()
+
+    def begin(self):
+        # Returns a token for end(), or None when this request is not sampled
+        if random.random() >= self.sample_rate:
+            return None
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = Counter()
+        return ident, time.perf_counter()
+
+    def end(self, token, name):
+        if token is None:
+            return None
+        ident, start = token
+        with self._lock:
+            samples = self._active.pop(ident, None)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not samples or elapsed_ms < self.slow_ms:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')}-{ident}.folded")
+        with open(path, 'w') as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+        log.warning("Slow request %s took %.0f ms; %d stack samples in %s", name, elapsed_ms, sum(samples.values()), path)
+        return path
+
+
+def from_env():
+    if PROFILE_SLOW_MS <= 0:
+        return None
+    profiler = SlowRequestProfiler()
+    profiler.start()
+    return profiler
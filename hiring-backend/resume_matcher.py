@@ -1,19 +1,54 @@
-from flask import Flask, request, jsonify
-import mysql.connector  
-import fitz  
 import re
-import spacy
-from fuzzywuzzy import fuzz
-import pdfplumber
 import argparse
-from sentence_transformers import SentenceTransformer, util
+import json
 import os
-import pandas as pd
-import math
+import threading
+import time
+import logging
+import numpy as np
+from embedding_store import EmbeddingStore, text_hash
+from candidate_index import CandidateIndex
+from skill_matcher import MATCHER_VERSION, SkillMatcher, SKILL_ALIASES
+from skill_lexicon import SKILL_LEXICON, load_lexicon
+import pdf_text
+import db
+import score_memo
+import scoring_policy
+from metrics import Gauge, cache_result, span
+from chunking import chunk_text
+from encoder import DEFAULT_MODEL_NAME, INFERENCE_BACKEND, load_encoder, vector_key
+from embedding_server import EMBEDDING_SERVER, RemoteEncoder
+
+ENCODE_BATCH_SIZE = 32
+# "single" encodes each document as one (model-truncated) string; "chunked"
+# encodes overlapping windows and aggregates chunk-to-chunk similarities
+SIMILARITY_MODE = os.environ.get('SIMILARITY_MODE', 'single')
+# "maxsim": mean over JD chunks of the best-matching resume chunk;
+# "mean": cosine of the mean-pooled chunk vectors
+CHUNK_AGGREGATION = os.environ.get('CHUNK_AGGREGATION', 'maxsim')
+
+log = logging.getLogger(__name__)
+MODEL_LOAD_SECONDS = Gauge("matcher_model_load_seconds", "Time taken to load the sentence encoder", ["model", "backend"])
+
 class ResumeMatcher:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.model = SentenceTransformer("all-mpnet-base-v2")
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, similarity_mode=SIMILARITY_MODE,
+                 chunk_aggregation=CHUNK_AGGREGATION, backend=INFERENCE_BACKEND, policy=None):
+        start = time.perf_counter()
+        if EMBEDDING_SERVER:
+            # Thin client: the model lives in embedding_server.py, shared by all workers
+            self.model = RemoteEncoder(EMBEDDING_SERVER)
+            model_name, backend = self.model.model_name, self.model.backend
+        else:
+            self.model = load_encoder(model_name, backend)
+        MODEL_LOAD_SECONDS.set(time.perf_counter() - start, model=model_name, backend=backend)
+        log.info("Loaded %s (%s) in %.1fs", model_name, backend, time.perf_counter() - start)
+        self.model_name = model_name
+        self.backend = backend
+        self.similarity_mode = similarity_mode
+        self.chunk_aggregation = chunk_aggregation
+        self.policy = policy or scoring_policy.get_policy()
+        self.embedding_store = EmbeddingStore(vector_key(model_name, backend), self.model.get_sentence_embedding_dimension())
+        self.candidate_index = CandidateIndex(vector_key(model_name, backend), self.embedding_store.dim)
         self.skills_database = set([
     # --- Technical Skills ---
     "python", "java", "javascript", "c++", "c#", "sql", "firebase", "mongodb",
@@ -22,7 +57,33 @@ class ResumeMatcher:
     "pytorch", "django", "flask", "spring boot", "aws", "azure", "docker", "kubernetes",
     "git", "github", "html", "css", "bootstrap", "tailwind", "typescript"
 ])
+        self._skill_matcher = None
+        self._skill_matcher_lock = threading.Lock()
     
+    @property
+    def skill_matcher(self):
+        # Built on first use from the inline skills, plus the mined lexicon
+        # with SKILL_LEXICON=1
+        if self._skill_matcher is None:
+            with self._skill_matcher_lock:
+                if self._skill_matcher is None:
+                    skills = set(self.skills_database)
+                    lexicon = load_lexicon() if SKILL_LEXICON else None
+                    if lexicon:
+                        skills.update(lexicon["skills"])
+                    self._skill_matcher = SkillMatcher(skills, SKILL_ALIASES)
+        return self._skill_matcher
+
+    @property
+    def scorer_key(self):
+        # Everything besides the two texts that score components depend on
+        key = f"{vector_key(self.model_name, self.backend)}/{self.similarity_mode}"
+        if self.similarity_mode == "chunked":
+            key += f"-{self.chunk_aggregation}"
+        key += f"/matcher-v{MATCHER_VERSION}"
+        lexicon = load_lexicon() if SKILL_LEXICON else None
+        return key + (f"/lexicon-{lexicon['source_sha256'][:12]}" if lexicon else "/inline-skills")
+
     def preprocess_text(self, text):
         text = text.lower().strip()
         text = re.sub(r'\s+', ' ', text) 
@@ -31,66 +92,140 @@ class ResumeMatcher:
         return " ".join(text.split()) 
     
     def connect_db(self):
-        return mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="root@Harisha",
-            database="hiring_db_system"
-        )
+        # Pooled connection shared with app.py; returned to the pool on exit
+        return db.connection()
     
     def fetch_resume_and_job(self, job_id, candidate_id):
         
-        conn = self.connect_db()
-        cursor = conn.cursor(dictionary=True)
+        with self.connect_db() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT resume FROM candidate_details WHERE candidate_id = %s", (candidate_id,))
+            resume_record = cursor.fetchone()
 
-        cursor.execute("SELECT resume FROM candidate_details WHERE candidate_id = %s", (candidate_id,))
-        resume_record = cursor.fetchone()
-
-        cursor.execute("SELECT job_description FROM jobs_description WHERE job_id = %s", (job_id,))
-        job_record = cursor.fetchone()
-
-        conn.close()
+            cursor.execute("SELECT job_description FROM jobs_description WHERE job_id = %s", (job_id,))
+            job_record = cursor.fetchone()
 
         if not resume_record or not job_record:
             return None, None
         
         return resume_record["resume"], job_record["job_description"]
     
+    def fetch_resumes_and_job(self, job_id, candidate_ids):
+        # One round trip for all resume paths of a batch re-score
+        with self.connect_db() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT job_description FROM jobs_description WHERE job_id = %s", (job_id,))
+            job_record = cursor.fetchone()
+
+            resume_paths = {}
+            if candidate_ids:
+                placeholders = ", ".join(["%s"] * len(candidate_ids))
+                cursor.execute(f"SELECT candidate_id, resume FROM candidate_details WHERE candidate_id IN ({placeholders})",
+                               tuple(str(c) for c in candidate_ids))
+                resume_paths = {str(row["candidate_id"]): row["resume"] for row in cursor.fetchall()}
+        return (job_record["job_description"] if job_record else None), resume_paths
+
     def extract_text_from_pdf(self,pdf_path):
-        try:
-            doc = fitz.open(pdf_path)
-            text = " ".join(page.get_text("text") for page in doc)  # FIXED CALL
-            if not text.strip():
-                print(f"No text extracted from {pdf_path}")
-            return text.strip() or "No text extracted"
-        except Exception as e:
-            print(f"Error reading PDF {pdf_path}: {e}")
-            return "Error reading PDF"
-    def extract_skills(self, text):
-        doc = self.nlp(text)
-        extracted_skills = set()
+        return pdf_text.read_text(pdf_path)
 
-        for token in doc:
-            word = token.text.lower()
-            if word in self.skills_database:
-                extracted_skills.add(word)
+    def extract_texts_from_pdfs(self, pdf_paths, parallel=True):
+        # Cached texts are read inline; the rest are parsed in the shared
+        # pool (PyMuPDF is not thread-safe), or inline with parallel=False
+        texts = [pdf_text.cached_text(path) for path in pdf_paths]
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if parallel and len(missing) > 1:
+            extracted = pdf_text.get_pool().map(pdf_text.read_text, [pdf_paths[i] for i in missing], chunksize=4)
+        else:
+            extracted = (pdf_text.read_text(pdf_paths[i]) for i in missing)
+        for i, text in zip(missing, extracted):
+            texts[i] = text
+        return [text.strip() or "No text extracted" for text in texts]
 
-        for chunk in doc.noun_chunks:
-            phrase = chunk.text.lower()
-            if phrase in self.skills_database:
-                extracted_skills.add(phrase)
+    def extract_skills(self, text):
+        return list(self.skill_matcher.find(text))
 
-        return list(extracted_skills)
+    def extract_skills_many(self, texts):
+        return [self.extract_skills(text) for text in texts]
     
+    def embed_text(self, text):
+        # Normalised embedding of the preprocessed text, cached on disk by content hash
+        text = self.preprocess_text(text)
+        key = text_hash(text)
+        vector = self.embedding_store.get(key)
+        cache_result("embedding", vector is not None, vector is None)
+        if vector is None:
+            with span("encode"):
+                vector = self.embedding_store.put(key, self.model.encode(text, convert_to_numpy=True))
+        return vector
+
+    def embed_texts(self, texts):
+        # Look every text up in the store and encode only the misses, in batches
+        texts = [self.preprocess_text(text) for text in texts]
+        keys = [text_hash(text) for text in texts]
+        vectors = self.embedding_store.get_many(keys)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        cache_result("embedding", len(keys) - len(missing), len(missing))
+        if missing:
+            with span("encode"):
+                encoded = self.model.encode([texts[i] for i in missing], batch_size=ENCODE_BATCH_SIZE,
+                                            convert_to_numpy=True)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = self.embedding_store.put(keys[i], vector)
+        return np.vstack(vectors) if vectors else np.zeros((0, self.embedding_store.dim), dtype=np.float32)
+
+    def embed_pdf(self, pdf_path):
+        return self.embed_text(self.extract_text_from_pdf(pdf_path))
+
+    def precompute_chunks(self, texts):
+        # Chunked scoring never uses the whole-document vector; cache the
+        # chunk vectors it will look up instead, in one batched encode
+        if self.similarity_mode == "chunked":
+            self.embed_texts([chunk for text in texts for chunk in self.chunk_text(text)])
+
+    def precompute_pdf(self, pdf_path):
+        # Cache the vectors scoring will look up for an uploaded JD or resume
+        text = self.extract_text_from_pdf(pdf_path)
+        if self.similarity_mode == "chunked":
+            self.precompute_chunks([text])
+        else:
+            self.embed_text(text)
+
+    def chunk_text(self, text):
+        return chunk_text(text, self.preprocess_text)
+
+    def aggregate_chunk_similarity(self, job_chunks, resume_chunks):
+        if self.chunk_aggregation == "mean":
+            job_vector = job_chunks.mean(axis=0)
+            resume_vector = resume_chunks.mean(axis=0)
+            norm = np.linalg.norm(job_vector) * np.linalg.norm(resume_vector)
+            return float(np.dot(job_vector, resume_vector) / norm) if norm else 0.0
+        return float((job_chunks @ resume_chunks.T).max(axis=1).mean())
+
     def calculate_similarity(self, text1, text2):
-        text1 = self.preprocess_text(text1)
-        text2 = self.preprocess_text(text2)
-        
-        embeddings1 = self.model.encode(text1, convert_to_tensor=True)
-        embeddings2 = self.model.encode(text2, convert_to_tensor=True)
-        
-        similarity_score = util.pytorch_cos_sim(embeddings1, embeddings2).item() * 100
+        if self.similarity_mode == "chunked":
+            return self.similarity_many(text1, [text2])[0]
+
+        embeddings1 = self.embed_text(text1)
+        embeddings2 = self.embed_text(text2)
+
+        similarity_score = float(np.dot(embeddings1, embeddings2)) * 100
         return similarity_score
+
+    def similarity_many(self, job_text, resume_texts):
+        # Content similarity (0-100) of one JD against many resumes
+        if self.similarity_mode != "chunked":
+            return list(self.embed_texts(resume_texts) @ self.embed_text(job_text) * 100)
+
+        # Every chunk of the JD and all resumes goes through one batched
+        # encode call; chunk vectors are cached like whole-document ones
+        job_chunks = self.chunk_text(job_text)
+        resume_chunks = [self.chunk_text(text) for text in resume_texts]
+        vectors = self.embed_texts(job_chunks + [chunk for chunks in resume_chunks for chunk in chunks])
+        job_vectors = vectors[:len(job_chunks)]
+        offset = len(job_chunks)
+        similarities = []
+        for chunks in resume_chunks:
+            similarities.append(self.aggregate_chunk_similarity(job_vectors, vectors[offset:offset + len(chunks)]) * 100)
+            offset += len(chunks)
+        return similarities
     
     def compare_skills(self, job_skills, resume_skills):
         if not job_skills:
@@ -101,9 +236,7 @@ class ResumeMatcher:
         return match_score, matched_skills
     
     def sigmoid_normalize(self, score):
- 
-        scaled = score / 100  # Convert percentage to 0–1
-        return 1 / (1 + math.exp(-12 * (scaled - 0.5)))  # Adjust 12 for sharpness
+        return scoring_policy.sigmoid_normalize(score, self.policy["sigmoid_sharpness"])
 
     
     def match_resume_to_job(self, job_desc, resume_text):
@@ -112,28 +245,64 @@ class ResumeMatcher:
 
         skill_match, matched_skills = self.compare_skills(job_skills, resume_skills)
         content_similarity = self.calculate_similarity(job_desc, resume_text)
-        skill_match_normalized = self.sigmoid_normalize(skill_match) * 100
-        if skill_match == 100:
-            final_score = (0.4 * content_similarity) + (0.6 * skill_match_normalized)
-        elif skill_match >= 90:
-            final_score = (0.5 * content_similarity) + (0.5 * skill_match_normalized)
-        else:
-            final_score = (0.6 * content_similarity) + (0.4 * skill_match_normalized)
-
-        final_score = min(final_score, 100)
+        final_score = self.blend_scores(skill_match, content_similarity)
 
         return final_score, skill_match, content_similarity, matched_skills
+
+    def blend_scores(self, skill_match, content_similarity):
+        # Weights, sigmoid sharpness and cap come from the scoring policy
+        return scoring_policy.blend(self.policy, skill_match, content_similarity)
+
+    def build_result(self, final_score, skill_match, content_similarity, matched_skills, policy=None):
+        policy = policy or self.policy
+        selected = scoring_policy.is_selected(policy, final_score)
+        selection = "Candidate Selected" if selected else "Candidate Not Selected"
+
+        return {
+            "candidate_selection": selection,
+            "final_score": float("{:.2f}".format(final_score)),
+            "content_similarity": float("{:.2f}".format(content_similarity)),
+            "skill_match": skill_match,
+            "matched_skills": matched_skills,
+            "policy_version": policy["version"]
+        }
+
+    def score_components(self, job_text, resume_texts):
+        # (skill_match, content_similarity, matched_skills) per resume. Pairs
+        # scored before, by any worker, come from the memo without inference.
+        scorer = self.scorer_key
+        job_hash = text_hash(job_text)
+        resume_hashes = [text_hash(text) for text in resume_texts]
+        with span("memo"):
+            components = score_memo.lookup(job_hash, set(resume_hashes), scorer)
+
+        missing = {}
+        for resume_hash, text in zip(resume_hashes, resume_texts):
+            if resume_hash not in components:
+                missing.setdefault(resume_hash, text)
+        cache_result("score_memo", len(resume_hashes) - len(missing), len(missing))
+        if missing:
+            texts = list(missing.values())
+            with span("skill_extract"):
+                job_skills = self.extract_skills(job_text)
+                resume_skills = self.extract_skills_many(texts)
+            # Encoding inside is timed as its own "encode" span
+            with span("similarity"):
+                similarities = self.similarity_many(job_text, texts)
+            computed = {}
+            with span("scoring"):
+                for resume_hash, skills, content_similarity in zip(missing, resume_skills, similarities):
+                    skill_match, matched_skills = self.compare_skills(job_skills, skills)
+                    computed[resume_hash] = (skill_match, float(content_similarity), matched_skills)
+            with span("memo"):
+                score_memo.save(job_hash, computed, scorer)
+            components.update(computed)
+        return [components[resume_hash] for resume_hash in resume_hashes]
     
-    def match_resume(self, job_id, candidate_id):
-        
-        
-        print(job_id,candidate_id)
-        
-        
-        job_desc_path,resume_path  = self.fetch_resume_and_job(job_id, candidate_id)
-        
-        print(job_desc_path,resume_path )
-        
+    def match_resume(self, job_id, candidate_id, policy=None):
+        with span("db_fetch"):
+            resume_path, job_desc_path = self.fetch_resume_and_job(job_id, candidate_id)
+        log.debug("Scoring job %s (%s) against candidate %s (%s)", job_id, job_desc_path, candidate_id, resume_path)
 
         if not resume_path or not job_desc_path:
             return {"error": "Resume or Job description not found in the database."}
@@ -142,22 +311,171 @@ class ResumeMatcher:
         if not os.path.exists(resume_path):
             return {"error": f"Resume file not found: {resume_path}"}
         
+        with span("pdf_extract"):
+            job_text = self.extract_text_from_pdf(job_desc_path)
+            resume_text = self.extract_text_from_pdf(resume_path)
+
+        skill_match, content_similarity, matched_skills = self.score_components(job_text, [resume_text])[0]
+        with span("scoring"):
+            final_score = scoring_policy.blend(policy or self.policy, skill_match, content_similarity)
+            result_dict = self.build_result(final_score, skill_match, content_similarity, matched_skills, policy)
+
+        log.debug("Job %s, candidate %s: %s", job_id, candidate_id, result_dict)
+        return result_dict
+
+    def match_many(self, job_id, candidate_ids, policy=None):
+        # Batch version of match_resume: one DB round trip, parallel PDF
+        # extraction, batched encoding and one matrix product for similarity.
+        with span("db_fetch"):
+            job_desc_path, resume_paths = self.fetch_resumes_and_job(job_id, candidate_ids)
+        if not job_desc_path:
+            return {"error": "Job description not found in the database."}
+        if not os.path.exists(job_desc_path):
+            return {"error": f"Job description file not found: {job_desc_path}"}
+
+        results = {}
+        found = []
+        for candidate_id in candidate_ids:
+            resume_path = resume_paths.get(str(candidate_id))
+            if not resume_path:
+                results[candidate_id] = {"error": "Resume not found in the database."}
+            elif not os.path.exists(resume_path):
+                results[candidate_id] = {"error": f"Resume file not found: {resume_path}"}
+            else:
+                found.append((candidate_id, resume_path))
+        if not found:
+            return results
+
+        with span("pdf_extract"):
+            texts = self.extract_texts_from_pdfs([job_desc_path] + [path for _, path in found])
+        job_text, resume_texts = texts[0], texts[1:]
+
+        policy = policy or self.policy
+        components = self.score_components(job_text, resume_texts)
+        with span("scoring"):
+            final_scores = scoring_policy.blend_many(policy, [c[0] for c in components], [c[1] for c in components])
+            for (candidate_id, _), (skill_match, content_similarity, matched_skills), final_score in zip(found, components, final_scores):
+                results[candidate_id] = self.build_result(float(final_score), skill_match, content_similarity, matched_skills, policy)
+        return results
+
+    def index_texts(self, candidate_ids, texts):
+        # Whole-document vectors feed the search index; chunk vectors too
+        # when scoring is chunked, so applications do not encode them later
+        added = self.candidate_index.add(candidate_ids, self.embed_texts(texts))
+        self.precompute_chunks(texts)
+        return added
+
+    def index_candidate(self, candidate_id, resume_path):
+        self.index_texts([candidate_id], [self.extract_text_from_pdf(resume_path)])
+
+    def sync_candidate_index(self):
+        # Incrementally add every candidate that is not in the vector index yet
+        with self.connect_db() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT candidate_id, resume FROM candidate_details")
+            rows = cursor.fetchall()
+
+        new = [(row["candidate_id"], row["resume"]) for row in rows
+               if row["candidate_id"] not in self.candidate_index
+               and row["resume"] and os.path.exists(row["resume"])]
+        if not new:
+            return 0
+        texts = self.extract_texts_from_pdfs([path for _, path in new])
+        return self.index_texts([candidate_id for candidate_id, _ in new], texts)
+
+    def search_candidates(self, job_id, k=10, required_skills=None, min_skill_match=0, overfetch=5):
+        # Top-K candidates from the whole pool for a job. Skill filters run on
+        # the retrieved shortlist only, so the index does the heavy lifting.
+        job_desc_path, _ = self.fetch_resumes_and_job(job_id, [])
+        if not job_desc_path:
+            return {"error": "Job description not found in the database."}
+        if not os.path.exists(job_desc_path):
+            return {"error": f"Job description file not found: {job_desc_path}"}
         job_text = self.extract_text_from_pdf(job_desc_path)
-        resume_text = self.extract_text_from_pdf(resume_path)
 
-        final_score, skill_match, content_similarity, matched_skills = self.match_resume_to_job(job_text, resume_text)
+        filtering = bool(required_skills) or min_skill_match > 0
+        hits = self.candidate_index.search(self.embed_text(job_text), k * overfetch if filtering else k)
+        if not filtering:
+            return [{"candidate_id": candidate_id, "content_similarity": round(score * 100, 2)}
+                    for candidate_id, score in hits]
 
-        selection = "Candidate Selected" if final_score >= 75 else "Candidate Not Selected"
+        required = {skill.lower() for skill in (required_skills or [])}
+        job_skills = self.extract_skills(job_text)
+        _, resume_paths = self.fetch_resumes_and_job(job_id, [candidate_id for candidate_id, _ in hits])
+        hits = [(candidate_id, score) for candidate_id, score in hits if resume_paths.get(candidate_id)]
+        # Inline: uploads are cached when stored, and a request should not wait on a pool
+        texts = self.extract_texts_from_pdfs([resume_paths[candidate_id] for candidate_id, _ in hits], parallel=False)
 
-        result_dict = {
-            "candidate_selection": selection,
-            "final_score": float("{:.2f}".format(final_score)),
-            "content_similarity": float("{:.2f}".format(content_similarity)),
-            "skill_match": skill_match,
-            "matched_skills": matched_skills
-        }
+        results = []
+        for (candidate_id, score), skills in zip(hits, self.extract_skills_many(texts)):
+            if not required <= set(skills):
+                continue
+            skill_match, matched_skills = self.compare_skills(job_skills, skills)
+            if skill_match < min_skill_match:
+                continue
+            results.append({
+                "candidate_id": candidate_id,
+                "content_similarity": round(score * 100, 2),
+                "skill_match": skill_match,
+                "matched_skills": sorted(matched_skills)
+            })
+            if len(results) == k:
+                break
+        return results
 
-        print(result_dict)
-        
-        return result_dict
-       
+
+# Process-wide matcher registry: the skill matcher and the transformer are
+# loaded once per worker process and shared by every request thread.
+_matchers = {}
+_matchers_lock = threading.Lock()
+# Matchers whose warm-up pass has finished
+_ready = set()
+
+def get_matcher(model_name=DEFAULT_MODEL_NAME, backend=INFERENCE_BACKEND):
+    matcher = _matchers.get((model_name, backend))
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get((model_name, backend))
+            if matcher is None:
+                matcher = ResumeMatcher(model_name, backend=backend)
+                _matchers[(model_name, backend)] = matcher
+    return matcher
+
+def is_matcher_ready(model_name=DEFAULT_MODEL_NAME, backend=INFERENCE_BACKEND):
+    # Registered is not enough: ready once warm_up has finished with it
+    return (model_name, backend) in _ready
+
+def warm_up(model_name=DEFAULT_MODEL_NAME, backend=INFERENCE_BACKEND, sync_index=False):
+    # Load the models and run one tiny pass so the first real request
+    # does not pay for lazy initialisation inside torch/onnxruntime, then
+    # (sync_index) bring the candidate index up to date. A failed sync is
+    # logged and leaves the matcher ready: scoring does not need the index.
+    matcher = get_matcher(model_name, backend)
+    matcher.extract_skills("python developer with machine learning experience")
+    matcher.calculate_similarity("python developer", "machine learning engineer")
+    if sync_index:
+        try:
+            matcher.sync_candidate_index()
+        except Exception as e:
+            log.error("Candidate index sync failed during warm-up: %s", e)
+    _ready.add((model_name, backend))
+    return matcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score one resume PDF against one job description PDF")
+    parser.add_argument('job_description')
+    parser.add_argument('resume')
+    parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+    parser.add_argument('--backend', default=INFERENCE_BACKEND)
+    args = parser.parse_args()
+
+    matcher = ResumeMatcher(args.model, backend=args.backend)
+    job_text = matcher.extract_text_from_pdf(args.job_description)
+    resume_text = matcher.extract_text_from_pdf(args.resume)
+    result = matcher.build_result(*matcher.match_resume_to_job(job_text, resume_text))
+    result["matched_skills"] = sorted(result["matched_skills"])
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
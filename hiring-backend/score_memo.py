@@ -0,0 +1,49 @@
+# Memo of score components keyed by (JD text hash, resume text hash, scorer),
+# where scorer names everything besides the texts that the components depend
+# on: model, backend, similarity mode and skill lexicon. The blend into
+# final_score is not memoised, so policy changes still apply to memo hits.
+# Stored in MySQL so every worker process shares it.
+import json
+import logging
+
+import db
+
+log = logging.getLogger(__name__)
+
+
+def lookup(job_hash, resume_hashes, scorer):
+    # resume hash -> (skill_match, content_similarity, matched_skills)
+    resume_hashes = list(resume_hashes)
+    if not resume_hashes:
+        return {}
+    try:
+        with db.connection() as conn, conn.cursor() as cursor:
+            placeholders = ", ".join(["%s"] * len(resume_hashes))
+            cursor.execute(f"""
+                SELECT resume_text_sha256, skill_match, content_similarity, matched_skills
+                FROM score_memo
+                WHERE job_text_sha256 = %s AND scorer = %s AND resume_text_sha256 IN ({placeholders})
+            """, [job_hash, scorer] + resume_hashes)
+            return {row['resume_text_sha256']: (row['skill_match'], row['content_similarity'], set(json.loads(row['matched_skills'])))
+                    for row in cursor.fetchall()}
+    except Exception as e:
+        log.warning("Score memo lookup failed: %s", e)
+        return {}
+
+
+def save(job_hash, components, scorer):
+    # components: resume hash -> (skill_match, content_similarity, matched_skills)
+    if not components:
+        return
+    rows = [(job_hash, resume_hash, scorer, skill_match, content_similarity, json.dumps(sorted(matched_skills)))
+            for resume_hash, (skill_match, content_similarity, matched_skills) in components.items()]
+    try:
+        with db.connection() as conn, conn.cursor() as cursor:
+            cursor.executemany("""
+                INSERT IGNORE INTO score_memo
+                    (job_text_sha256, resume_text_sha256, scorer, skill_match, content_similarity, matched_skills)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, rows)
+            conn.commit()
+    except Exception as e:
+        log.warning("Score memo save failed: %s", e)
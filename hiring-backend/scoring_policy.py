@@ -0,0 +1,89 @@
+# Versioned scoring policy: how skill match and content similarity are
+# blended into final_score, and the selection cutoff.
+#
+# Applications store their score components (content_similarity, skill_match,
+# matched_skills), so switching SCORING_POLICY_VERSION, or adding a version in
+# the SCORING_POLICY_FILE JSON, only needs a /rescore-job pass over the
+# stored components, not PDF extraction or the transformer.
+import json
+import math
+import os
+
+SCORING_POLICIES = {
+    1: {
+        "version": 1,
+        "sigmoid_sharpness": 12,
+        # (minimum skill_match, content weight, skill weight); first match wins
+        "blends": [(100, 0.4, 0.6), (90, 0.5, 0.5), (0, 0.6, 0.4)],
+        "max_score": 100,
+        "selection_cutoff": 75
+    }
+}
+SCORING_POLICY_VERSION = int(os.environ.get('SCORING_POLICY_VERSION', 1))
+# Optional JSON list of extra policies, same keys as above
+SCORING_POLICY_FILE = os.environ.get('SCORING_POLICY_FILE')
+
+
+def load_policies(path=SCORING_POLICY_FILE):
+    policies = dict(SCORING_POLICIES)
+    if path:
+        with open(path) as f:
+            for policy in json.load(f):
+                policy["blends"] = sorted((tuple(blend) for blend in policy["blends"]), reverse=True)
+                policies[int(policy["version"])] = policy
+    return policies
+
+
+_policies = None
+
+def get_policy(version=None):
+    # Raises KeyError for unknown versions
+    global _policies
+    if _policies is None:
+        _policies = load_policies()
+    return _policies[int(version or SCORING_POLICY_VERSION)]
+
+
+def sigmoid_normalize(score, sharpness):
+    return 1 / (1 + math.exp(-sharpness * (score / 100 - 0.5)))
+
+
+def blend(policy, skill_match, content_similarity):
+    skill_match_normalized = sigmoid_normalize(skill_match, policy["sigmoid_sharpness"]) * 100
+    for threshold, content_weight, skill_weight in policy["blends"]:
+        if skill_match >= threshold:
+            break
+    return min(content_weight * content_similarity + skill_weight * skill_match_normalized, policy["max_score"])
+
+
+def blend_many(policy, skill_match, content_similarity):
+    # Vectorised blend over arrays of components; only the matcher calls
+    # this, so NumPy is not loaded by API-only workers
+    import numpy as np
+
+    skill_match = np.asarray(skill_match, dtype=np.float64)
+    content_similarity = np.asarray(content_similarity, dtype=np.float64)
+    skill_match_normalized = 100 / (1 + np.exp(-policy["sigmoid_sharpness"] * (skill_match / 100 - 0.5)))
+    conditions = [skill_match >= threshold for threshold, _, _ in policy["blends"]]
+    # Like blend(), the last tier also covers scores below every threshold
+    content_weight = np.select(conditions, [b[1] for b in policy["blends"]], policy["blends"][-1][1])
+    skill_weight = np.select(conditions, [b[2] for b in policy["blends"]], policy["blends"][-1][2])
+    return np.minimum(content_weight * content_similarity + skill_weight * skill_match_normalized, policy["max_score"])
+
+
+def is_selected(policy, final_score):
+    return final_score >= policy["selection_cutoff"]
+
+
+def final_score_sql(policy):
+    # SQL expression (and its parameters) computing final_score from the
+    # skill_match and content_similarity columns, for one UPDATE per job
+    sigmoid = "100 / (1 + EXP(-%s * (skill_match / 100 - 0.5)))"
+    cases, params = [], []
+    for threshold, content_weight, skill_weight in policy["blends"][:-1]:
+        cases.append(f"WHEN skill_match >= %s THEN %s * content_similarity + %s * {sigmoid}")
+        params.extend([threshold, content_weight, skill_weight, policy["sigmoid_sharpness"]])
+    _, content_weight, skill_weight = policy["blends"][-1]
+    cases.append(f"ELSE %s * content_similarity + %s * {sigmoid}")
+    params.extend([content_weight, skill_weight, policy["sigmoid_sharpness"]])
+    return f"LEAST(%s, CASE {' '.join(cases)} END)", [policy["max_score"]] + params
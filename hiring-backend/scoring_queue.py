@@ -0,0 +1,201 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+log = logging.getLogger(__name__)
+
+QUEUE_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_queue.db')
+
+
+class QueueFull(Exception):
+    pass
+
+
+# Persistent scoring queue backed by SQLite, drained by a small pool of
+# worker threads. Claims use BEGIN IMMEDIATE, so several Flask worker
+# processes can share one queue file without scoring an application twice.
+# A claim is a lease: the owning process renews lease_until every
+# lease_seconds / 3, and only claims whose lease ran out (their process died)
+# are picked up again, so starting a process never steals live peers' work.
+class ScoringQueue:
+    def __init__(self, score_fn, on_success, on_failure, db_path=QUEUE_DB_PATH,
+                 workers=2, max_depth=1000, max_attempts=3, retry_delay=5, lease_seconds=60):
+        self.score_fn = score_fn
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.db_path = db_path
+        self.workers = workers
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scoring_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    candidate_id TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    enqueued_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    UNIQUE (job_id, candidate_id)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scoring_jobs_status ON scoring_jobs (status, next_attempt_at)")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(scoring_jobs)")}
+            if 'lease_until' not in columns:
+                # Queue files from before leases: their running rows count as expired
+                conn.execute("ALTER TABLE scoring_jobs ADD COLUMN lease_until REAL NOT NULL DEFAULT 0")
+            if 'policy_version' not in columns:
+                # NULL scores under the worker's default policy
+                conn.execute("ALTER TABLE scoring_jobs ADD COLUMN policy_version INTEGER")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def depth(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM scoring_jobs WHERE status IN ('pending', 'running')").fetchone()[0]
+
+    def enqueue(self, job_id, candidate_id, policy_version=None):
+        # Backpressure: refuse new work instead of letting the backlog grow without bound
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            depth = conn.execute("SELECT COUNT(*) FROM scoring_jobs WHERE status IN ('pending', 'running')").fetchone()[0]
+            if depth >= self.max_depth:
+                conn.execute("ROLLBACK")
+                raise QueueFull(f"Scoring queue is full ({depth} pending)")
+            conn.execute("""
+                INSERT INTO scoring_jobs (job_id, candidate_id, status, attempts, enqueued_at, next_attempt_at, policy_version)
+                VALUES (?, ?, 'pending', 0, ?, ?, ?)
+                ON CONFLICT (job_id, candidate_id) DO UPDATE SET
+                    status = 'pending', attempts = 0, last_error = NULL, policy_version = excluded.policy_version,
+                    enqueued_at = excluded.enqueued_at, next_attempt_at = excluded.next_attempt_at
+            """, (str(job_id), str(candidate_id), now, now, policy_version))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        self._wake.set()
+
+    def _claim(self):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("""
+                SELECT id, job_id, candidate_id, attempts, policy_version FROM scoring_jobs
+                WHERE (status = 'pending' AND next_attempt_at <= ?) OR (status = 'running' AND lease_until < ?)
+                ORDER BY id LIMIT 1
+            """, (now, now)).fetchone()
+            if row:
+                conn.execute("UPDATE scoring_jobs SET status = 'running', attempts = attempts + 1, lease_until = ? WHERE id = ?",
+                             (now + self.lease_seconds, row[0]))
+            conn.execute("COMMIT")
+            if row:
+                with self._held_lock:
+                    self._held.add(row[0])
+            return row
+        finally:
+            conn.close()
+
+    def _renew_leases(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._held_lock:
+                held = list(self._held)
+            if not held:
+                continue
+            try:
+                with closing(self._connect()) as conn:
+                    conn.executemany("UPDATE scoring_jobs SET lease_until = ? WHERE id = ? AND status = 'running'",
+                                     [(time.time() + self.lease_seconds, row_id) for row_id in held])
+            except sqlite3.Error as e:
+                log.warning("Renewing scoring leases failed: %s", e)
+
+    def _finish(self, job_row_id, status, error=None, next_attempt_at=None):
+        with self._held_lock:
+            self._held.discard(job_row_id)
+        with closing(self._connect()) as conn:
+            if status == 'done':
+                conn.execute("DELETE FROM scoring_jobs WHERE id = ?", (job_row_id,))
+            else:
+                conn.execute("UPDATE scoring_jobs SET status = ?, last_error = ?, next_attempt_at = COALESCE(?, next_attempt_at) WHERE id = ?",
+                             (status, error, next_attempt_at, job_row_id))
+
+    def _work(self):
+        while not self._stop.is_set():
+            row = self._claim()
+            if row is None:
+                self._wake.wait(timeout=1)
+                self._wake.clear()
+                continue
+            job_row_id, job_id, candidate_id, attempts, policy_version = row
+            try:
+                result = self.score_fn(job_id, candidate_id, policy_version)
+                self.on_success(job_id, candidate_id, result)
+                self._finish(job_row_id, 'done')
+                self.processed += 1
+            except Exception as e:
+                if attempts + 1 < self.max_attempts:
+                    # Exponential backoff before the next attempt
+                    self._finish(job_row_id, 'pending', str(e), time.time() + self.retry_delay * 2 ** attempts)
+                    self.retried += 1
+                else:
+                    self._finish(job_row_id, 'failed', str(e))
+                    self.failed += 1
+                    try:
+                        self.on_failure(job_id, candidate_id, str(e))
+                    except Exception as callback_error:
+                        log.error("Scoring failure callback error: %s", callback_error)
+
+    def start(self):
+        # Work a dead process left half-done is reclaimed by _claim once its
+        # lease expires (scoring writes are idempotent, so a rare double run
+        # is harmless)
+        thread = threading.Thread(target=self._renew_leases, name="scoring-leases", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"scoring-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def metrics(self):
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM scoring_jobs GROUP BY status").fetchall())
+            oldest = conn.execute("SELECT MIN(enqueued_at) FROM scoring_jobs WHERE status = 'pending'").fetchone()[0]
+        return {
+            "pending": counts.get('pending', 0),
+            "running": counts.get('running', 0),
+            "failed": counts.get('failed', 0),
+            "depth": counts.get('pending', 0) + counts.get('running', 0),
+            "max_depth": self.max_depth,
+            "oldest_pending_seconds": round(time.time() - oldest, 1) if oldest else 0,
+            "workers": self.workers,
+            "processed": self.processed,
+            "retried": self.retried,
+            "failed_total": self.failed
+        }
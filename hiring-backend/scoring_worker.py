@@ -0,0 +1,99 @@
+# Application scoring: the scoring queue callbacks, and a standalone process
+# that drains the shared queue with the matcher loaded. Run the API with
+# API_ONLY=1 and one of these per host, so the Flask workers never import
+# the ML stack:
+#
+#   API_ONLY=1 gunicorn -w 4 'app:create_app()'
+#   python scoring_worker.py --workers 2
+#
+# Without API_ONLY, app.py runs the same callbacks on in-process workers.
+import argparse
+import json
+import logging
+import os
+import signal
+import threading
+
+import db
+import scoring_policy
+from scoring_queue import ScoringQueue
+
+log = logging.getLogger(__name__)
+
+SCORING_WORKERS = int(os.environ.get('SCORING_WORKERS', 2))
+SCORING_QUEUE_MAX_DEPTH = int(os.environ.get('SCORING_QUEUE_MAX_DEPTH', 1000))
+SCORING_MAX_ATTEMPTS = int(os.environ.get('SCORING_MAX_ATTEMPTS', 3))
+
+SAVE_SCORE_SQL = """
+    UPDATE job_application
+    SET final_score = %s, content_similarity = %s, skill_match = %s, matched_skills = %s,
+        policy_version = %s, score_status = 'scored'
+    WHERE job_id = %s AND candidate_id = %s
+"""
+
+
+def score_application(job_id, candidate_id, policy_version=None):
+    # Imported on first use: importing this module must stay cheap for API-only workers
+    from resume_matcher import get_matcher
+
+    # Raises KeyError (and so fails the job) if this worker lacks the requested policy
+    result = get_matcher().match_resume(job_id, candidate_id, scoring_policy.get_policy(policy_version))
+    if "error" in result:
+        raise ValueError(result["error"])
+    return result
+
+
+def score_row(result, job_id, candidate_id):
+    # Parameters for SAVE_SCORE_SQL; the components let /rescore-job re-rank without inference
+    return (result['final_score'], result['content_similarity'], result['skill_match'],
+            json.dumps(sorted(result['matched_skills'])), result['policy_version'], job_id, candidate_id)
+
+
+def save_application_score(job_id, candidate_id, result):
+    with db.connection() as conn, conn.cursor() as cursor:
+        cursor.execute(SAVE_SCORE_SQL, score_row(result, job_id, candidate_id))
+        conn.commit()
+
+
+def mark_application_failed(job_id, candidate_id, error):
+    log.warning("Scoring failed for job %s, candidate %s: %s", job_id, candidate_id, error)
+    with db.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("UPDATE job_application SET score_status = 'failed' WHERE job_id = %s AND candidate_id = %s",
+                       (job_id, candidate_id))
+        conn.commit()
+
+
+def make_queue(workers=SCORING_WORKERS):
+    return ScoringQueue(score_application, save_application_score, mark_application_failed, workers=workers,
+                        max_depth=SCORING_QUEUE_MAX_DEPTH, max_attempts=SCORING_MAX_ATTEMPTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score queued applications outside the API workers")
+    parser.add_argument('--workers', type=int, default=SCORING_WORKERS)
+    parser.add_argument('--report-every', type=float, default=60, help="Seconds between queue status log lines")
+    args = parser.parse_args()
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                        format="%(asctime)s %(levelname)s %(name)s [%(threadName)s] %(message)s")
+
+    from resume_matcher import get_matcher, warm_up
+
+    warm_up()
+    get_matcher().sync_candidate_index()
+    queue = make_queue(args.workers)
+    queue.start()
+    log.info("Scoring with %d workers", args.workers)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.wait(args.report_every):
+            log.info("Scoring queue: %s", queue.metrics())
+    except KeyboardInterrupt:
+        pass
+    # Lets in-flight scores finish before exiting
+    queue.stop()
+
+
+if __name__ == '__main__':
+    main()
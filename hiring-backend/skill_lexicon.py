@@ -0,0 +1,205 @@
+# Skill lexicon mined from dataset/skills.csv.
+#
+# Rebuild the artifact after the dataset changes (takes well under a second):
+#
+#   python skill_lexicon.py
+#
+# The build reads the "Skill Details" blocks ("PYTHON- Exprience - 24 months")
+# and comma-separated "Skills" lists of every distinct resume, keeps terms
+# seen often enough, and pickles them with per-Category document frequencies
+# to dataset/skill_lexicon.pkl.
+#
+# Mined terms change every skill_match denominator, so ResumeMatcher only
+# merges them into its skill set with SKILL_LEXICON=1, once scores have been
+# re-validated against the inline skill list.
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from skill_matcher import SKILL_ALIASES, SkillMatcher, tokenize
+
+log = logging.getLogger(__name__)
+
+SKILL_LEXICON = os.environ.get('SKILL_LEXICON', '0') == '1'
+LEXICON_VERSION = 2
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_PATH = os.path.join(BASE_DIR, 'dataset', 'skills.csv')
+LEXICON_PATH = os.path.join(BASE_DIR, 'dataset', 'skill_lexicon.pkl')
+
+SKILL_DETAIL_RE = re.compile(r"([A-Za-z0-9+#./&() -]{1,60}?)\s*-\s*Exprience\s*-")
+SKILL_LIST_RE = re.compile(r"(?:TECHNICAL\s*SKILLS|Technical Skills|SKILLS|Skills)\s*[:*\-]?\s*(.{0,600})")
+SKILL_LIST_SPLIT_RE = re.compile(r"[,;•*|]|\s+and\s+")
+# Single letters ("c", "r") also match initials and list markers, so none
+# are kept unless added here
+SINGLE_CHAR_SKILLS = set()
+NOISE_TERMS = {"company", "months", "month", "year", "years", "less than", "details", "skill", "skills",
+               "experience", "education", "exprience", "others", "etc", "good", "basic", "knowledge"}
+# Words that do show up in skill sections but are ordinary English (or a
+# job function) everywhere else
+STOPLIST = {"word", "dot", "ds", "training", "testing", "sales", "operations", "security", "integration",
+            "integrator", "documentation", "database", "databases", "maintenance", "rest", "retail", "excel",
+            "marketing", "contracts", "networking", "drafting", "litigation", "legal research", "checkpoint",
+            "management", "communication", "leadership", "teamwork", "planning", "support", "development",
+            "design", "analysis", "reporting", "research", "administration", "accounting", "finance",
+            "customer service", "office", "windows", "internet", "email", "computer", "hardware", "software",
+            "employee resource group"}
+CONNECTOR_WORDS = {"and", "or", "of", "in", "the", "with", "for", "to", "on"}
+
+# Terms must be mined from several resumes (Skill Details entries are
+# structured, so fewer), and listed as a skill in at least MIN_PRECISION of
+# the resumes that mention them anywhere. Real skills in this dataset sit
+# above ~0.17; generic words like testing or maintenance below ~0.15.
+MIN_DETAIL_DF = 2
+MIN_LIST_DF = 3
+MIN_PRECISION = 0.15
+MAX_TERM_WORDS = 4
+
+
+def normalize_term(raw):
+    term = " ".join(tokenize(raw))
+    words = term.split()
+    if not words or len(words) > MAX_TERM_WORDS or term in NOISE_TERMS or term in STOPLIST:
+        return None
+    if words[0] in CONNECTOR_WORDS or words[-1] in CONNECTOR_WORDS:
+        return None
+    if term.isdigit() or (len(term) == 1 and term not in SINGLE_CHAR_SKILLS):
+        return None
+    # Alternative spellings count towards their canonical skill
+    return SKILL_ALIASES.get(term, term)
+
+
+def mine_terms(text):
+    detail_terms = set()
+    details = text.find("Skill Details")
+    if details >= 0:
+        end = text.find("Company Details", details)
+        block = text[details + len("Skill Details"):end if end >= 0 else None]
+        for raw in SKILL_DETAIL_RE.findall(block):
+            term = normalize_term(raw)
+            if term:
+                detail_terms.add(term)
+
+    list_terms = set()
+    for match in SKILL_LIST_RE.finditer(text):
+        for raw in SKILL_LIST_SPLIT_RE.split(match.group(1)):
+            term = normalize_term(raw.split(":")[-1])
+            if term:
+                list_terms.add(term)
+    return detail_terms, list_terms
+
+
+def build_lexicon(dataset_path=DATASET_PATH):
+    start = time.perf_counter()
+    csv.field_size_limit(sys.maxsize)
+    with open(dataset_path, 'rb') as f:
+        source_sha256 = hashlib.sha256(f.read()).hexdigest()
+
+    detail_df, list_df = Counter(), Counter()
+    category_df = defaultdict(Counter)
+    documents = []
+    seen = set()
+    with open(dataset_path, encoding='utf-8', errors='ignore') as f:
+        for row in csv.DictReader(f):
+            text = row['Resume']
+            # The dataset repeats many resumes verbatim; count each one once
+            digest = hashlib.sha1(text.encode('utf-8')).digest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            detail_terms, list_terms = mine_terms(text)
+            detail_df.update(detail_terms)
+            list_df.update(list_terms)
+            documents.append((text, detail_terms | list_terms))
+            for term in detail_terms | list_terms:
+                category_df[row['Category']][term] += 1
+
+    candidates = {term for term in set(detail_df) | set(list_df)
+                  if detail_df[term] >= MIN_DETAIL_DF or list_df[term] >= MIN_LIST_DF}
+    # Documents mentioning each candidate anywhere, listed as a skill or not
+    mention_df = Counter()
+    matcher = SkillMatcher(candidates)
+    for text, mined in documents:
+        mention_df.update(matcher.find(text) | (mined & candidates))
+    skills = {}
+    for term in candidates:
+        mined_df = sum(term in mined for _, mined in documents)
+        if mined_df / mention_df[term] >= MIN_PRECISION:
+            skills[term] = detail_df[term] + list_df[term]
+    categories = {
+        category: {term: count for term, count in counts.items() if term in skills}
+        for category, counts in category_df.items()
+    }
+    return {
+        "version": LEXICON_VERSION,
+        "source_sha256": source_sha256,
+        "documents": len(seen),
+        "built_at": time.time(),
+        "build_seconds": round(time.perf_counter() - start, 3),
+        "skills": skills,
+        "categories": categories
+    }
+
+
+def save_lexicon(lexicon, path=LEXICON_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+_lexicon = None
+_lexicon_loaded = False
+_lexicon_lock = threading.Lock()
+
+def _read_lexicon(path):
+    if not os.path.exists(path):
+        log.warning("Skill lexicon not found at %s; run python skill_lexicon.py", path)
+        return None
+    with open(path, 'rb') as f:
+        lexicon = pickle.load(f)
+    if lexicon.get("version") != LEXICON_VERSION:
+        log.warning("Skill lexicon at %s is version %s, expected %s; rebuild it", path, lexicon.get('version'), LEXICON_VERSION)
+        return None
+    return lexicon
+
+
+def load_lexicon(path=LEXICON_PATH):
+    # Cached per process, a missing or stale artifact too (None, warned
+    # about once): scorer_key asks on every scoring call
+    global _lexicon, _lexicon_loaded
+    if not _lexicon_loaded:
+        with _lexicon_lock:
+            if not _lexicon_loaded:
+                _lexicon = _read_lexicon(path)
+                _lexicon_loaded = True
+    return _lexicon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the skill lexicon from dataset/skills.csv")
+    parser.add_argument('--dataset', default=DATASET_PATH)
+    parser.add_argument('--output', default=LEXICON_PATH)
+    args = parser.parse_args()
+
+    lexicon = build_lexicon(args.dataset)
+    save_lexicon(lexicon, args.output)
+
+    start = time.perf_counter()
+    with open(args.output, 'rb') as f:
+        pickle.load(f)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Built {len(lexicon['skills'])} skills across {len(lexicon['categories'])} categories "
+          f"from {lexicon['documents']} distinct resumes in {lexicon['build_seconds']}s "
+          f"({os.path.getsize(args.output) / 1024:.0f} KiB, loads in {load_ms:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import re
+from collections import deque
+
+# Bumped whenever the same text can match differently; part of the score memo key
+MATCHER_VERSION = 2
+
+# Tokens keep the punctuation that is part of skill names: c++, c#, node.js, .net
+TOKEN_RE = re.compile(r"\.?[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+# Alternative spellings -> canonical skill name
+SKILL_ALIASES = {
+    "reactjs": "react",
+    "react.js": "react",
+    "react js": "react",
+    "nodejs": "node.js",
+    "node js": "node.js",
+    "angularjs": "angular",
+    "angular.js": "angular",
+    "js": "javascript",
+    "ts": "typescript",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "natural language processing": "nlp",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "microsoft azure": "azure",
+    "springboot": "spring boot",
+    "mongo db": "mongodb",
+    "my sql": "mysql",
+    "tailwindcss": "tailwind",
+    "tailwind css": "tailwind",
+    "html5": "html",
+    "css3": "css",
+    "cpp": "c++",
+    "csharp": "c#",
+}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+# Aho-Corasick automaton over word tokens. Every skill and alias is one
+# pattern, so a document is scanned once in O(tokens) no matter how many
+# skills are loaded, and multi-word skills match anywhere in the text
+# (not only when they happen to form a spaCy noun chunk). Overlapping
+# matches are resolved leftmost-longest, so "node js" is node.js and not
+# also javascript.
+class SkillMatcher:
+    def __init__(self, skills, aliases=None):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        self.skills = set()
+        skills = {skill.lower() for skill in skills}
+        # Aliases only count for skills this matcher actually knows, and a
+        # skill that is also an alias (reactjs, html5) only counts as its
+        # canonical name, so one mention is never two skills
+        aliases = {alias.lower(): skill.lower() for alias, skill in (aliases or {}).items() if skill.lower() in skills}
+        for skill in skills - set(aliases):
+            self._add(skill, skill)
+        for alias, skill in aliases.items():
+            self._add(alias, skill)
+        self._build()
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, pattern, skill):
+        tokens = tokenize(pattern)
+        if not tokens:
+            return
+        skill = skill.lower()
+        self.skills.add(skill)
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][token] = next_state
+            state = next_state
+        # (skill, pattern length in tokens)
+        self._out[state] = self._out[state] + ((skill, len(tokens)),)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find(self, text):
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for end, token in enumerate(tokenize(text), 1):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for skill, length in out[state]:
+                matches.append((end - length, -length, skill))
+        # Leftmost-longest, non-overlapping: one mention is never two skills
+        found = set()
+        covered = 0
+        taken = None
+        for start, negative_length, skill in sorted(matches):
+            if (start, negative_length) == taken:
+                # Same span, another skill spelled the same way
+                found.add(skill)
+            elif start >= covered:
+                found.add(skill)
+                taken = (start, negative_length)
+                covered = start - negative_length
+        return found
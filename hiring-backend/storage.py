@@ -0,0 +1,124 @@
+# Content-addressed upload storage: a file lives at
+# uploads/<aa>/<bb>/<sha256>.pdf, named by the SHA-256 of its bytes and
+# sharded by the first two byte pairs so no directory grows past a few
+# hundred entries at campus-drive volumes. Identical uploads share one file,
+# and a stored file is never overwritten with different content.
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+UPLOAD_FOLDER = 'uploads'
+COPY_CHUNK = 1 << 20
+SHA256_PDF_RE = re.compile(r"^([0-9a-f]{64})\.pdf$")
+SAFE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9@+._-]{0,254}$")
+
+
+def path_for(sha256, upload_folder=UPLOAD_FOLDER):
+    return os.path.join(upload_folder, sha256[:2], sha256[2:4], f"{sha256}.pdf")
+
+
+def resolve(filename, upload_folder=UPLOAD_FOLDER):
+    # Map a download name (the basename of a stored path) back to the file;
+    # names that are not content hashes are pre-sharding uploads/<name>.
+    # Returns None for anything but a plain file name (no separators, no
+    # leading dot), so a name can never point outside the upload folder.
+    if not SAFE_NAME_RE.match(filename):
+        return None
+    match = SHA256_PDF_RE.match(filename)
+    if match:
+        sharded = path_for(match.group(1), upload_folder)
+        if os.path.exists(sharded):
+            return sharded
+    return os.path.join(upload_folder, filename)
+
+
+class StagedUpload:
+    # An upload written to a temporary file and hashed, not yet visible under
+    # its content path. commit() links it into place and finish() drops the
+    # temporary file once the row pointing at it is committed; discard()
+    # undoes both.
+    #
+    # Identical uploads share one file, so a failed upload may only delete
+    # the file when no committed row uses it. discard() checks that after
+    # moving the file aside, and finish() puts the file back from its own
+    # temporary copy if a concurrent discard removed it: whichever order the
+    # two run in, a committed row never points at a missing file.
+    def __init__(self, tmp_path, sha256, path):
+        self.tmp_path = tmp_path
+        self.sha256 = sha256
+        self.path = path
+        self.created = False
+
+    def commit(self):
+        if self.tmp_path is None:
+            return self.path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # link() fails if the path exists, so of two identical concurrent
+        # uploads exactly one creates (and may later discard) the file
+        try:
+            os.link(self.tmp_path, self.path)
+            self.created = True
+        except FileExistsError:
+            pass
+        return self.path
+
+    def finish(self):
+        # Call after committing the row that references path
+        if self.tmp_path is None:
+            return self.path
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            try:
+                os.link(self.tmp_path, self.path)
+            except FileExistsError:
+                pass
+        os.remove(self.tmp_path)
+        self.tmp_path = None
+        return self.path
+
+    def discard(self, is_referenced=None):
+        # Undo: drop the temporary file, and the stored file if this upload
+        # created it and is_referenced(path) finds no committed row using it
+        if self.tmp_path is not None and os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        if self.created and os.path.exists(self.path):
+            aside = f"{self.path}.{os.getpid()}.{threading.get_ident()}.discard"
+            os.rename(self.path, aside)
+            if is_referenced is not None and is_referenced(self.path):
+                os.replace(aside, self.path)
+            else:
+                os.remove(aside)
+        self.tmp_path = None
+        self.created = False
+
+
+def stage(stream, upload_folder=UPLOAD_FOLDER):
+    # Copy a file-like object to disk in chunks while hashing it. Returns a
+    # StagedUpload, or raises ValueError when the content is not a PDF.
+    os.makedirs(upload_folder, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=upload_folder, suffix='.part')
+    try:
+        head = b''
+        with os.fdopen(fd, 'wb') as out:
+            for block in iter(lambda: stream.read(COPY_CHUNK), b''):
+                if not head:
+                    head = block[:5]
+                digest.update(block)
+                out.write(block)
+        if head != b'%PDF-':
+            raise ValueError("Not a PDF file")
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    sha256 = digest.hexdigest()
+    return StagedUpload(tmp_path, sha256, path_for(sha256, upload_folder))
+
+
+def store(stream, upload_folder=UPLOAD_FOLDER):
+    staged = stage(stream, upload_folder)
+    staged.commit()
+    staged.finish()
+    return staged
@@ -0,0 +1,50 @@
+# AnswerCache: exact and semantic hits, expiry and LRU eviction
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'chatbot'))
+
+from answer_cache import AnswerCache, normalize_question
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_exact_hit_ignores_case_and_punctuation():
+    cache = AnswerCache()
+    cache.put("How do I apply?", unit(1, 0), "On the careers page.")
+    assert normalize_question("  HOW do I   apply ") == "how do i apply"
+    assert cache.get_exact("how do i apply") == "On the careers page."
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_semantic_hit_only_above_threshold():
+    cache = AnswerCache(threshold=0.92)
+    cache.put("How do I apply?", unit(1, 0), "On the careers page.")
+    assert cache.get_semantic(unit(1, 0.1)) == "On the careers page."
+    assert cache.get_semantic(unit(1, 1)) is None
+    stats = cache.stats()
+    assert (stats["semantic_hits"], stats["misses"]) == (1, 1)
+
+
+def test_entries_expire():
+    cache = AnswerCache(ttl=0)
+    cache.put("How do I apply?", unit(1, 0), "On the careers page.")
+    assert cache.get_exact("How do I apply?") is None
+    assert cache.get_semantic(unit(1, 0)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = AnswerCache(max_size=2)
+    cache.put("a", unit(1, 0), "A")
+    cache.put("b", unit(0, 1), "B")
+    cache.get_exact("a")
+    cache.put("c", unit(1, 1), "C")
+    assert cache.get_exact("b") is None
+    assert cache.get_exact("a") == "A"
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,76 @@
+# /get-applicants keyset pages, run against SQLite: every page walk must
+# return each applicant once, in the order of one unpaged query
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from applicants_query import build_query
+
+# (candidate_id, final_score): ties, and unscored applications
+APPLICATIONS = [(1, 80.5), (2, 91.0), (3, 80.5), (4, None), (5, 62.0), (6, 80.5), (7, None), (8, 99.9), (9, 62.0)]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE candidate_details (candidate_id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("CREATE TABLE job_application (job_id INTEGER, candidate_id INTEGER, final_score REAL)")
+    conn.executemany("INSERT INTO candidate_details VALUES (?, ?)",
+                     [(candidate_id, f"Candidate {candidate_id}") for candidate_id, _ in APPLICATIONS])
+    conn.executemany("INSERT INTO job_application VALUES (1, ?, ?)", APPLICATIONS)
+    # Another job's applications never show up
+    conn.execute("INSERT INTO job_application VALUES (2, 1, 100)")
+    yield conn
+    conn.close()
+
+
+def run(conn, *args, **kwargs):
+    query, params = build_query(1, ["id", "name"], *args, **kwargs)
+    assert query.count("%s") == len(params)
+    return conn.execute(query.replace("%s", "?"), params).fetchall()
+
+
+def walk(conn, limit, **kwargs):
+    # What a client following next_cursor sees, as app.py builds the cursor
+    seen, after = [], None
+    while True:
+        rows = run(conn, after, limit=limit, **kwargs)
+        assert len(rows) <= limit + 1
+        page = rows[:limit]
+        seen.extend(page)
+        if len(rows) <= limit:
+            return seen
+        last = page[-1]
+        after = [str(last[1]) if last[1] is not None else None, last[0]]
+
+
+def test_score_order_puts_unscored_last(conn):
+    rows = run(conn)
+    assert [row[0] for row in rows] == [8, 2, 6, 3, 1, 9, 5, 7, 4]
+    assert rows[0] == (8, 99.9, 8, "Candidate 8")
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 9, 20])
+@pytest.mark.parametrize("sort", ["score", "id"])
+def test_pages_cover_every_applicant_once(conn, sort, limit):
+    assert walk(conn, limit, sort=sort) == run(conn, sort=sort)
+
+
+def test_id_order(conn):
+    assert [row[0] for row in run(conn, sort='id')] == list(range(1, 10))
+    assert [row[0] for row in run(conn, [None, 4], sort='id', limit=2)] == [5, 6, 7]
+
+
+def test_min_score(conn):
+    assert [row[0] for row in run(conn, min_score=80.5)] == [8, 2, 6, 3, 1]
+    assert [row[0] for row in walk(conn, 2, min_score=62)] == [8, 2, 6, 3, 1, 9, 5]
+
+
+def test_limit_fetches_one_extra_row(conn):
+    query, params = build_query(1, ["id"], limit=3)
+    assert query.rstrip().endswith("LIMIT %s") and params[-1] == 4
+    assert len(run(conn, limit=3)) == 4
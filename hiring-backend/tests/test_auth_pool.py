@@ -0,0 +1,45 @@
+# AuthPool concurrency limit: work that timed out keeps its slot until it ends
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth_pool import AuthBusy, AuthPool, check_password, hash_password
+
+
+def slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_timed_out_work_still_holds_its_slot():
+    pool = AuthPool(kind='thread', workers=2, max_pending=2, timeout=0.05)
+    try:
+        for _ in range(2):
+            with pytest.raises(AuthBusy):
+                pool._run("hash", slow, 0.5)
+        assert pool.pending() == 2
+        with pytest.raises(AuthBusy, match="Too many"):
+            pool._run("hash", slow, 0)
+        deadline = time.time() + 5
+        while pool.pending() and time.time() < deadline:
+            time.sleep(0.02)
+        assert pool.pending() == 0
+        assert pool._run("hash", slow, 0) == 0
+    finally:
+        pool.shutdown()
+
+
+def test_hash_and_check_round_trip():
+    pool = AuthPool(kind='thread', workers=1)
+    try:
+        hashed = pool.hash_password("s3cret")
+        assert pool.check_password("s3cret", hashed)
+        assert not pool.check_password("wrong", hashed)
+        assert not check_password("s3cret", "not a bcrypt hash")
+        assert hash_password("x", rounds=4).startswith("$2b$04$")
+    finally:
+        pool.shutdown()
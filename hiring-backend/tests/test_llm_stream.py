@@ -0,0 +1,99 @@
+# stream_llm_answer against a stub of Ollama's streaming /api/chat endpoint
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'chatbot'))
+
+from llm_stream import stream_llm_answer
+
+FALLBACK = "A: Apply on our careers page."
+WORDS = "You can apply on our careers page".split()
+
+
+class QuietServer(ThreadingHTTPServer):
+    # Fallback cases hang up on the stub mid-request
+    def handle_error(self, request, client_address):
+        pass
+
+
+def make_stub(startup_s=0.0):
+    class StubOllama(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            limit = body.get("options", {}).get("num_predict") or len(WORDS)
+            words = WORDS[:limit]
+            time.sleep(startup_s)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunks = [{"done": False, "message": {"role": "assistant", "content": word + " "}} for word in words]
+            chunks.append({"done": True, "done_reason": "length" if limit < len(WORDS) else "stop",
+                           "message": {"role": "assistant", "content": ""}})
+            try:
+                for chunk in chunks:
+                    line = json.dumps({"model": body["model"], **chunk}).encode() + b"\n"
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return StubOllama
+
+
+@pytest.fixture
+def stub_host():
+    servers = []
+
+    def start(startup_s=0.0):
+        server = QuietServer(("127.0.0.1", 0), make_stub(startup_s))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def run(host, **kwargs):
+    status = {}
+    text = "".join(stream_llm_answer("prompt", FALLBACK, host=host, status=status, **kwargs))
+    return text, status
+
+
+def test_complete_answer_is_marked_complete(stub_host):
+    text, status = run(stub_host())
+    assert text == " ".join(WORDS) + " "
+    assert status["complete"] is True
+
+
+def test_answer_cut_by_num_predict_is_not_complete(stub_host):
+    text, status = run(stub_host(), max_tokens=3)
+    assert text == " ".join(WORDS[:3]) + " "
+    assert status["complete"] is False
+
+
+def test_slow_first_token_falls_back_to_faq(stub_host):
+    text, status = run(stub_host(startup_s=1.0), first_token_timeout=0.2)
+    assert text == FALLBACK
+    assert status["complete"] is False
+
+
+def test_unreachable_server_falls_back_to_faq():
+    text, status = run("http://127.0.0.1:9", first_token_timeout=0.5)
+    assert text == FALLBACK
+    assert status["complete"] is False
@@ -0,0 +1,39 @@
+# Keyset cursors: a cursor that does not match the endpoint's sort keys is a ValueError (400)
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagination import decode_cursor, encode_cursor
+
+JOBS = (int,)
+APPLICANTS = ((str, type(None)), int)
+
+
+def test_round_trip():
+    assert decode_cursor(encode_cursor([42]), JOBS) == [42]
+    assert decode_cursor(encode_cursor(["87.5", 7]), APPLICANTS) == ["87.5", 7]
+    assert decode_cursor(encode_cursor([None, 7]), APPLICANTS) == [None, 7]
+    assert decode_cursor(None, JOBS) is None
+
+
+@pytest.mark.parametrize("values, types", [
+    ([], JOBS),
+    (["42"], JOBS),
+    ([True], JOBS),
+    ([1, 2], JOBS),
+    (["87.5"], APPLICANTS),
+    ([87.5, 7], APPLICANTS),
+    (["87.5", "7"], APPLICANTS),
+    ({"id": 1}, JOBS),
+])
+def test_mismatched_cursor_is_rejected(values, types):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(values), types)
+
+
+def test_garbage_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not base64!", JOBS)
@@ -0,0 +1,66 @@
+# /rescore-job re-blends stored components with final_score_sql; it must
+# agree with blend(), which scores new applications
+import math
+import os
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring_policy
+
+POLICY = scoring_policy.SCORING_POLICIES[1]
+# Tier edges, both sides of them, and a blend capped at max_score
+COMPONENTS = [(0, 0), (0, 100), (45.5, 62.25), (89.99, 70), (90, 70), (99.9, 80), (100, 80), (100, 100)]
+
+
+def sql_scores(policy, components):
+    conn = sqlite3.connect(':memory:')
+    # MySQL functions the expression uses
+    conn.create_function("LEAST", 2, min)
+    conn.create_function("EXP", 1, math.exp)
+    conn.execute("CREATE TABLE job_application (skill_match REAL, content_similarity REAL)")
+    conn.executemany("INSERT INTO job_application VALUES (?, ?)", components)
+    expression, params = policy_sql(policy)
+    return [row[0] for row in conn.execute(f"SELECT {expression} FROM job_application ORDER BY rowid", params)]
+
+
+def policy_sql(policy):
+    expression, params = scoring_policy.final_score_sql(policy)
+    assert expression.count("%s") == len(params)
+    return expression.replace("%s", "?"), params
+
+
+@pytest.mark.parametrize("policy", [
+    POLICY,
+    {"version": 2, "sigmoid_sharpness": 8, "blends": [(80, 0.3, 0.7), (0, 0.7, 0.3)], "max_score": 95,
+     "selection_cutoff": 70},
+])
+def test_final_score_sql_matches_blend(policy):
+    expected = [scoring_policy.blend(policy, skill, content) for skill, content in COMPONENTS]
+    assert sql_scores(policy, COMPONENTS) == pytest.approx(expected)
+
+
+def test_blend_many_matches_blend():
+    skill, content = zip(*COMPONENTS)
+    expected = [scoring_policy.blend(POLICY, s, c) for s, c in COMPONENTS]
+    assert scoring_policy.blend_many(POLICY, skill, content) == pytest.approx(np.array(expected))
+
+
+def test_blend_tiers():
+    # A perfect skill match is weighted 0.4 / 0.6, and the score never passes max_score
+    assert scoring_policy.blend(POLICY, 100, 50) == pytest.approx(0.4 * 50 + 0.6 * 100 / (1 + math.exp(-6)))
+    assert scoring_policy.blend(POLICY, 100, 100) <= POLICY["max_score"]
+    assert scoring_policy.blend(POLICY, 89.99, 70) != pytest.approx(scoring_policy.blend(POLICY, 90, 70))
+
+
+def test_policy_file_blends_are_sorted(tmp_path):
+    path = tmp_path / "policies.json"
+    path.write_text('[{"version": 2, "sigmoid_sharpness": 10, "blends": [[0, 0.6, 0.4], [95, 0.3, 0.7]],'
+                    ' "max_score": 100, "selection_cutoff": 80}]')
+    policies = scoring_policy.load_policies(str(path))
+    assert policies[1] == POLICY
+    assert policies[2]["blends"] == [(95, 0.3, 0.7), (0, 0.6, 0.4)]
@@ -0,0 +1,128 @@
+# The SQLite scoring queue: retries with backoff, failure after max_attempts,
+# backpressure, and leases shared between processes
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring_queue import QueueFull, ScoringQueue
+
+
+def make_queue(tmp_path, score_fn, **kwargs):
+    results, failures = [], []
+    queue = ScoringQueue(score_fn, lambda *args: results.append(args), lambda *args: failures.append(args),
+                         db_path=str(tmp_path / "queue.db"), workers=1, retry_delay=0.01, **kwargs)
+    return queue, results, failures
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_scores_with_the_enqueued_policy(tmp_path):
+    queue, results, failures = make_queue(tmp_path, lambda job_id, candidate_id, version: version)
+    queue.enqueue(1, 7, policy_version=2)
+    queue.start()
+    try:
+        wait_for(lambda: results)
+    finally:
+        queue.stop()
+    assert results == [("1", "7", 2)]
+    assert failures == []
+    assert queue.depth() == 0
+
+
+def test_retries_then_succeeds(tmp_path):
+    calls = []
+
+    def score(job_id, candidate_id, version):
+        calls.append(time.time())
+        if len(calls) < 3:
+            raise ValueError("model not loaded")
+        return "ok"
+
+    queue, results, failures = make_queue(tmp_path, score)
+    queue.enqueue(1, 7)
+    queue.start()
+    try:
+        wait_for(lambda: results)
+    finally:
+        queue.stop()
+    assert results == [("1", "7", "ok")]
+    assert queue.retried == 2 and queue.processed == 1 and queue.failed == 0
+    # Exponential backoff: 0.01s, then 0.02s
+    assert calls[2] - calls[1] >= 0.02
+
+
+def test_fails_after_max_attempts(tmp_path):
+    def score(job_id, candidate_id, version):
+        raise ValueError("corrupt pdf")
+
+    queue, results, failures = make_queue(tmp_path, score, max_attempts=2)
+    queue.enqueue(1, 7)
+    queue.start()
+    try:
+        wait_for(lambda: failures)
+    finally:
+        queue.stop()
+    assert results == []
+    assert failures == [("1", "7", "corrupt pdf")]
+    assert queue.metrics()["failed"] == 1 and queue.depth() == 0
+
+    # Re-applying queues the failed application again from scratch
+    queue.enqueue(1, 7)
+    assert queue.metrics()["pending"] == 1 and queue.metrics()["failed"] == 0
+
+
+def test_refuses_work_past_max_depth(tmp_path):
+    queue, _, _ = make_queue(tmp_path, lambda *args: None, max_depth=2)
+    queue.enqueue(1, 1)
+    queue.enqueue(1, 2)
+    with pytest.raises(QueueFull):
+        queue.enqueue(1, 3)
+    assert queue.depth() == 2
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    first, _, _ = make_queue(tmp_path, lambda *args: None, lease_seconds=0.2)
+    second, _, _ = make_queue(tmp_path, lambda *args: None, lease_seconds=0.2)
+    first.enqueue(1, 7)
+    claimed = first._claim()
+    assert claimed is not None
+    # The first process still holds the lease
+    assert second._claim() is None
+    # ...and then dies without renewing it
+    time.sleep(0.3)
+    row_id, job_id, candidate_id, attempts, _ = second._claim()
+    assert (row_id, job_id, candidate_id, attempts) == (claimed[0], "1", "7", 1)
+
+
+def test_live_lease_is_renewed(tmp_path):
+    release = threading.Event()
+    started = threading.Event()
+
+    def score(job_id, candidate_id, version):
+        started.set()
+        release.wait(5)
+
+    first, results, _ = make_queue(tmp_path, score, lease_seconds=0.3)
+    second, _, _ = make_queue(tmp_path, lambda *args: None, lease_seconds=0.3)
+    first.enqueue(1, 7)
+    first.start()
+    try:
+        assert started.wait(5)
+        # Well past the first lease, but the owner kept renewing it
+        time.sleep(0.6)
+        assert second._claim() is None
+        release.set()
+        wait_for(lambda: results)
+    finally:
+        release.set()
+        first.stop()
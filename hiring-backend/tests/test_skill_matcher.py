@@ -0,0 +1,50 @@
+# SkillMatcher: token-level matching, aliases and leftmost-longest overlaps
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SKILL_ALIASES, SkillMatcher
+
+SKILLS = ["node.js", "javascript", "react", "tailwind", "css", "html", "python", "java", "c++", "c#",
+          "machine learning", "spring", "spring boot", "mysql", "kubernetes"]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(SKILLS, SKILL_ALIASES)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("node js", {"node.js"}),
+    ("react js", {"react"}),
+    ("tailwind css", {"tailwind"}),
+    ("Spring Boot microservices", {"spring boot"}),
+    ("my sql and k8s", {"mysql", "kubernetes"}),
+])
+def test_one_mention_is_one_skill(matcher, text, expected):
+    assert matcher.find(text) == expected
+
+
+def test_separate_mentions_all_count(matcher):
+    text = "Built UIs in React and Tailwind, plain CSS3/HTML5, JS on Node.js; ML in Python"
+    assert matcher.find(text) == {"react", "tailwind", "css", "html", "javascript", "node.js", "python",
+                                  "machine learning"}
+
+
+def test_punctuation_in_skill_names(matcher):
+    assert matcher.find("C++, C# and Java") == {"c++", "c#", "java"}
+    # javascript is not java, and a sentence-ending dot is not part of a skill
+    assert matcher.find("Wrote javascript. Then python.") == {"javascript", "python"}
+
+
+def test_aliases_only_for_known_skills():
+    matcher = SkillMatcher(["python"], SKILL_ALIASES)
+    assert matcher.find("react js with python") == {"python"}
+    assert matcher.skills == {"python"}
+
+
+def test_no_skills_in_unrelated_text(matcher):
+    assert matcher.find("Enjoys hiking and reading") == set()
@@ -0,0 +1,71 @@
+# Content-addressed uploads: staging, sharing identical files, and undoing a
+# failed upload without deleting a file another committed row still uses
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage
+
+PDF = b"%PDF-1.4\n% test resume\n"
+
+
+def stage(folder, content=PDF):
+    return storage.stage(io.BytesIO(content), str(folder))
+
+
+def test_stage_rejects_non_pdf(tmp_path):
+    with pytest.raises(ValueError):
+        stage(tmp_path, b"hello")
+    assert os.listdir(tmp_path) == []
+
+
+def test_identical_uploads_share_one_file(tmp_path):
+    first, second = stage(tmp_path), stage(tmp_path)
+    assert first.path == second.path == storage.path_for(first.sha256, str(tmp_path))
+    first.commit()
+    second.commit()
+    assert first.created and not second.created
+    first.finish()
+    second.finish()
+    assert open(first.path, 'rb').read() == PDF
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.part')] == []
+
+
+def test_discard_removes_unreferenced_file(tmp_path):
+    upload = stage(tmp_path)
+    upload.commit()
+    upload.discard(lambda path: False)
+    assert not os.path.exists(upload.path)
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.part')] == []
+
+
+def test_discard_keeps_file_a_committed_row_uses(tmp_path):
+    creator, other = stage(tmp_path), stage(tmp_path)
+    creator.commit()
+    other.commit()
+    other.finish()
+    # The creator's transaction rolls back after the other row committed
+    creator.discard(lambda path: path == other.path)
+    assert open(other.path, 'rb').read() == PDF
+
+
+def test_finish_restores_file_removed_by_concurrent_discard(tmp_path):
+    creator, other = stage(tmp_path), stage(tmp_path)
+    creator.commit()
+    other.commit()
+    # The creator checked for references before the other row committed
+    creator.discard(lambda path: False)
+    assert not os.path.exists(other.path)
+    other.finish()
+    assert open(other.path, 'rb').read() == PDF
+
+
+def test_resolve_only_plain_names(tmp_path):
+    upload = storage.store(io.BytesIO(PDF), str(tmp_path))
+    assert storage.resolve(os.path.basename(upload.path), str(tmp_path)) == upload.path
+    assert storage.resolve("../secret.pdf", str(tmp_path)) is None
+    assert storage.resolve(".hidden.pdf", str(tmp_path)) is None
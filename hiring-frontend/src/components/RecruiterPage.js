@@ -17,6 +17,7 @@ const RecruiterPage = () => {
     });
     const [applicants, setApplicants] = useState([]);
     const [selectedJobId, setSelectedJobId] = useState(null);
+    const [nextCursor, setNextCursor] = useState(null);
     useEffect(() => {
         axios.get("http://127.0.0.1:5000/get-jobs")
             .then(response => setJobList(response.data))
@@ -41,19 +42,35 @@ const RecruiterPage = () => {
         }
         setFormData({ ...formData, job_description: file });
     };
+    const APPLICANTS_PAGE_SIZE = 100;
+    // Applicants come back sorted by score, one page at a time
+    const fetchApplicants = async (job_id, cursor = null) => {
+        const params = { job_id: job_id, limit: APPLICANTS_PAGE_SIZE, sort: "score" };
+        if (cursor) {
+            params.cursor = cursor;
+        }
+        const response = await axios.get("http://127.0.0.1:5000/get-applicants", { params });
+        setNextCursor(response.headers["x-next-cursor"] || null);
+        return response.data;
+    };
     const handleViewApplicants = async (job_id) => {
         try {
-            const response = await axios.post("http://127.0.0.1:5000/get-applicants", {
-                job_id: job_id
-            });
-            console.log("Applicants fetched:", response.data);
-            setApplicants(response.data);
+            const page = await fetchApplicants(job_id);
+            setApplicants(page);
             setSelectedJobId(job_id);
         } catch (error) {
             console.error("Full error object:", error);
             alert("Error fetching applicants: " + (error.response?.data?.error || error.message || "Unknown error"));
         }
     };
+    const handleLoadMoreApplicants = async () => {
+        try {
+            const page = await fetchApplicants(selectedJobId, nextCursor);
+            setApplicants([...applicants, ...page]);
+        } catch (error) {
+            alert("Error fetching applicants: " + (error.response?.data?.error || error.message || "Unknown error"));
+        }
+    };
     const handleSelect = async (applicantId) => {
         console.log(`Applicant ${applicantId} selected`);
         try {
@@ -174,8 +191,6 @@ const RecruiterPage = () => {
                 </thead>
                 <tbody>
                 {applicants.map((applicant, index) => {
-                    console.log("Resume path:", applicant.resume); // ✅ Log resume path here
-
                     return (
                     <tr key={index}>
                         <td>{applicant.id}</td>
@@ -192,7 +207,7 @@ const RecruiterPage = () => {
                                 Download Resume
                             </a>
                         </td>
-                        <td>{applicant.final_score}</td>
+                        <td>{applicant.score_status === "scored" ? applicant.final_score : applicant.score_status}</td>
                         <td>
                             <div className='button-group'>
                                 {applicant.final_score > 75 ? (
@@ -221,6 +236,9 @@ const RecruiterPage = () => {
         ) : (
             <p>No applicants found for this job.</p>
         )}
+        {nextCursor && (
+            <button onClick={handleLoadMoreApplicants}>Load more applicants</button>
+        )}
         
         </div>
     </div>